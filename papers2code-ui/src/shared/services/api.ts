@@ -65,6 +65,44 @@ export interface PaperActionUsers {
 }
 // --- End NEW ---
 
+// --- Per-user paper state ---
+// Paper list and detail responses are the same for every viewer; the signed-in user's own
+// votes are fetched separately (one request per page) and merged in here.
+export interface PaperUserState {
+  paperId: string;
+  currentUserVote: 'up' | null;
+  currentUserImplementabilityVote: 'up' | 'down' | null;
+}
+
+const MAX_MY_STATE_PAPERS = 100;
+
+export const fetchMyPaperStatesFromApi = async (paperIds: string[]): Promise<PaperUserState[]> => {
+  const url = `${API_BASE_URL}${PAPERS_API_PREFIX}/papers/my-state`;
+  const states: PaperUserState[] = [];
+  for (let start = 0; start < paperIds.length; start += MAX_MY_STATE_PAPERS) {
+    const response = await api.post(url, { paperIds: paperIds.slice(start, start + MAX_MY_STATE_PAPERS) });
+    if (response.status !== 200) return [];
+    states.push(...(response.data as { states: PaperUserState[] }).states);
+  }
+  return states;
+};
+
+const withMyPaperStates = async (papers: Paper[]): Promise<Paper[]> => {
+  if (papers.length === 0 || localStorage.getItem('has_session') !== 'true') return papers;
+  try {
+    const states = new Map((await fetchMyPaperStatesFromApi(papers.map(paper => paper.id))).map(state => [state.paperId, state]));
+    return papers.map(paper => {
+      const state = states.get(paper.id);
+      return state
+        ? { ...paper, currentUserVote: state.currentUserVote ?? 'none', currentUserImplementabilityVote: state.currentUserImplementabilityVote ?? 'none' }
+        : paper;
+    });
+  } catch (error) {
+    console.warn('Could not load your votes for these papers:', error);
+    return papers;
+  }
+};
+
 /**
  * Fetches papers from the backend API.
  * @param limit - The maximum number of papers to fetch.
@@ -139,15 +177,18 @@ export const fetchPapersFromApi = async (
   }
   const totalPages = Math.ceil(data.totalCount / limit);
   // MODIFIED: Access camelCase properties from data, matching the backend's PaginatedPaperResponse schema (which uses alias_generator=to_camel)
-  return { papers: data.papers, totalPages: totalPages, totalCount: data.totalCount, countCapped: data.countCapped ?? false, page: data.page, pageSize: data.pageSize, hasMore: data.hasMore };
+  const papers = await withMyPaperStates(data.papers);
+  return { papers: papers, totalPages: totalPages, totalCount: data.totalCount, countCapped: data.countCapped ?? false, page: data.page, pageSize: data.pageSize, hasMore: data.hasMore };
 };
 
 // --- fetchPaperByIdFromApi ---
 export const fetchPaperByIdFromApi = async (id: string): Promise<Paper | undefined> => {
   const response = await api.get(`${API_BASE_URL}${PAPERS_API_PREFIX}/papers/${id}`);
   if (response.status === 404) return undefined;
-  const paper =  handleApiResponse<Paper>(response, true);
-  return paper;
+  const paper = await handleApiResponse<Paper>(response, true);
+  if (!paper) return paper;
+  const [withState] = await withMyPaperStates([paper]);
+  return withState;
 };
 
 export type ImplementabilityAction = 'flag' | 'confirm' | 'dispute' | 'retract';
@@ -189,12 +189,25 @@ class BackgroundTaskRunner:
             logger.error(f"View analytics update failed: {e}")
             return {"success": False, "error": str(e)}
     
+    async def reconcile_vote_counters(self) -> Dict[str, Any]:
+        """Repair drift between the papers' implementability vote counters and user_actions"""
+        try:
+            logger.info("Starting vote counter reconciliation task...")
+            from papers2code_app2.services.paper_moderation_service import PaperModerationService
+            result = await PaperModerationService().reconcile_vote_counters()
+            return {"success": True, **result}
+        except Exception as e:
+            logger.error(f"Vote counter reconciliation failed: {e}")
+            return {"success": False, "error": str(e)}
+    
     def schedule_tasks(self):
         """Schedule background tasks"""
         # Run email updates every 6 hours
         schedule.every(6).hours.do(lambda: asyncio.run(self.update_email_statuses()))
         # Run view analytics every hour
         schedule.every(1).hours.do(lambda: asyncio.run(self.update_view_analytics()))
+        # Reconcile vote counters daily
+        schedule.every(24).hours.do(lambda: asyncio.run(self.reconcile_vote_counters()))
         
         logger.info("Background tasks scheduled")
     
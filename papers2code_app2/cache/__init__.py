@@ -0,0 +1,11 @@
+# Re-export the cache API so callers keep importing from `papers2code_app2.cache`
+# Backends live in backends.py, the paper search cache in paper_search_cache.py
+from .backends import InMemoryCache, RedisCacheBackend
+from .paper_search_cache import PaperSearchCache, paper_cache
+
+__all__ = [
+    'InMemoryCache',
+    'RedisCacheBackend',
+    'PaperSearchCache',
+    'paper_cache',
+]
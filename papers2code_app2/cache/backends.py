@@ -0,0 +1,484 @@
+"""
+Async storage backends for PaperSearchCache.
+
+Both backends expose the same coroutine-based interface so the cache layer never
+blocks the event loop: a pooled ``redis.asyncio`` client when REDIS_URL is set,
+and an in-process fallback otherwise.
+"""
+import asyncio
+import fnmatch
+import heapq
+import logging
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from ..shared import config_settings
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalSubscription:
+    """Pub/sub subscription on an InMemoryCache channel (delivers messages within this process)."""
+    def __init__(self, backend: "InMemoryCache", channel: str):
+        self._backend = backend
+        self._channel = channel
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        backend._subscribers.setdefault(channel, []).append(self._queue)
+
+    def __aiter__(self) -> "_LocalSubscription":
+        return self
+
+    async def __anext__(self) -> str:
+        return await self._queue.get()
+
+    async def close(self) -> None:
+        queues = self._backend._subscribers.get(self._channel, [])
+        if self._queue in queues:
+            queues.remove(self._queue)
+
+
+class _RedisSubscription:
+    """Pub/sub subscription on a Redis channel, on its own dedicated connection."""
+    # Seconds to wait for a message before polling again; keeps reads under the socket timeout
+    POLL_TIMEOUT = 1.0
+
+    def __init__(self, pubsub: Any):
+        self._pubsub = pubsub
+
+    def __aiter__(self) -> "_RedisSubscription":
+        return self
+
+    async def __anext__(self) -> str:
+        while True:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=self.POLL_TIMEOUT)
+            if message is not None:
+                data = message["data"]
+                return data.decode("utf-8") if isinstance(data, bytes) else data
+
+    async def close(self) -> None:
+        await self._pubsub.unsubscribe()
+        close = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+        await close()
+
+
+class InMemoryCache:
+    """
+    Bounded in-process LRU cache, used as the fallback when Redis is not available.
+
+    Entries are capped both by count (MEMORY_CACHE_MAX_ENTRIES) and by approximate
+    size (MEMORY_CACHE_MAX_BYTES); the least recently used entry is evicted first.
+    TTLs run on the monotonic clock, and expired entries are reclaimed lazily through
+    a coarse expiry wheel so no operation ever sweeps the whole cache.
+    """
+    # Width of one expiry wheel slot in seconds
+    WHEEL_SLOT_SECONDS = 1.0
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries or config_settings.MEMORY_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or config_settings.MEMORY_CACHE_MAX_BYTES
+        # key -> (value, expires_at, size, wheel_slot); ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, int]]" = OrderedDict()
+        # wheel slot -> keys expiring in that slot, plus a min-heap of occupied slots
+        self._wheel: Dict[int, Set[str]] = {}
+        self._wheel_slots: List[int] = []
+        self._current_bytes = 0
+        # Counters (e.g. cache generations) live outside the LRU so eviction can never reset them;
+        # counters given a TTL are reclaimed through the expiry wheel
+        self._counters: Dict[str, int] = {}
+        self._counter_expiry: Dict[str, float] = {}
+        # channel -> queues of local subscribers
+        self._subscribers: Dict[str, List["asyncio.Queue[str]"]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _sizeof(key: str, value: Any) -> int:
+        """Approximate footprint of an entry, counting the contents of containers (sets, decoded pages)"""
+        size = sys.getsizeof(key)
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            size += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+        return size
+
+    def _remove(self, key: str) -> None:
+        value, expires_at, size, slot = self._entries.pop(key)
+        self._current_bytes -= size
+        slot_keys = self._wheel.get(slot)
+        if slot_keys is not None:
+            slot_keys.discard(key)
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop every entry whose wheel slot is entirely in the past."""
+        current_slot = int(now // self.WHEEL_SLOT_SECONDS)
+        while self._wheel_slots and self._wheel_slots[0] < current_slot:
+            slot = heapq.heappop(self._wheel_slots)
+            for key in self._wheel.pop(slot, ()):
+                if key in self._entries:
+                    self._remove(key)
+                    self.expirations += 1
+                elif self._counter_expiry.get(key, now) < now:
+                    self._drop_counter(key)
+
+    def _get_live(self, key: str, now: Optional[float] = None) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (now if now is not None else time.monotonic()) >= entry[1]:
+            # Expired but not yet reclaimed by the wheel
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry[0]
+
+    def _lookup(self, key: str, now: float) -> Optional[Any]:
+        value = self._get_live(key, now)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _store(self, key: str, ttl: int, value: Any, now: float) -> None:
+        size = self._sizeof(key, value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            # A single oversized value would evict everything else; skip it instead
+            return
+
+        expires_at = now + ttl
+        slot = int(expires_at // self.WHEEL_SLOT_SECONDS)
+        slot_keys = self._wheel.get(slot)
+        if slot_keys is None:
+            slot_keys = self._wheel[slot] = set()
+            heapq.heappush(self._wheel_slots, slot)
+        slot_keys.add(key)
+
+        self._entries[key] = (value, expires_at, size, slot)
+        self._current_bytes += size
+
+        while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._lookup(key, time.monotonic())
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        now = time.monotonic()
+        return [self._lookup(key, now) for key in keys]
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        now = time.monotonic()
+        self._purge_expired(now)
+        self._store(key, ttl, value, now)
+
+    async def set_many(self, items: Dict[str, Any], ttl: int) -> None:
+        now = time.monotonic()
+        self._purge_expired(now)
+        for key, value in items.items():
+            self._store(key, ttl, value, now)
+
+    async def compare_and_replace_many(self, items: Dict[str, Tuple[Any, Any]]) -> List[str]:
+        """
+        For each ``key: (expected, value)``, overwrite the key with ``value`` while keeping its
+        expiry, but only if it still holds ``expected``. Returns the keys that were replaced.
+        """
+        now = time.monotonic()
+        replaced = []
+        for key, (expected, value) in items.items():
+            current = self._get_live(key, now)
+            if current is None or current != expected:
+                continue
+            remaining = self._entries[key][1] - now
+            self._store(key, remaining, value, now)
+            replaced.append(key)
+        return replaced
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+                removed += 1
+        return removed
+
+    async def ttl(self, key: str) -> int:
+        now = time.monotonic()
+        if self._get_live(key, now) is None:
+            return -2
+        return max(int(self._entries[key][1] - now), 0)
+
+    async def scan_keys(self, pattern: str, count: int = 100) -> AsyncIterator[str]:  # noqa: ARG002 - mirrors the Redis signature
+        now = time.monotonic()
+        for key in list(self._entries.keys()):
+            if fnmatch.fnmatchcase(key, pattern) and self._get_live(key, now) is not None:
+                yield key
+
+    async def sadd_many(self, items: Dict[str, List[str]], ttl: int) -> None:
+        """Add members to several sets, (re)setting each set's TTL."""
+        now = time.monotonic()
+        self._purge_expired(now)
+        for key, members in items.items():
+            existing = self._get_live(key, now)
+            self._store(key, ttl, set(existing or ()) | set(members), now)
+
+    async def smembers(self, key: str) -> List[str]:
+        return list(self._get_live(key) or ())
+
+    async def srem(self, key: str, *members: str) -> int:
+        now = time.monotonic()
+        existing = self._get_live(key, now)
+        if not existing:
+            return 0
+        remaining = existing - set(members)
+        removed = len(existing) - len(remaining)
+        if not remaining:
+            self._remove(key)
+        elif removed:
+            self._store(key, self._entries[key][1] - now, remaining, now)
+        return removed
+
+    def _drop_counter(self, key: str) -> None:
+        self._counters.pop(key, None)
+        self._counter_expiry.pop(key, None)
+
+    def _counter(self, key: str, now: float) -> int:
+        expires_at = self._counter_expiry.get(key)
+        if expires_at is not None and now >= expires_at:
+            self._drop_counter(key)
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str, ttl: Optional[int] = None) -> int:
+        """Increment a counter; with ``ttl`` the counter expires that many seconds after this increment."""
+        now = time.monotonic()
+        self._purge_expired(now)
+        self._counters[key] = self._counter(key, now) + 1
+        if ttl is not None:
+            expires_at = self._counter_expiry[key] = now + ttl
+            slot = int(expires_at // self.WHEEL_SLOT_SECONDS)
+            if slot not in self._wheel:
+                self._wheel[slot] = set()
+                heapq.heappush(self._wheel_slots, slot)
+            self._wheel[slot].add(key)
+        return self._counters[key]
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        now = time.monotonic()
+        return [self._counter(key, now) for key in keys]
+
+    async def setex_if_counter(self, key: str, ttl: int, value: Any, counter_key: str, expected: int) -> bool:
+        """Store ``key`` only if ``counter_key`` still reads ``expected``; returns whether it was stored."""
+        now = time.monotonic()
+        if self._counter(counter_key, now) != expected:
+            return False
+        self._purge_expired(now)
+        self._store(key, ttl, value, now)
+        return True
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take a short-lived lock; returns a release token, or None if it is already held."""
+        now = time.monotonic()
+        if self._get_live(key, now) is not None:
+            return None
+        token = uuid.uuid4().hex
+        self._store(key, ttl, token, now)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self._get_live(key) == token:
+            self._remove(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._wheel.clear()
+        self._wheel_slots.clear()
+        self._current_bytes = 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        queues = self._subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait(message)
+        return len(queues)
+
+    async def subscribe(self, channel: str) -> _LocalSubscription:
+        return _LocalSubscription(self, channel)
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy and effectiveness counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "current_bytes": self._current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisCacheBackend:
+    """
+    Non-blocking Redis backend built on ``redis.asyncio``.
+
+    The client owns its own connection pool (sized by REDIS_MAX_CONNECTIONS) and every
+    command is bounded by REDIS_SOCKET_TIMEOUT, so a slow or unreachable Redis degrades
+    into a cache miss instead of stalling the worker. Multi-key operations are sent as a
+    single pipeline round trip.
+    """
+    _RELEASE_LOCK_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+    )
+    _COMPARE_AND_SET_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "redis.call('set', KEYS[1], ARGV[2], 'KEEPTTL') return 1 else return 0 end"
+    )
+    # A missing counter reads as 0, like get_counters
+    _SETEX_IF_COUNTER_SCRIPT = (
+        "if (redis.call('get', KEYS[2]) or '0') == ARGV[3] then "
+        "redis.call('setex', KEYS[1], ARGV[1], ARGV[2]) return 1 else return 0 end"
+    )
+
+    def __init__(self, url: str):
+        # Raises ImportError when the optional redis dependency is not installed
+        import redis.asyncio as aioredis
+
+        self._client = aioredis.from_url(
+            url,
+            max_connections=config_settings.REDIS_MAX_CONNECTIONS,
+            socket_keepalive=config_settings.REDIS_SOCKET_KEEPALIVE,
+            socket_timeout=config_settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=config_settings.REDIS_CONNECT_TIMEOUT,
+            retry_on_timeout=True,
+            health_check_interval=30,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._client.mget(keys)
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        await self._client.setex(key, ttl, value)
+
+    async def set_many(self, items: Dict[str, Any], ttl: int) -> None:
+        if not items:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+
+    async def compare_and_replace_many(self, items: Dict[str, Tuple[Any, Any]]) -> List[str]:
+        """
+        Compare-and-set of each ``key: (expected, value)`` keeping the key's TTL, as one script
+        call per key in a single pipeline. Returns the keys that were replaced.
+        """
+        if not items:
+            return []
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, (expected, value) in items.items():
+                pipe.eval(self._COMPARE_AND_SET_SCRIPT, 1, key, expected, value)
+            results = await pipe.execute()
+        return [key for key, result in zip(items, results) if result]
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self._client.delete(*keys)
+
+    async def ttl(self, key: str) -> int:
+        return await self._client.ttl(key)
+
+    async def sadd_many(self, items: Dict[str, List[str]], ttl: int) -> None:
+        """Add members to several sets, (re)setting each set's TTL, in one pipeline."""
+        if not items:
+            return
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, members in items.items():
+                pipe.sadd(key, *members)
+                pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def smembers(self, key: str) -> List[str]:
+        members = await self._client.smembers(key)
+        return [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+
+    async def srem(self, key: str, *members: str) -> int:
+        if not members:
+            return 0
+        return await self._client.srem(key, *members)
+
+    async def incr(self, key: str, ttl: Optional[int] = None) -> int:
+        """Increment a counter; with ``ttl`` the counter expires that many seconds after this increment."""
+        if ttl is None:
+            return await self._client.incr(key)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            value, _ = await pipe.execute()
+        return value
+
+    async def get_counters(self, keys: List[str]) -> List[int]:
+        values = await self.mget(keys)
+        return [int(value) if value else 0 for value in values]
+
+    async def setex_if_counter(self, key: str, ttl: int, value: Any, counter_key: str, expected: int) -> bool:
+        """Store ``key`` only if ``counter_key`` still reads ``expected``, checked and set atomically in one script."""
+        stored = await self._client.eval(self._SETEX_IF_COUNTER_SCRIPT, 2, key, counter_key, ttl, value, expected)
+        return bool(stored)
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take a short-lived lock (SET NX PX); returns a release token, or None if it is already held."""
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(key, token, nx=True, px=max(int(ttl * 1000), 1))
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        # Only delete the lock if it is still ours, i.e. it did not expire and get re-taken
+        await self._client.eval(self._RELEASE_LOCK_SCRIPT, 1, key, token)
+
+    async def publish(self, channel: str, message: str) -> int:
+        return await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> _RedisSubscription:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(channel)
+        return _RedisSubscription(pubsub)
+
+    async def scan_keys(self, pattern: str, count: int = 100) -> AsyncIterator[str]:
+        # SCAN is non-blocking on the server side, unlike KEYS
+        async for key in self._client.scan_iter(match=pattern, count=count):
+            yield key.decode("utf-8") if isinstance(key, bytes) else key
+
+    async def ping(self) -> bool:
+        return await self._client.ping()
+
+    async def close(self) -> None:
+        close = getattr(self._client, "aclose", None) or self._client.close
+        await close()
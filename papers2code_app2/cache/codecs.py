@@ -0,0 +1,327 @@
+"""
+Serialization codecs for cached payloads.
+
+Every stored value starts with a small header naming the format version, the codec and the
+compression it was written with, so readers can decode entries written under any configured
+codec. Changing CACHE_CODEC or CACHE_COMPRESSION is therefore safe on a live cache: old
+entries stay readable until they expire.
+
+Codecs round-trip the BSON types found in paper documents (ObjectId, datetime, Decimal128)
+exactly, so a cache hit has the same shape as a cache miss. msgpack, orjson, zstandard and
+lz4 are optional (the ``cache`` extra); the stdlib JSON codec and no compression are always
+available, and a configured codec whose library is missing falls back to them with a warning.
+"""
+import json
+import logging
+import struct
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+
+from ..shared import config_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("!BBB")  # format version, codec id, compression id
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class CodecError(Exception):
+    """Raised when a cached payload cannot be decoded."""
+
+
+# --- BSON type tagging (shared by the JSON-based codecs) ---
+
+def _datetime_to_micros(value: datetime) -> int:
+    aware = value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    delta = aware - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _datetime_from_micros(micros: int, aware: bool) -> datetime:
+    seconds, micros = divmod(micros, 1_000_000)
+    value = datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micros)
+    # PyMongo returns naive UTC datetimes unless the client is tz_aware; preserve which one we got
+    return value if aware else value.replace(tzinfo=None)
+
+
+def _tag_bson(value: Any) -> Any:
+    """Replace a BSON value that JSON cannot carry with a tagged dict"""
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, datetime):
+        return {"$date": _datetime_to_micros(value), "$tz": value.tzinfo is not None}
+    if isinstance(value, Decimal128):
+        return {"$decimal": str(value)}
+    raise TypeError(f"Object of type {type(value).__name__} cannot be cached")
+
+
+def _untag_bson(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$oid" in obj:
+            return ObjectId(obj["$oid"])
+        if "$decimal" in obj:
+            return Decimal128(obj["$decimal"])
+    elif len(obj) == 2 and "$date" in obj and "$tz" in obj:
+        return _datetime_from_micros(obj["$date"], obj["$tz"])
+    return obj
+
+
+def _untag_tree(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _untag_bson({k: _untag_tree(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_untag_tree(v) for v in value]
+    return value
+
+
+# --- Serializers ---
+
+class _JsonSerializer:
+    name = "json"
+    codec_id = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_tag_bson, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_untag_bson)
+
+
+class _OrjsonSerializer:
+    name = "orjson"
+    codec_id = 2
+
+    def dumps(self, value: Any) -> bytes:
+        # Without passthrough orjson would turn datetimes into strings before calling default
+        return orjson.dumps(value, default=_tag_bson, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def loads(self, data: bytes) -> Any:
+        # orjson has no object hook, so tagged values are revived in a second pass
+        return _untag_tree(orjson.loads(data))
+
+
+_EXT_OBJECT_ID = 1
+_EXT_DATETIME = 2
+_EXT_DECIMAL128 = 3
+_DATETIME_EXT = struct.Struct("!q?")  # microseconds since epoch, tz-aware flag
+
+
+class _MsgpackSerializer:
+    name = "msgpack"
+    codec_id = 3
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        if isinstance(value, ObjectId):
+            return msgpack.ExtType(_EXT_OBJECT_ID, value.binary)
+        if isinstance(value, datetime):
+            return msgpack.ExtType(
+                _EXT_DATETIME, _DATETIME_EXT.pack(_datetime_to_micros(value), value.tzinfo is not None)
+            )
+        if isinstance(value, Decimal128):
+            return msgpack.ExtType(_EXT_DECIMAL128, value.bid)
+        raise TypeError(f"Object of type {type(value).__name__} cannot be cached")
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == _EXT_OBJECT_ID:
+            return ObjectId(data)
+        if code == _EXT_DATETIME:
+            micros, aware = _DATETIME_EXT.unpack(data)
+            return _datetime_from_micros(micros, aware)
+        if code == _EXT_DECIMAL128:
+            return Decimal128.from_bid(data)
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+
+# --- Compressors ---
+
+class _NoCompression:
+    name = "none"
+    compression_id = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class _ZstdCompression:
+    name = "zstd"
+    compression_id = 1
+
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class _Lz4Compression:
+    name = "lz4"
+    compression_id = 2
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+_SERIALIZERS: Dict[str, Callable[[], Any]] = {
+    "json": _JsonSerializer,
+    "orjson": _OrjsonSerializer,
+    "msgpack": _MsgpackSerializer,
+}
+_SERIALIZER_AVAILABLE = {"json": True, "orjson": orjson is not None, "msgpack": msgpack is not None}
+
+_COMPRESSORS: Dict[str, Callable[[], Any]] = {
+    "none": _NoCompression,
+    "zstd": _ZstdCompression,
+    "lz4": _Lz4Compression,
+}
+_COMPRESSOR_AVAILABLE = {"none": True, "zstd": zstandard is not None, "lz4": lz4_frame is not None}
+_INSTALL_HINT = "install the 'cache' extra: pip install '.[cache]'"
+
+
+def available_codecs() -> Dict[str, bool]:
+    """Serializer names mapped to whether their library is installed"""
+    return dict(_SERIALIZER_AVAILABLE)
+
+
+def available_compressions() -> Dict[str, bool]:
+    """Compression names mapped to whether their library is installed"""
+    return dict(_COMPRESSOR_AVAILABLE)
+
+
+class CacheCodec:
+    """
+    Encodes cache values as ``header + payload``.
+
+    Payloads at least ``compress_min_bytes`` long are compressed. Decoding dispatches on the
+    header, so any registered codec/compression pair can be read back whatever this instance
+    writes with. Values without a header are read as legacy plain JSON.
+    """
+    def __init__(self, codec: str = "json", compression: str = "none", compress_min_bytes: int = 1024):
+        if codec not in _SERIALIZERS:
+            raise ValueError(f"Unknown cache codec: {codec}")
+        if compression not in _COMPRESSORS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if not _SERIALIZER_AVAILABLE[codec]:
+            logger.warning(
+                f"Cache codec '{codec}' is not installed, falling back to 'json' ({_INSTALL_HINT})"
+            )
+            codec = "json"
+        if not _COMPRESSOR_AVAILABLE[compression]:
+            logger.warning(
+                f"Cache compression '{compression}' is not installed, storing values uncompressed ({_INSTALL_HINT})"
+            )
+            compression = "none"
+
+        self._serializer = _SERIALIZERS[codec]()
+        self._compressor = _COMPRESSORS[compression]()
+        self._no_compression = _NoCompression()
+        self.compress_min_bytes = compress_min_bytes
+        self.name = f"{codec}+{compression}"
+        # Lazily built readers for payloads written by other codecs
+        self._readers: Dict[int, Any] = {self._serializer.codec_id: self._serializer}
+        self._decompressors: Dict[int, Any] = {
+            self._compressor.compression_id: self._compressor,
+            self._no_compression.compression_id: self._no_compression,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "CacheCodec":
+        return cls(
+            codec=config_settings.CACHE_CODEC,
+            compression=config_settings.CACHE_COMPRESSION,
+            compress_min_bytes=config_settings.CACHE_COMPRESS_MIN_BYTES,
+        )
+
+    def encode(self, value: Any) -> bytes:
+        payload = self._serializer.dumps(value)
+        compressor = self._compressor if len(payload) >= self.compress_min_bytes else self._no_compression
+        return _HEADER.pack(FORMAT_VERSION, self._serializer.codec_id, compressor.compression_id) + compressor.compress(payload)
+
+    def decode(self, data: Any) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data or data[0] != FORMAT_VERSION:
+            # Written before the codec layer existed (plain JSON text)
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise CodecError(f"Unrecognized cache payload: {e}") from e
+
+        _, codec_id, compression_id = _HEADER.unpack_from(data)
+        try:
+            serializer = self._reader_for(codec_id)
+            decompressor = self._decompressor_for(compression_id)
+            return serializer.loads(decompressor.decompress(data[_HEADER.size:]))
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Failed to decode cache payload: {e}") from e
+
+    def _reader_for(self, codec_id: int) -> Any:
+        reader = self._readers.get(codec_id)
+        if reader is None:
+            for name, factory in _SERIALIZERS.items():
+                if factory.codec_id == codec_id:
+                    if not _SERIALIZER_AVAILABLE[name]:
+                        raise CodecError(f"Cache payload needs codec '{name}', which is not installed")
+                    reader = self._readers[codec_id] = factory()
+                    break
+            else:
+                raise CodecError(f"Unknown cache codec id: {codec_id}")
+        return reader
+
+    def _decompressor_for(self, compression_id: int) -> Any:
+        decompressor = self._decompressors.get(compression_id)
+        if decompressor is None:
+            for name, factory in _COMPRESSORS.items():
+                if factory.compression_id == compression_id:
+                    if not _COMPRESSOR_AVAILABLE[name]:
+                        raise CodecError(f"Cache payload needs compression '{name}', which is not installed")
+                    decompressor = self._decompressors[compression_id] = factory()
+                    break
+            else:
+                raise CodecError(f"Unknown cache compression id: {compression_id}")
+        return decompressor
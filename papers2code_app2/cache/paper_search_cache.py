@@ -0,0 +1,896 @@
+import asyncio
+import json
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Tuple, TypeVar
+import logging
+
+from ..shared import config_settings
+from .backends import InMemoryCache, RedisCacheBackend
+from .codecs import CacheCodec
+from .single_flight import SingleFlight
+from .stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class PaperSearchCache:
+    def __init__(self):
+        self.backend = InMemoryCache()
+        # Versioned binary encoding for stored values (see codecs.py)
+        self.codec = CacheCodec.from_settings()
+        self.stats = CacheStats()
+        # Per-process L1 of already-decoded values in front of the shared backend (L2).
+        # Values read from it are shared between callers and must be treated as read-only.
+        self._l1: Optional[InMemoryCache] = None
+        if config_settings.CACHE_L1_TTL > 0:
+            self._l1 = InMemoryCache(max_entries=config_settings.CACHE_L1_MAX_ENTRIES)
+        self._subscription = None
+        self._listener_task: Optional["asyncio.Task[None]"] = None
+        self._redis_backend: Optional[RedisCacheBackend] = None
+        self._backend_ready = True
+        self._backend_lock = asyncio.Lock()
+        self.single_flight = SingleFlight()
+        # Cross-worker coalescing counters (only used with CACHE_DISTRIBUTED_LOCK)
+        self.lock_waits = 0
+        self.lock_wait_hits = 0
+        # Background stale-while-revalidate refreshes, keyed by page key
+        self._refresh_tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self.stale_served = 0
+        # Called with the dimension name whenever this worker rolls a search generation
+        self._generation_listeners: List[Callable[[str], None]] = []
+        # Called with (paper_id, changed fields) whenever this worker patches a paper
+        self._paper_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        # Called with the metadata type (None for all) whenever any worker invalidates metadata
+        self._metadata_listeners: List[Callable[[Optional[str]], None]] = []
+
+        if not config_settings.ENABLE_CACHE:
+            logger.info("Caching disabled via config")
+            return
+
+        if not config_settings.REDIS_URL:
+            logger.info("Redis not available (no Redis URL provided in config), using in-memory cache")
+            return
+
+        try:
+            # The async client connects lazily, so the connection test happens on first use
+            self._redis_backend = RedisCacheBackend(config_settings.REDIS_URL)
+            self._backend_ready = False
+        except Exception as e:
+            logger.info(f"Redis not available ({e}), using in-memory cache")
+
+    async def _get_backend(self):
+        """Return the active backend, verifying the Redis connection on first use."""
+        if self._backend_ready:
+            return self.backend
+        async with self._backend_lock:
+            if not self._backend_ready:
+                try:
+                    await self._redis_backend.ping()
+                    self.backend = self._redis_backend
+                    logger.info("Redis cache initialized successfully (redis.asyncio with connection pooling)")
+                except Exception as e:
+                    logger.info(f"Redis not available ({e}), using in-memory cache")
+                    try:
+                        await self._redis_backend.close()
+                    except Exception:
+                        pass
+                    self._redis_backend = None
+                self._backend_ready = True
+        return self.backend
+
+    async def close(self) -> None:
+        """Release backend connections (called on application shutdown)."""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            self._listener_task = None
+        if self._subscription is not None:
+            try:
+                await self._subscription.close()
+            except Exception as e:
+                logger.warning(f"Error closing cache invalidation subscription: {e}")
+            self._subscription = None
+        try:
+            await self.backend.close()
+        except Exception as e:
+            logger.warning(f"Error closing cache backend: {e}")
+
+    # ==================== L1 AND INVALIDATION BROADCAST ====================
+    # Every worker keeps decoded hot values (pages, metadata, generation counters) in its L1 for
+    # CACHE_L1_TTL seconds. Invalidations drop the affected L1 keys locally and are published on a
+    # pub/sub channel so the L1 of every other worker drops them too.
+
+    # Seconds to wait before resubscribing after the invalidation channel fails
+    RESUBSCRIBE_DELAY = 1.0
+
+    def _invalidation_channel(self) -> str:
+        return f"{config_settings.CACHE_KEY_PREFIX}:cache_invalidation"
+
+    async def start(self) -> None:
+        """Subscribe to invalidation broadcasts (called on application startup)."""
+        if self._l1 is None or self._listener_task is not None:
+            return
+        try:
+            backend = await self._get_backend()
+            self._subscription = await backend.subscribe(self._invalidation_channel())
+        except Exception as e:
+            logger.warning(f"Cache invalidation channel unavailable, L1 relies on its TTL only: {e}")
+        self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            try:
+                if self._subscription is None:
+                    backend = await self._get_backend()
+                    self._subscription = await backend.subscribe(self._invalidation_channel())
+                async for message in self._subscription:
+                    keys = json.loads(message)["keys"]
+                    await self._l1.delete(*keys)
+                    for metadata_type in self.METADATA_TYPES:
+                        if self._get_metadata_cache_key(metadata_type) in keys:
+                            self._notify_metadata_listeners(metadata_type)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation channel failed, clearing L1 and resubscribing: {e}")
+                # Broadcasts may have been missed while disconnected
+                await self._l1.clear()
+                subscription, self._subscription = self._subscription, None
+                if subscription is not None:
+                    try:
+                        await subscription.close()
+                    except Exception:
+                        pass
+                await asyncio.sleep(self.RESUBSCRIBE_DELAY)
+
+    async def _broadcast_invalidation(self, keys: List[str]) -> None:
+        """Drop keys from this worker's L1 and tell every other worker to do the same."""
+        if self._l1 is None or not keys:
+            return
+        await self._l1.delete(*keys)
+        try:
+            backend = await self._get_backend()
+            await backend.publish(self._invalidation_channel(), json.dumps({"keys": keys}))
+        except Exception as e:
+            logger.warning(f"Failed to broadcast cache invalidation: {e}")
+
+    async def _l1_get(self, key: str) -> Optional[Any]:
+        if self._l1 is None:
+            return None
+        return await self._l1.get(key)
+
+    async def _l1_set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self._l1 is None:
+            return
+        l1_ttl = config_settings.CACHE_L1_TTL if ttl is None else min(ttl, config_settings.CACHE_L1_TTL)
+        if l1_ttl > 0:
+            await self._l1.setex(key, l1_ttl, value)
+
+    # ==================== MISS COALESCING ====================
+    # A cache miss on a hot key is filled once: concurrent callers in this process join the
+    # in-flight fill, and with CACHE_DISTRIBUTED_LOCK other workers wait for the lock holder
+    # to populate the cache instead of querying MongoDB themselves.
+
+    LOCK_POLL_INTERVAL = 0.05  # seconds between cache re-checks while another worker fills
+
+    async def coalesce(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        recheck: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+    ) -> T:
+        """
+        Run ``loader`` at most once per key across concurrent callers.
+        ``recheck`` reads the cached value; it enables the cross-process lock, since waiting
+        on another worker is only useful if its result can be picked up from the cache.
+        """
+        async def _fill() -> T:
+            if recheck is None or not config_settings.CACHE_DISTRIBUTED_LOCK:
+                return await loader()
+            return await self._fill_under_lock(key, loader, recheck)
+
+        return await self.single_flight.do(key, _fill)
+
+    async def _fill_under_lock(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        lock_key = f"{key}:lock"
+        timeout = config_settings.CACHE_LOCK_TIMEOUT
+        try:
+            backend = await self._get_backend()
+            token = await backend.acquire_lock(lock_key, timeout)
+        except Exception as e:
+            logger.warning(f"Cache lock unavailable for {key}, filling without it: {e}")
+            return await loader()
+
+        if token is None:
+            # Another worker is filling this key; poll the cache until it lands or the lock expires
+            self.lock_waits += 1
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while loop.time() < deadline:
+                await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+                value = await recheck()
+                if value is not None:
+                    self.lock_wait_hits += 1
+                    return value
+            logger.warning(f"Timed out waiting for another worker to fill {key}")
+            return await loader()
+
+        try:
+            return await loader()
+        finally:
+            try:
+                await backend.release_lock(lock_key, token)
+            except Exception as e:
+                logger.warning(f"Failed to release cache lock for {key}: {e}")
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """How many callers were collapsed onto a shared fill, in-process and across workers"""
+        return {
+            **self.single_flight.stats(),
+            "lock_waits": self.lock_waits,
+            "lock_wait_hits": self.lock_wait_hits,
+        }
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Everything the cache knows about its own effectiveness, for the admin endpoint"""
+        return {
+            "backend": type(self.backend).__name__,
+            "codec": self.codec.name,
+            "namespaces": self.stats.snapshot(),
+            "coalescing": self.coalescing_stats(),
+            "stale_served": self.stale_served,
+            "background_refreshes_in_flight": len(self._refresh_tasks),
+            "l1": self._l1.stats() if self._l1 is not None else None,
+            "memory_backend": self.backend.stats() if isinstance(self.backend, InMemoryCache) else None,
+        }
+
+    def render_prometheus(self) -> str:
+        """Statistics in the Prometheus text exposition format"""
+        coalescing = self.coalescing_stats()
+        gauges = {
+            "coalesced_calls_total": ("Callers that joined an in-flight fill instead of querying.", coalescing["collapsed"]),
+            "fills_total": ("Cache fills executed after coalescing.", coalescing["executions"]),
+            "lock_waits_total": ("Times a worker waited on another worker's fill lock.", coalescing["lock_waits"]),
+            "lock_wait_hits_total": ("Lock waits that picked up the other worker's result.", coalescing["lock_wait_hits"]),
+            "refreshes_in_flight": ("Background stale-while-revalidate refreshes running.", len(self._refresh_tasks)),
+        }
+        for tier, backend in (("l1", self._l1), ("memory", self.backend if isinstance(self.backend, InMemoryCache) else None)):
+            if backend is None:
+                continue
+            backend_stats = backend.stats()
+            gauges[f"{tier}_entries"] = (f"Entries held by the {tier} in-process cache.", backend_stats["entries"])
+            gauges[f"{tier}_bytes"] = (f"Approximate bytes held by the {tier} in-process cache.", backend_stats["current_bytes"])
+            gauges[f"{tier}_evictions_total"] = (f"LRU evictions from the {tier} in-process cache.", backend_stats["evictions"])
+        return self.stats.render_prometheus(gauges)
+
+    async def fill_page(self, cache_key: Optional[str], loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Compute a missed search page once and cache it under ``cache_key``."""
+        if not cache_key:
+            return await loader()
+
+        async def _load() -> Dict[str, Any]:
+            result = await loader()
+            await self.cache_page(cache_key, result)
+            return result
+
+        return await self.coalesce(cache_key, _load, recheck=lambda: self._peek_page(cache_key))
+
+    async def get_page(
+        self, cache_key: Optional[str], loader: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Serve a search page with stale-while-revalidate semantics.
+
+        Returns the page and how it was served: "hit" (fresh), "stale" (past the soft TTL;
+        returned immediately while a background task recomputes it) or "miss" (computed now).
+        """
+        cached, is_fresh = await self._read_page(cache_key)
+        if cached is not None:
+            if is_fresh:
+                return cached, "hit"
+            self.stale_served += 1
+            self._refresh_in_background(cache_key, loader)
+            return cached, "stale"
+        return await self.fill_page(cache_key, loader), "miss"
+
+    def _refresh_in_background(self, cache_key: str, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        if cache_key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh_page(cache_key, loader))
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda _t, key=cache_key: self._refresh_tasks.pop(key, None))
+
+    async def _refresh_page(self, cache_key: str, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        token = None
+        try:
+            backend = await self._get_backend()
+            if config_settings.CACHE_DISTRIBUTED_LOCK:
+                # Skip the refresh if another worker is already recomputing this page
+                token = await backend.acquire_lock(f"{cache_key}:lock", config_settings.CACHE_LOCK_TIMEOUT)
+                if token is None:
+                    return
+
+            async def _load() -> Dict[str, Any]:
+                result = await loader()
+                await self.cache_page(cache_key, result)
+                return result
+
+            await self.single_flight.do(cache_key, _load)
+            await self._broadcast_invalidation([cache_key])
+            logger.info(f"Refreshed stale cache page {cache_key}")
+        except Exception as e:
+            # The stale page keeps being served until its hard TTL; the next stale hit retries
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+        finally:
+            if token is not None:
+                try:
+                    await backend.release_lock(f"{cache_key}:lock", token)
+                except Exception as e:
+                    logger.warning(f"Failed to release cache lock for {cache_key}: {e}")
+
+    # ==================== SEARCH RESULT CACHING ====================
+    # Search pages are stored under keys namespaced by generation counters. Invalidating is a
+    # single INCR: readers resolve keys against the current generations, so pages written under
+    # an older generation are simply never read again and expire on their own TTL.
+
+    # "global" covers every page; the others only cover pages whose filter or sort depends on them
+    GENERATION_DIMENSIONS = ("global", "status", "implementability", "upvotes")
+
+    # Paper fields that can be patched in place on cached pages, mapped to the generation
+    # dimension whose pages may need to refilter when the field changes. A vote only patches the
+    # count: upvote-sorted pages keep their order until their TTL instead of being rolled per vote
+    PATCHABLE_FIELDS = {
+        "status": "status",
+        "implementabilityStatus": "implementability",
+        "upvoteCount": None,
+        "isImplementableVotes": None,
+        "nonImplementableVotes": None,
+    }
+    PATCH_ATTEMPTS = 5
+
+    def _generate_cache_key(self, **kwargs) -> str:
+        """Generate the generation-independent part of a cache key from search parameters"""
+        # Sort parameters for consistent keys
+        sorted_params = sorted(kwargs.items())
+        key_string = json.dumps(sorted_params, sort_keys=True)
+        return hashlib.md5(key_string.encode()).hexdigest()
+
+    def _paper_index_key(self, paper_id: str) -> str:
+        """Key of the set holding every cached search page that contains a paper"""
+        return f"{config_settings.CACHE_KEY_PREFIX}:papers_search_idx:{paper_id}"
+
+    def _generation_key(self, dimension: str) -> str:
+        return f"{config_settings.CACHE_KEY_PREFIX}:papers_search_gen:{dimension}"
+
+    @staticmethod
+    def generation_dimensions(search_params: Dict[str, Any]) -> List[str]:
+        """Generation dimensions a search page depends on, given its parameters"""
+        dimensions = ["global"]
+        if search_params.get("main_status"):
+            dimensions.append("status")
+        if search_params.get("impl_status"):
+            dimensions.append("implementability")
+        if search_params.get("sort_by") == "upvotes":
+            dimensions.append("upvotes")
+        # Status facet counts shift whenever any paper's status does
+        if "status" in (search_params.get("facets") or []) and "status" not in dimensions:
+            dimensions.append("status")
+        return dimensions
+
+    async def _generation_token(self, params: Dict[str, Any]) -> str:
+        """The current generations of the dimensions ``params`` depend on, joined into a key segment"""
+        backend = await self._get_backend()
+        generation_keys = [self._generation_key(d) for d in self.generation_dimensions(params)]
+        generations = [await self._l1_get(key) for key in generation_keys]
+        if None in generations:
+            generations = await backend.get_counters(generation_keys)
+            for key, generation in zip(generation_keys, generations):
+                await self._l1_set(key, generation)
+        return ".".join(str(g) for g in generations)
+
+    async def get_search_key(self, **search_params) -> Optional[str]:
+        """
+        Resolve the cache key for a search against the current generations.
+        Returns None if the generations cannot be read, in which case the caller should bypass the cache.
+        """
+        try:
+            generation_token = await self._generation_token(search_params)
+            params_hash = self._generate_cache_key(**search_params)
+            return f"{config_settings.CACHE_KEY_PREFIX}:papers_search:g{generation_token}:{params_hash}"
+        except Exception as e:
+            self.stats.record_error(self.SEARCH_NAMESPACE, "generation")
+            logger.error(f"Cache key resolution error: {e}")
+            return None
+
+    # Pages are stored as {"fresh_until": <unix time>, "data": <result>}. The backend TTL is the
+    # hard TTL (CACHE_TTL + CACHE_STALE_TTL); past "fresh_until" (the soft TTL) a page is stale.
+    # Wall-clock time is used because the timestamp is shared between workers through Redis.
+
+    @staticmethod
+    def _hard_ttl() -> int:
+        return config_settings.CACHE_TTL + max(config_settings.CACHE_STALE_TTL, 0)
+
+    SEARCH_NAMESPACE = "papers_search"
+
+    async def _read_page(self, cache_key: Optional[str], record: bool = True) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return a cached page and whether it is still fresh"""
+        if not cache_key:
+            return None, False
+        started = time.perf_counter()
+        try:
+            envelope = await self._l1_get(cache_key)
+            from_l1 = envelope is not None
+            if envelope is None:
+                backend = await self._get_backend()
+                cached_data = await backend.get(cache_key)
+                if cached_data:
+                    envelope = self.codec.decode(cached_data)
+                    await self._l1_set(cache_key, envelope)
+            if envelope is not None:
+                is_fresh = time.time() < envelope["fresh_until"]
+                logger.debug(f"Cache {'hit' if is_fresh else 'stale hit'} for key: {cache_key}")
+                if record:
+                    self.stats.record_lookup(
+                        self.SEARCH_NAMESPACE, "hit" if is_fresh else "stale", time.perf_counter() - started, l1=from_l1
+                    )
+                return envelope["data"], is_fresh
+            if record:
+                self.stats.record_lookup(self.SEARCH_NAMESPACE, "miss", time.perf_counter() - started)
+        except Exception as e:
+            self.stats.record_error(self.SEARCH_NAMESPACE, "get")
+            logger.error(f"Cache retrieval error: {e}")
+        return None, False
+
+    async def _peek_page(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Read a page without counting the lookup (used while polling for another worker's fill)"""
+        cached, _ = await self._read_page(cache_key, record=False)
+        return cached
+
+    async def get_cached_page(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get a cached search result by its resolved key, whether fresh or stale"""
+        cached, _ = await self._read_page(cache_key)
+        return cached
+
+    async def cache_page(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        """
+        Cache a search result under a key resolved before the result was computed.
+        If a generation was bumped in the meantime the page lands under the old generation
+        and is never served, so results computed from pre-invalidation data cannot leak.
+        """
+        if not cache_key:
+            return
+        started = time.perf_counter()
+        try:
+            backend = await self._get_backend()
+            # Fresh for CACHE_TTL, then served stale (while refreshing) until the hard TTL
+            ttl = self._hard_ttl()
+            envelope = {"fresh_until": time.time() + config_settings.CACHE_TTL, "data": result}
+            payload = self.codec.encode(envelope)
+            await backend.setex(
+                cache_key,
+                ttl,
+                payload
+            )
+            # Only values decoded from the backend go into L1, so hits always have the same shape
+            if self._l1 is not None:
+                await self._l1.delete(cache_key)
+            # Record which papers this page holds so mutations can patch it directly
+            paper_ids = {str(paper["_id"]) for paper in result.get("papers", []) if paper.get("_id")}
+            await backend.sadd_many({self._paper_index_key(pid): [cache_key] for pid in paper_ids}, ttl)
+            self.stats.record_store(self.SEARCH_NAMESPACE, time.perf_counter() - started, len(payload))
+            logger.info(f"Cached result for key: {cache_key} with TTL: {ttl}s")
+        except Exception as e:
+            self.stats.record_error(self.SEARCH_NAMESPACE, "set")
+            logger.error(f"Cache storage error: {e}")
+
+    async def get_cached_result(self, **search_params) -> Optional[Dict[str, Any]]:
+        """Get cached search result"""
+        return await self.get_cached_page(await self.get_search_key(**search_params))
+
+    async def cache_result(self, result: Dict[str, Any], **search_params) -> None:
+        """Cache search result"""
+        await self.cache_page(await self.get_search_key(**search_params), result)
+
+    def add_generation_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback run (synchronously) after this worker rolls a search generation."""
+        self._generation_listeners.append(listener)
+
+    def add_paper_listener(self, listener: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Register a callback run (synchronously) with the changed fields of every patched paper."""
+        self._paper_listeners.append(listener)
+
+    async def invalidate_search_results(self, dimension: str = "global") -> None:
+        """Invalidate cached search pages in O(1) by bumping a generation counter."""
+        if dimension not in self.GENERATION_DIMENSIONS:
+            raise ValueError(f"Unknown cache generation dimension: {dimension}")
+        try:
+            backend = await self._get_backend()
+            generation = await backend.incr(self._generation_key(dimension))
+            await self._broadcast_invalidation([self._generation_key(dimension)])
+            logger.info(f"Invalidated search cache dimension '{dimension}' (generation {generation})")
+            for listener in self._generation_listeners:
+                try:
+                    listener(dimension)
+                except Exception as e:
+                    logger.warning(f"Generation listener failed: {e}")
+        except Exception as e:
+            self.stats.record_error(self.SEARCH_NAMESPACE, "invalidate")
+            logger.error(f"Cache invalidation error: {e}")
+
+    @classmethod
+    def changed_fields(cls, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Patchable fields whose value differs between two versions of a paper document"""
+        if not before or not after:
+            return {}
+        return {
+            field: after.get(field)
+            for field in cls.PATCHABLE_FIELDS
+            if field in after and before.get(field) != after.get(field)
+        }
+
+    async def patch_paper_in_cache(self, paper_id: str, fields: Dict[str, Any]) -> int:
+        """
+        Apply changed paper fields to every cached search page containing the paper.
+
+        Only the pages listed in the paper's reverse index are touched: one MGET to read them and
+        one pipelined compare-and-set (keeping each page's TTL) to store them back. A page changed
+        by a concurrent patch between the read and the write is not overwritten; it is read and
+        edited again, up to PATCH_ATTEMPTS times. Pages whose filter depends on a changed field are
+        also invalidated through their generation dimension, since the paper may now belong in a
+        different result set.
+        Pass only the fields that actually changed. Returns the number of pages patched.
+        """
+        if not fields:
+            return 0
+        unknown = set(fields) - set(self.PATCHABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields cannot be patched in cached pages: {sorted(unknown)}")
+        for listener in self._paper_listeners:
+            try:
+                listener(paper_id, fields)
+            except Exception as e:
+                logger.warning(f"Paper listener failed: {e}")
+
+        patched = 0
+        try:
+            backend = await self._get_backend()
+            index_key = self._paper_index_key(paper_id)
+            pending = await backend.smembers(index_key)
+            gone: List[str] = []
+            updated: List[str] = []
+            for _ in range(self.PATCH_ATTEMPTS):
+                if not pending:
+                    break
+                pages = await backend.mget(pending)
+                swaps: Dict[str, Tuple[bytes, bytes]] = {}
+                for page_key, raw_page in zip(pending, pages):
+                    if not raw_page:
+                        gone.append(page_key)
+                        continue
+                    envelope = self.codec.decode(raw_page)
+                    for paper in envelope["data"].get("papers", []):
+                        if str(paper.get("_id")) == paper_id:
+                            paper.update(fields)
+                            swaps[page_key] = (raw_page, self.codec.encode(envelope))
+                            break
+                replaced = set(await backend.compare_and_replace_many(swaps)) if swaps else set()
+                updated.extend(replaced)
+                pending = [page_key for page_key in swaps if page_key not in replaced]
+            if pending:
+                logger.warning(f"Gave up patching {len(pending)} contended pages for paper {paper_id}")
+                self.stats.record_error(self.SEARCH_NAMESPACE, "patch")
+                await backend.delete(*pending)
+            patched = len(updated)
+            if updated or pending:
+                await self._broadcast_invalidation(updated + pending)
+            if gone:
+                await backend.srem(index_key, *gone)
+            logger.info(f"Patched {patched} cached search pages for paper {paper_id}: {sorted(fields)}")
+        except Exception as e:
+            self.stats.record_error(self.SEARCH_NAMESPACE, "patch")
+            logger.error(f"Cache patch error for paper {paper_id}: {e}")
+
+        for dimension in sorted({self.PATCHABLE_FIELDS[f] for f in fields} - {None}):
+            await self.invalidate_search_results(dimension)
+        return patched
+
+    async def update_paper_in_cache(self, paper_id: str, status: str) -> None:
+        """Reflect a paper status change in cached search results."""
+        await self.patch_paper_in_cache(paper_id, {"status": status})
+
+    # ==================== FILTER-SCOPED CACHING ====================
+    # Totals and facet counts depend only on the filters, not on skip, limit or sort, so they are
+    # cached under a filter-only signature: paging or re-sorting a result set reuses them. Their
+    # keys share the search generations, so the invalidations that roll search pages roll them too.
+
+    COUNT_NAMESPACE = "papers_count"
+    FACETS_NAMESPACE = "papers_facets"
+
+    async def _get_filter_key(self, namespace: str, filter_params: Dict[str, Any]) -> Optional[str]:
+        try:
+            generation_token = await self._generation_token(filter_params)
+            params_hash = self._generate_cache_key(**filter_params)
+            return f"{config_settings.CACHE_KEY_PREFIX}:{namespace}:g{generation_token}:{params_hash}"
+        except Exception as e:
+            self.stats.record_error(namespace, "generation")
+            logger.error(f"Cache key resolution error for {namespace}: {e}")
+            return None
+
+    async def get_count_key(self, **filter_params) -> Optional[str]:
+        """Resolve the count key for a filter set; None means bypass the cache"""
+        return await self._get_filter_key(self.COUNT_NAMESPACE, filter_params)
+
+    async def get_facets_key(self, **filter_params) -> Optional[str]:
+        """Resolve the facet counts key for a filter set and its ``facets`` list; None means bypass the cache"""
+        return await self._get_filter_key(self.FACETS_NAMESPACE, filter_params)
+
+    async def _read_filter_value(self, namespace: str, cache_key: Optional[str], record: bool = True) -> Optional[Any]:
+        if not cache_key:
+            return None
+        started = time.perf_counter()
+        try:
+            value = await self._l1_get(cache_key)
+            from_l1 = value is not None
+            if value is None:
+                backend = await self._get_backend()
+                cached_data = await backend.get(cache_key)
+                if cached_data:
+                    value = self.codec.decode(cached_data)
+                    await self._l1_set(cache_key, value)
+            if record:
+                result = "hit" if value is not None else "miss"
+                self.stats.record_lookup(namespace, result, time.perf_counter() - started, l1=from_l1)
+            return value
+        except Exception as e:
+            self.stats.record_error(namespace, "get")
+            logger.warning(f"Error reading cached {namespace}: {e}")
+            return None
+
+    async def _store_filter_value(self, namespace: str, cache_key: Optional[str], value: Any) -> None:
+        if not cache_key:
+            return
+        started = time.perf_counter()
+        try:
+            backend = await self._get_backend()
+            payload = self.codec.encode(value)
+            await backend.setex(cache_key, config_settings.CACHE_COUNT_TTL, payload)
+            self.stats.record_store(namespace, time.perf_counter() - started, len(payload))
+        except Exception as e:
+            self.stats.record_error(namespace, "set")
+            logger.warning(f"Error caching {namespace}: {e}")
+
+    async def _read_count(self, count_key: Optional[str], record: bool = True) -> Optional[int]:
+        return await self._read_filter_value(self.COUNT_NAMESPACE, count_key, record)
+
+    async def cache_count(self, count_key: Optional[str], total: int) -> None:
+        await self._store_filter_value(self.COUNT_NAMESPACE, count_key, total)
+
+    async def get_cached_facets(self, facets_key: Optional[str]) -> Optional[Dict[str, Dict[str, int]]]:
+        return await self._read_filter_value(self.FACETS_NAMESPACE, facets_key)
+
+    async def cache_facets(self, facets_key: Optional[str], facet_counts: Dict[str, Dict[str, int]]) -> None:
+        await self._store_filter_value(self.FACETS_NAMESPACE, facets_key, facet_counts)
+
+    async def get_count(self, count_key: Optional[str], loader: Callable[[], Awaitable[int]]) -> int:
+        """Return the cached total for a filter set, counting it once for all concurrent callers on a miss."""
+        total = await self._read_count(count_key)
+        if total is not None:
+            return total
+        if not count_key:
+            return await loader()
+
+        async def _load() -> int:
+            counted = await loader()
+            await self.cache_count(count_key, counted)
+            return counted
+
+        return await self.coalesce(count_key, _load, recheck=lambda: self._read_count(count_key, record=False))
+
+    # ==================== PAPER DETAIL CACHING ====================
+    # The public part of a paper's detail view (the paper, its implementation progress and its
+    # vote counts) is cached per paper. Services that write any of these drop the entry right
+    # after the write; only the viewer's own votes are read live on every request.
+    # Each drop also bumps a per-paper version. A loader only stores its result if the version it
+    # saw before reading MongoDB is still current, so a detail read before a write that lands
+    # mid-load is never stored after that write's invalidation.
+
+    DETAIL_NAMESPACE = "paper_detail"
+
+    def _paper_detail_key(self, paper_id: str) -> str:
+        return f"{config_settings.CACHE_KEY_PREFIX}:{self.DETAIL_NAMESPACE}:{paper_id}"
+
+    def _paper_detail_version_key(self, paper_id: str) -> str:
+        return f"{config_settings.CACHE_KEY_PREFIX}:{self.DETAIL_NAMESPACE}_ver:{paper_id}"
+
+    async def _read_paper_detail(self, paper_id: str, record: bool = True) -> Optional[Dict[str, Any]]:
+        return await self._read_filter_value(self.DETAIL_NAMESPACE, self._paper_detail_key(paper_id), record)
+
+    async def get_paper_detail(self, paper_id: str, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return the cached detail of a paper, loading it once for all concurrent callers on a miss.
+        The result may be shared with other callers and must be treated as read-only.
+        """
+        detail = await self._read_paper_detail(paper_id)
+        if detail is not None:
+            return detail
+        cache_key = self._paper_detail_key(paper_id)
+
+        version_key = self._paper_detail_version_key(paper_id)
+
+        async def _load() -> Dict[str, Any]:
+            try:
+                backend = await self._get_backend()
+                (version,) = await backend.get_counters([version_key])
+            except Exception as e:
+                self.stats.record_error(self.DETAIL_NAMESPACE, "get")
+                logger.warning(f"Error reading detail version of paper {paper_id}, not caching it: {e}")
+                return await loader()
+            loaded = await loader()
+            started = time.perf_counter()
+            try:
+                payload = self.codec.encode(loaded)
+                stored = await backend.setex_if_counter(
+                    cache_key, config_settings.CACHE_DETAIL_TTL, payload, version_key, version
+                )
+                if stored:
+                    self.stats.record_store(self.DETAIL_NAMESPACE, time.perf_counter() - started, len(payload))
+                else:
+                    logger.info(f"Detail of paper {paper_id} changed while loading, not caching it")
+            except Exception as e:
+                self.stats.record_error(self.DETAIL_NAMESPACE, "set")
+                logger.warning(f"Error caching detail of paper {paper_id}: {e}")
+            return loaded
+
+        return await self.coalesce(cache_key, _load, recheck=lambda: self._read_paper_detail(paper_id, record=False))
+
+    async def invalidate_paper_detail(self, paper_id: str) -> None:
+        """Drop a paper's cached detail in every worker (call after writing the paper, its progress or votes)."""
+        cache_key = self._paper_detail_key(paper_id)
+        try:
+            backend = await self._get_backend()
+            # The version outlives any load that could have read the paper before this write
+            await backend.incr(self._paper_detail_version_key(paper_id), ttl=config_settings.CACHE_DETAIL_TTL)
+            await backend.delete(cache_key)
+            await self._broadcast_invalidation([cache_key])
+        except Exception as e:
+            self.stats.record_error(self.DETAIL_NAMESPACE, "invalidate")
+            logger.warning(f"Error invalidating detail of paper {paper_id}: {e}")
+
+    # ==================== METADATA CACHING ====================
+    # Cache for infrequently changing data: tags, venues, authors
+    # These are called on every page load but change rarely
+
+    METADATA_TTL = 3600  # 1 hour cache for metadata
+    METADATA_TYPES = ("tags", "venue_options", "authors", "filter_counts")
+
+    def _get_metadata_cache_key(self, metadata_type: str) -> str:
+        """Generate cache key for metadata (tags, venues, authors)"""
+        return f"{config_settings.CACHE_KEY_PREFIX}:metadata:{metadata_type}"
+
+    async def get_cached_metadata(self, metadata_type: str) -> Optional[List[str]]:
+        """Get cached metadata (tags, venues, or authors)"""
+        return await self._read_metadata(metadata_type)
+
+    async def _read_metadata(self, metadata_type: str, record: bool = True) -> Optional[List[str]]:
+        namespace = f"metadata:{metadata_type}"
+        started = time.perf_counter()
+        try:
+            cache_key = self._get_metadata_cache_key(metadata_type)
+            cached = await self._l1_get(cache_key)
+            if cached is not None:
+                if record:
+                    self.stats.record_lookup(namespace, "hit", time.perf_counter() - started, l1=True)
+                return cached
+
+            backend = await self._get_backend()
+            cached_data = await backend.get(cache_key)
+
+            if cached_data:
+                logger.debug(f"Cache HIT for metadata: {metadata_type}")
+                cached = self.codec.decode(cached_data)
+                await self._l1_set(cache_key, cached)
+                if record:
+                    self.stats.record_lookup(namespace, "hit", time.perf_counter() - started)
+                return cached
+
+            logger.debug(f"Cache MISS for metadata: {metadata_type}")
+            if record:
+                self.stats.record_lookup(namespace, "miss", time.perf_counter() - started)
+            return None
+        except Exception as e:
+            self.stats.record_error(namespace, "get")
+            logger.warning(f"Error getting cached metadata {metadata_type}: {e}")
+            return None
+
+    async def set_cached_metadata(self, metadata_type: str, data: List[str]) -> None:
+        """Cache metadata with 1-hour TTL"""
+        started = time.perf_counter()
+        try:
+            backend = await self._get_backend()
+            cache_key = self._get_metadata_cache_key(metadata_type)
+            payload = self.codec.encode(data)
+            await backend.setex(
+                cache_key,
+                self.METADATA_TTL,
+                payload
+            )
+            self.stats.record_store(f"metadata:{metadata_type}", time.perf_counter() - started, len(payload))
+            logger.debug(f"Cached {len(data)} {metadata_type} items for {self.METADATA_TTL}s")
+        except Exception as e:
+            self.stats.record_error(f"metadata:{metadata_type}", "set")
+            logger.warning(f"Error caching metadata {metadata_type}: {e}")
+
+    async def fill_metadata(self, metadata_type: str, loader: Callable[[], Awaitable[List[str]]]) -> List[str]:
+        """Compute missed metadata once and cache it."""
+        async def _load() -> List[str]:
+            data = await loader()
+            await self.set_cached_metadata(metadata_type, data)
+            return data
+
+        return await self.coalesce(
+            self._get_metadata_cache_key(metadata_type),
+            _load,
+            recheck=lambda: self._read_metadata(metadata_type, record=False),
+        )
+
+    async def invalidate_metadata_cache(self, metadata_type: Optional[str] = None) -> None:
+        """Invalidate metadata cache. If type is None, invalidates all metadata."""
+        try:
+            backend = await self._get_backend()
+            types_to_clear = [metadata_type] if metadata_type else list(self.METADATA_TYPES)
+            keys_to_clear = [self._get_metadata_cache_key(mt) for mt in types_to_clear]
+            await backend.delete(*keys_to_clear)
+            await self._broadcast_invalidation(keys_to_clear)
+            logger.info(f"Invalidated metadata cache for: {types_to_clear}")
+        except Exception as e:
+            for mt in [metadata_type] if metadata_type else self.METADATA_TYPES:
+                self.stats.record_error(f"metadata:{mt}", "invalidate")
+            logger.warning(f"Error invalidating metadata cache: {e}")
+        # Other workers are notified when the broadcast reaches their invalidation listener
+        self._notify_metadata_listeners(metadata_type)
+
+    def add_metadata_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Register a callback run (synchronously) when metadata is invalidated here or in another worker."""
+        self._metadata_listeners.append(listener)
+
+    def _notify_metadata_listeners(self, metadata_type: Optional[str]) -> None:
+        for listener in self._metadata_listeners:
+            try:
+                listener(metadata_type)
+            except Exception as e:
+                logger.warning(f"Metadata listener failed: {e}")
+
+    # ==================== WARM QUERY LOG ====================
+    # The most requested search parameter sets, persisted so a fresh deploy can warm them
+
+    WARM_QUERIES_TTL = 7 * 24 * 3600
+
+    def _warm_queries_key(self) -> str:
+        return f"{config_settings.CACHE_KEY_PREFIX}:warm_queries"
+
+    async def get_warm_queries(self) -> List[Dict[str, Any]]:
+        try:
+            backend = await self._get_backend()
+            cached_data = await backend.get(self._warm_queries_key())
+            return self.codec.decode(cached_data) if cached_data else []
+        except Exception as e:
+            logger.warning(f"Error reading warm queries: {e}")
+            return []
+
+    async def set_warm_queries(self, queries: List[Dict[str, Any]]) -> None:
+        try:
+            backend = await self._get_backend()
+            await backend.setex(self._warm_queries_key(), self.WARM_QUERIES_TTL, self.codec.encode(queries))
+        except Exception as e:
+            logger.warning(f"Error saving warm queries: {e}")
+
+# Global cache instance
+paper_cache = PaperSearchCache()
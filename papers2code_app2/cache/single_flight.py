@@ -0,0 +1,57 @@
+"""
+In-process request coalescing ("single flight").
+
+Concurrent callers asking for the same key share one in-flight computation instead of
+each running it, so an expired hot cache key costs one database round trip rather than
+one per waiting request.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key onto a single coroutine.
+
+    The computation runs in its own task, so a caller being cancelled (e.g. a client
+    disconnecting) never cancels the work the other callers are waiting on.
+    """
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` unless a call for ``key`` is already in flight, and return its result."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+        else:
+            self.collapsed += 1
+            logger.debug(f"Single-flight: joined in-flight call for {key}")
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._inflight),
+        }
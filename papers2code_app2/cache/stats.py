@@ -0,0 +1,174 @@
+"""
+Per-namespace cache statistics with Prometheus text exposition.
+
+Namespaces group cache keys by purpose (``papers_search``, ``metadata:tags``, ...), so hit
+ratios, latency and payload sizes can be tuned per kind of data. Statistics are kept per
+worker process; each uvicorn worker reports its own.
+"""
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+METRIC_PREFIX = "papers2code_cache"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            pairs.append((_format_number(bound), running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class NamespaceStats:
+    # Seconds; cache operations should be sub-millisecond in L1 and a few ms against Redis
+    LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+    # Bytes of encoded payload written to the backend
+    SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+    def __init__(self):
+        self.hits = 0
+        self.l1_hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.errors: Dict[str, int] = {}
+        self.get_latency = Histogram(self.LATENCY_BUCKETS)
+        self.set_latency = Histogram(self.LATENCY_BUCKETS)
+        self.payload_bytes = Histogram(self.SIZE_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "hits": self.hits,
+            "l1_hits": self.l1_hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": ((self.hits + self.stale) / lookups) if lookups else 0.0,
+            "errors": dict(self.errors),
+            "get_latency_seconds": self.get_latency.snapshot(),
+            "set_latency_seconds": self.set_latency.snapshot(),
+            "payload_bytes": self.payload_bytes.snapshot(),
+        }
+
+
+class CacheStats:
+    """Hit/miss/stale counters, error counts, latency and payload size histograms per namespace."""
+    def __init__(self):
+        self._namespaces: Dict[str, NamespaceStats] = {}
+
+    def namespace(self, name: str) -> NamespaceStats:
+        stats = self._namespaces.get(name)
+        if stats is None:
+            stats = self._namespaces[name] = NamespaceStats()
+        return stats
+
+    def record_lookup(self, namespace: str, result: str, seconds: float, l1: bool = False) -> None:
+        """Record a read; ``result`` is "hit", "stale" or "miss"."""
+        stats = self.namespace(namespace)
+        if result == "hit":
+            stats.hits += 1
+        elif result == "stale":
+            stats.stale += 1
+        else:
+            stats.misses += 1
+        if l1:
+            stats.l1_hits += 1
+        stats.get_latency.observe(seconds)
+
+    def record_store(self, namespace: str, seconds: float, size: int) -> None:
+        stats = self.namespace(namespace)
+        stats.set_latency.observe(seconds)
+        stats.payload_bytes.observe(size)
+
+    def record_error(self, namespace: str, operation: str) -> None:
+        errors = self.namespace(namespace).errors
+        errors[operation] = errors.get(operation, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.snapshot() for name, stats in sorted(self._namespaces.items())}
+
+    def render_prometheus(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Render all statistics in the Prometheus text exposition format.
+        ``gauges`` adds unlabelled values as ``{metric suffix: (help text, value)}``; suffixes
+        ending in ``_total`` are typed as counters.
+        """
+        lines: List[str] = []
+        namespaces = sorted(self._namespaces.items())
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            return f"{METRIC_PREFIX}_{name}"
+
+        metric = header("requests_total", "counter", "Cache lookups by namespace and result.")
+        for ns, stats in namespaces:
+            for result, value in (("hit", stats.hits), ("stale", stats.stale), ("miss", stats.misses)):
+                lines.append(f'{metric}{{namespace="{_escape(ns)}",result="{result}"}} {value}')
+
+        metric = header("l1_hits_total", "counter", "Cache hits served from the in-process L1.")
+        for ns, stats in namespaces:
+            lines.append(f'{metric}{{namespace="{_escape(ns)}"}} {stats.l1_hits}')
+
+        metric = header("errors_total", "counter", "Cache backend errors by namespace and operation.")
+        for ns, stats in namespaces:
+            for operation, value in sorted(stats.errors.items()):
+                lines.append(f'{metric}{{namespace="{_escape(ns)}",operation="{_escape(operation)}"}} {value}')
+
+        metric = header("operation_seconds", "histogram", "Cache operation latency by namespace and operation.")
+        for ns, stats in namespaces:
+            for operation, histogram in (("get", stats.get_latency), ("set", stats.set_latency)):
+                _render_histogram(lines, metric, f'namespace="{_escape(ns)}",operation="{operation}"', histogram)
+
+        metric = header("payload_bytes", "histogram", "Encoded size of values written to the cache.")
+        for ns, stats in namespaces:
+            _render_histogram(lines, metric, f'namespace="{_escape(ns)}"', stats.payload_bytes)
+
+        for suffix, (help_text, value) in sorted((gauges or {}).items()):
+            metric = header(suffix, "counter" if suffix.endswith("_total") else "gauge", help_text)
+            lines.append(f"{metric} {_format_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(lines: List[str], metric: str, labels: str, histogram: Histogram) -> None:
+    for bound, count in histogram.cumulative():
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+    lines.append(f"{metric}_sum{{{labels}}} {_format_number(histogram.sum)}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+
+def _format_number(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
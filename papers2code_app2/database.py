@@ -32,6 +32,7 @@ db_users_async: Optional[AsyncCollection] = None # Changed type
 db_implementation_progress_async: Optional[AsyncCollection] = None 
 db_paper_views_async: Optional[AsyncCollection] = None 
 db_popular_papers_recent_async: Optional[AsyncCollection] = None
+db_authors_async: Optional[AsyncCollection] = None
 
 
 def get_mongo_uri_and_db_name() -> Tuple[str, str]:
@@ -44,7 +45,7 @@ def get_mongo_uri_and_db_name() -> Tuple[str, str]:
 
 async def initialize_async_db():
     """Initializes the asynchronous database connection and collections using PyMongo Async API.""" 
-    global async_client, async_db, db_papers_async, db_user_actions_async, db_removed_papers_async, db_users_async, db_implementation_progress_async, db_paper_views_async, db_popular_papers_recent_async
+    global async_client, async_db, db_papers_async, db_user_actions_async, db_removed_papers_async, db_users_async, db_implementation_progress_async, db_paper_views_async, db_popular_papers_recent_async, db_authors_async
     
     if async_client is not None and async_db is not None:
         #logger.info("Asynchronous database connection already initialized.")
@@ -82,6 +83,7 @@ async def initialize_async_db():
         db_implementation_progress_async = async_db["implementation_progress"] # ADDED: Initialize implementation_progress collection
         db_paper_views_async = async_db["paper_views"]
         db_popular_papers_recent_async = async_db["popular_papers_recent"]
+        db_authors_async = async_db["authors"]
         logger.info("Async database collections initialized (PyMongo Async): papers, user_actions, removed_papers, users, implementation_progress, paper_views.")
     except Exception as e:
         logger.critical(f"CRITICAL: Failed to connect to MongoDB asynchronously. URI attempted: {actual_mongo_uri}, DB Name attempted: {actual_db_name}. Error: {e}", exc_info=True)
@@ -185,6 +187,15 @@ async def get_popular_papers_recent_collection_async() -> AsyncCollection:
     return db_popular_papers_recent_async
 
 
+async def get_authors_collection_async() -> AsyncCollection:
+    """Returns the async authors collection (normalized author key -> name, paper count), initializing the db if necessary."""
+    if db_authors_async is None:
+        await initialize_async_db()
+    if db_authors_async is None:
+        raise RuntimeError("Failed to initialize db_authors_async collection.")
+    return db_authors_async
+
+
 async def get_popular_papers_cache_collection_async() -> AsyncCollection:
     """Returns the async popular_papers_cache collection, initializing the db if necessary."""
     if async_db is None:
@@ -362,12 +373,14 @@ async def ensure_db_indexes_async():
         all_index_definitions = [
             (collections_to_check["papers"], [
                 ([("pwcUrl", ASCENDING)], {"name": "pwcUrl_1_papers_async", "unique": True, "sparse": True}),
-                ([("publicationDate", DESCENDING)], {"name": "publicationDate_-1_papers_async"}),
-                ([("upvoteCount", DESCENDING)], {"name": "upvoteCount_-1_papers_async", "sparse": True}),
+                # Sort indexes end in _id, the list tiebreaker, so keyset cursors are index range scans
+                ([("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "publicationDate_-1__id_-1_papers_async"}),
+                ([("upvoteCount", DESCENDING), ("_id", DESCENDING)], {"name": "upvoteCount_-1__id_-1_papers_async"}),
                 ([("arxivId", ASCENDING)], {"name": "arxivId_1_papers_async", "sparse": True}),
-                ([("status", ASCENDING), ("publicationDate", DESCENDING)], {"name": "status_1_publicationDate_-1_papers_async"}),
-                ([("status", ASCENDING), ("upvoteCount", DESCENDING)], {"name": "status_1_upvoteCount_-1_papers_async", "sparse": True}),
-                ([("title", ASCENDING)], {"name": "title_1_papers_async", "collation": {"locale": "en", "strength": 5}, "sparse": True}), # strength:5 for case-insensitivity
+                ([("status", ASCENDING), ("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "status_1_publicationDate_-1__id_-1_papers_async"}),
+                ([("status", ASCENDING), ("upvoteCount", DESCENDING), ("_id", DESCENDING)], {"name": "status_1_upvoteCount_-1__id_-1_papers_async"}),
+                # No collation: list queries don't specify one, and an index with a collation cannot serve their sort
+                ([("title", ASCENDING), ("_id", ASCENDING)], {"name": "title_1__id_1_papers_async"}),
                 ([("implementabilityStatus", ASCENDING)], {"name": "implementabilityStatus_1_papers_async"}),
                 ([("hasCode", ASCENDING)], {"name": "hasCode_1_papers_async", "sparse": True}),  # NEW: Index for has_code filter
                 # Performance-optimized compound indexes for common query patterns
@@ -375,9 +388,18 @@ async def ensure_db_indexes_async():
                 ([("implementabilityStatus", ASCENDING), ("publicationDate", DESCENDING)], {"name": "impl_1_pubDate_-1_papers_async"}),
                 ([("publicationDate", DESCENDING), ("upvoteCount", DESCENDING)], {"name": "pubDate_-1_upvotes_-1_papers_async"}),
                 ([("proceeding", ASCENDING), ("publicationDate", DESCENDING)], {"name": "proceeding_1_pubDate_-1_papers_async"}),
+                # Venue filter: exact match on the normalized venue key
+                ([("venueKey", ASCENDING), ("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "venueKey_1_publicationDate_-1__id_-1_papers_async"}),
                 ([("tasks", ASCENDING), ("publicationDate", DESCENDING)], {"name": "tasks_1_pubDate_-1_papers_async"}),
                 ([("status", ASCENDING), ("tasks", ASCENDING), ("publicationDate", DESCENDING)], {"name": "status_1_tasks_1_pubDate_-1_papers_async"}),
                 ([("hasCode", ASCENDING), ("publicationDate", DESCENDING)], {"name": "hasCode_1_pubDate_-1_papers_async"}),  # NEW: Compound index for hasCode filtering
+                # Official implementation filter on the precomputed flag, for both list sorts
+                ([("hasOfficialImpl", ASCENDING), ("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "hasOfficialImpl_1_publicationDate_-1__id_-1_papers_async"}),
+                ([("hasOfficialImpl", ASCENDING), ("upvoteCount", DESCENDING), ("_id", DESCENDING)], {"name": "hasOfficialImpl_1_upvoteCount_-1__id_-1_papers_async"}),
+                # Contributor filter: multikey on the materialized contributorIds set
+                ([("contributorIds", ASCENDING), ("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "contributorIds_1_publicationDate_-1__id_-1_papers_async"}),
+                # Exact author filter: multikey on the normalized authorKeys
+                ([("authorKeys", ASCENDING), ("publicationDate", DESCENDING), ("_id", DESCENDING)], {"name": "authorKeys_1_publicationDate_-1__id_-1_papers_async"}),
                 # TEXT INDEX: Fast full-text search on title, abstract, and authors (replaces slow regex)
                 ([("title", "text"), ("abstract", "text"), ("authors", "text")], {"name": "title_abstract_authors_text_papers_async", "weights": {"title": 10, "abstract": 2, "authors": 5}, "default_language": "english"}),
             ]),
@@ -18,6 +18,9 @@ from contextlib import asynccontextmanager  # ADDED: For lifespan event handler
 from typing import Optional, Dict
 
 from .database import ensure_db_indexes_async, initialize_sync_db, initialize_async_db
+from .cache import paper_cache
+from .services.cache_warmer import cache_warmer
+from .search import local_search_index, suggest_index
 from .shared import config_settings
 
 # from .routers import users, auth, admin, user_profile, research_fields, conference_series, conferences, proceedings, links, stats # Commented out missing routers
@@ -296,10 +299,22 @@ async def lifespan(app: FastAPI):
     await initialize_async_db()  # ADDED: Initialize async DB for dashboard and other async operations
     # logger.info("Application startup: Ensuring database indexes...")
     await ensure_db_indexes_async()
+    # Subscribe this worker's L1 cache to cross-worker invalidation broadcasts
+    await paper_cache.start()
+    # Pre-populate popular search pages in the background; startup does not wait for it
+    cache_warmer.start()
+    # Load (or build) the local search index in the background when it is a search backend
+    local_search_index.start()
+    # Title/author typeahead, rebuilt periodically and on metadata invalidation
+    suggest_index.start()
     # logger.info("Database index check complete during lifespan startup")
     yield
     # Code to run when the application is shutting down
     # logger.info("Application shutdown in lifespan context")
+    await cache_warmer.stop()
+    await local_search_index.stop()
+    await suggest_index.stop()
+    await paper_cache.close()
 
 
 app = FastAPI(
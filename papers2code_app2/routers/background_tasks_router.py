@@ -12,7 +12,8 @@ The actual task logic (update_email_statuses_task) is also used by
 cron scripts that run directly against the database.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any
 import logging
@@ -21,6 +22,8 @@ from papers2code_app2.database import get_implementation_progress_collection_asy
 from papers2code_app2.schemas.implementation_progress import ProgressStatus, UpdateEventType
 from papers2code_app2.schemas.minimal import UserSchema
 from papers2code_app2.auth import get_current_owner
+from papers2code_app2.cache import paper_cache
+from papers2code_app2.services.paper_moderation_service import PaperModerationService
 
 router = APIRouter(prefix="/admin/tasks", tags=["Background Tasks"])
 logger = logging.getLogger(__name__)
@@ -79,6 +82,8 @@ async def update_email_statuses_task() -> Dict[str, Any]:
                 )
                 if result.modified_count > 0:
                     updated_count += 1
+                    # The progress _id is the paper's _id
+                    await paper_cache.invalidate_paper_detail(str(progress["_id"]))
             except Exception as e:
                 errors.append(f"Failed to update {progress.get('_id')}: {str(e)}")
         
@@ -117,6 +122,26 @@ async def trigger_email_status_update(
         "result": result
     }
 
+@router.post("/reconcile-vote-counters")
+async def trigger_vote_counter_reconciliation(
+    repair: bool = Query(default=True, description="Rewrite drifted counters (false only reports them)"),
+    current_user: UserSchema = Depends(get_current_owner)
+):
+    """
+    Verify the papers' implementability vote counters against user_actions and repair drift.
+
+    Requires owner authentication.
+    """
+    logger.info(f"Vote counter reconciliation triggered by owner: {current_user.username}")
+
+    result = await PaperModerationService().reconcile_vote_counters(repair=repair)
+
+    return {
+        "message": "Vote counter reconciliation completed",
+        "triggered_by": current_user.username,
+        "result": result
+    }
+
 @router.get("/test")
 async def test_endpoint(current_user: UserSchema = Depends(get_current_owner)):
     """
@@ -158,3 +183,22 @@ async def health_check(current_user: UserSchema = Depends(get_current_owner)):
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "authenticated_as": current_user.username
         }
+
+@router.get("/cache-stats")
+async def cache_stats(
+    format: str = Query(default="prometheus", pattern="^(prometheus|json)$", description="prometheus or json"),
+    current_user: UserSchema = Depends(get_current_owner)
+):
+    """
+    Cache statistics for this worker: hits, misses, stale serves, errors, latency and
+    payload size histograms per namespace, plus coalescing and in-process cache occupancy.
+
+    Requires owner authentication.
+    """
+    if format == "json":
+        return {
+            "cache": paper_cache.metrics_snapshot(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "authenticated_as": current_user.username
+        }
+    return PlainTextResponse(paper_cache.render_prometheus(), media_type="text/plain; version=0.0.4")
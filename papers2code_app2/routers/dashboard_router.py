@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from ..auth import get_current_user
 from ..schemas.minimal import UserSchema
 from ..services.dashboard_service import DashboardService, dashboard_service
-from ..schemas.papers import PaperResponse
+from ..utils.serialization import PAPER_SECTIONS_ADAPTER, trusted_json_response
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 logger = logging.getLogger(__name__)
@@ -49,7 +49,7 @@ async def get_dashboard_data(
         }
         logger.info(f"Dashboard data prepared for user {user_id}. Returning response.")
         
-        return response_data
+        return trusted_json_response(PAPER_SECTIONS_ADAPTER, response_data)
     except Exception as e:
         logger.error(f"Dashboard data fetch failed for user {user_id}: {e}", exc_info=True)
         raise HTTPException(
@@ -7,11 +7,11 @@ from ..dependencies import limiter, get_paper_action_service
 
 from ..schemas.papers import PaperResponse, PaperActionsSummaryResponse
 from ..schemas.minimal import UserSchema
-from ..utils import transform_papers_batch
 from ..auth import get_current_user
 from ..services.paper_action_service import PaperActionService, ACTION_PROJECT_STARTED, ACTION_PROJECT_JOINED # Added action types
 from ..services.paper_view_service import PaperViewService
 from ..error_handlers import handle_service_errors
+from ..utils.serialization import PAPER_ADAPTER, construct_paper, trusted_json_response
 
 router = APIRouter(
     prefix="/papers",
@@ -53,13 +53,10 @@ async def vote_on_paper(
             vote_type=vote_type
         )
 
-        # Get the complete paper with implementation progress
+        # The vote dropped the cached detail, so this reads the updated paper
         paper_view_service = PaperViewService()
-        complete_paper_doc = await paper_view_service.get_paper_by_id(paper_id, user_id_str)
-
-        # Use batch transformation for consistency and efficiency
-        transformed_papers = await transform_papers_batch([complete_paper_doc], user_id_str, detail_level="full")
-        return transformed_papers[0] if transformed_papers else complete_paper_doc
+        detail = await paper_view_service.get_paper_detail(paper_id, user_id_str)
+        return trusted_json_response(PAPER_ADAPTER, construct_paper(detail))
 
     except InvalidId:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid paper or user ID format")
@@ -8,6 +8,7 @@ from ..schemas.papers import (
 )
 from ..schemas.minimal import UserSchema
 from ..utils import transform_papers_batch
+from ..utils.serialization import PAPER_ADAPTER, construct_paper, trusted_json_response
 from ..auth import get_current_user, get_current_owner
 from ..services.paper_moderation_service import PaperModerationService
 from ..error_handlers import handle_service_errors
@@ -43,7 +44,9 @@ async def flag_paper_implementability(
         )
         # Use batch transformation for consistency
         transformed_papers = await transform_papers_batch([updated_paper_doc], user_id_str, detail_level="full")
-        return transformed_papers[0] if transformed_papers else updated_paper_doc
+        if transformed_papers:
+            return trusted_json_response(PAPER_ADAPTER, construct_paper(transformed_papers[0]))
+        return updated_paper_doc
 
     except InvalidId:  # This might still be raised by ObjectId conversion if not caught in service for some reason
         logger.warning(f"Router: InvalidId encountered for paper {paper_id} or user {user_id_str}.")
@@ -81,7 +84,9 @@ async def set_paper_implementability(
         )
         # Use batch transformation for consistency
         transformed_papers = await transform_papers_batch([updated_paper_doc], admin_user_id_str, detail_level="full")
-        return transformed_papers[0] if transformed_papers else updated_paper_doc
+        if transformed_papers:
+            return trusted_json_response(PAPER_ADAPTER, construct_paper(transformed_papers[0]))
+        return updated_paper_doc
 
     except InvalidId:  # Should be caught by service, but as a fallback
         logger.warning(f"Router: InvalidId encountered for set_implementability paper {paper_id}.")
@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response, BackgroundTasks
 from typing import List, Optional, Dict
 
-from ..schemas.papers import PaperResponse, PaginatedPaperResponse
+from ..schemas.papers import PaperResponse, PaginatedPaperResponse, VenueOption, SuggestResponse, AuthorPage, MyStateRequest, MyStateResponse
 from ..schemas.minimal import UserSchema as User  # Using UserSchema as User for type hinting
 from ..services.paper_view_service import PaperViewService
 from ..services.activity_tracking_service import ActivityTrackingService
 from ..dependencies import get_paper_view_service, get_activity_tracking_service
 from ..services.exceptions import DatabaseOperationException
 from ..error_handlers import handle_service_errors
-from ..auth import get_current_user_optional # Changed from get_current_user
+from ..auth import get_current_user, get_current_user_optional
+from ..shared import config_settings
 from ..utils import transform_papers_batch
+from ..utils.pagination import encode_cursor
+from ..utils.paper_json import encode_paper_page
+from ..utils.serialization import (
+    PAPER_ADAPTER,
+    PAPER_LIST_ADAPTER,
+    PAPER_PAGE_ADAPTER,
+    construct_paper,
+    construct_paper_page,
+    construct_papers,
+    trusted_json_response,
+)
 import logging
 import time # Add time import for performance logging
 
@@ -21,7 +33,15 @@ router = APIRouter(
 )
 
 
+def _set_public_cache_headers(response: Response) -> None:
+    """Let browsers and CDNs reuse a response that is the same for every viewer."""
+    max_age = config_settings.PUBLIC_RESPONSE_MAX_AGE
+    if max_age > 0:
+        response.headers["Cache-Control"] = f"public, max-age={max_age}, stale-while-revalidate={max_age}"
+
+
 @router.get("/", response_model=PaginatedPaperResponse)
+@handle_service_errors
 async def list_papers(
     # Parameters without default values first
     request: Request,
@@ -39,58 +59,102 @@ async def list_papers(
     contributor_id: Optional[str] = Query(default=None, alias="contributorId", description="Filter papers by contributor user ID (shows papers user has worked on)"),
     venue: Optional[str] = Query(default=None, description="Filter by publication venue (e.g., CVPR, NeurIPS)"),
     author: Optional[str] = Query(default=None, alias="searchAuthors", description="Filter by author name (searches author list)"), # Corrected alias to searchAuthors
+    author_key: Optional[str] = Query(default=None, alias="authorKey", description="Exact author filter: a key from /meta/authors/ or any spelling of the name"),
     start_date: Optional[str] = Query(default=None, alias="startDate", description="Filter by publication start date (ISO format YYYY-MM-DD)"), # ADDED alias
     end_date: Optional[str] = Query(default=None, alias="endDate", description="Filter by publication end date (ISO format YYYY-MM-DD)"),   # ADDED alias
-    service: PaperViewService = Depends(get_paper_view_service),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    cursor: Optional[str] = Query(default=None, description="Opaque nextCursor from the previous page; takes precedence over page and stays fast on deep pages (not available for searches)"),
+    facets: Optional[str] = Query(default=None, description="Comma-separated facet counts to return with the page, scoped to the filters. Allowed: status, tags, venue"),
+    service: PaperViewService = Depends(get_paper_view_service)
 ):
+    # The page is the same for every viewer (their own votes come from POST /papers/my-state),
+    # so it is built from the shared caches and may be cached by browsers and CDNs
     router_start_time = time.time() # Start timer for the entire endpoint
     skip = (page - 1) * limit # Calculate skip from page and limit
     logger.info(f"Router: list_papers called with: page={page}, limit={limit}, sort_by='{sort_by}', search_query='{search_query}', author='{author}'") # More concise initial log
-    user_id_str = str(current_user.id) if current_user and current_user.id else None
     
     # Performance logging
     logger.info(f"list_papers called with: query='{search_query}', sort_by='{sort_by}', sort_order='{sort_order}', skip={skip}, limit={limit}'")
 
-    current_user_id_str = str(current_user.id) if current_user else None
-    
     start_time_service = time.time()
-    papers_cursor, total_papers = await service.get_papers_list(
+    requested_facets = [f.strip() for f in facets.split(",") if f.strip()] if facets else None
+    papers_cursor, total_papers, facet_counts = await service.get_papers_list(
         skip=skip, limit=limit, sort_by=sort_by, sort_order=sort_order,
-        user_id=user_id_str,
         main_status=main_status, impl_status=impl_status,
         search_query=search_query, tags=tags,
         has_official_impl=has_official_impl,
         has_code=has_code,
         contributor_id=contributor_id,
-        venue=venue, author=author,
-        start_date=start_date, end_date=end_date
+        venue=venue, author=author, author_key=author_key,
+        start_date=start_date, end_date=end_date,
+        cursor=cursor,
+        facets=requested_facets
     )
     end_time_service = time.time()
+
+    # Keyset cursor for the next page, built from the raw document's sort key and _id
+    if cursor:
+        has_more = len(papers_cursor) == limit
+    else:
+        has_more = (skip + len(papers_cursor)) < total_papers
+    next_cursor = None
+    if has_more and papers_cursor and not (search_query or author):
+        next_cursor = encode_cursor(papers_cursor[-1], sort_by, sort_order)
     logger.info(f"PERF: service.get_papers_list took {end_time_service - start_time_service:.4f} seconds.")
 
+    MAX_COUNT = 10000
+    page_fields = {
+        "total_count": total_papers,
+        "count_capped": total_papers >= MAX_COUNT,
+        "page": page,
+        "page_size": limit,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "facets": facet_counts
+    }
+
+    if config_settings.LIST_JSON_FAST_PATH:
+        # Same JSON as below, encoded straight from the projected documents
+        fast_response = Response(content=encode_paper_page(papers_cursor, page_fields), media_type="application/json")
+        _set_public_cache_headers(fast_response)
+        logger.info(f"Router: list_papers endpoint total execution time: {time.time() - router_start_time:.4f}s (fast path)")
+        return fast_response
+
     start_time_transform = time.time()
     
     # OPTIMIZATION: Use batch transformation instead of individual transformations
-    # This reduces DB queries from N to 2 (one for user data, one for vote counts)
-    transformed_papers = await transform_papers_batch(papers_cursor, current_user_id_str, detail_level="full")
+    transformed_papers = await transform_papers_batch(papers_cursor, None, detail_level="full")
     
     end_time_transform = time.time()
     logger.info(f"PERF: Batch transforming {len(transformed_papers)} papers took {end_time_transform - start_time_transform:.4f} seconds.")
 
     #logger.info(f"Router: Successfully fetched {len(response_papers)} papers for listing. Total matching: {total_papers}")
-    MAX_COUNT = 10000
-    final_response = {
-        "papers": transformed_papers,
-        "total_count": total_papers,
-        "count_capped": total_papers >= MAX_COUNT,
-        "page": page,
-        "page_size": limit,
-        "has_more": (skip + len(transformed_papers)) < total_papers
-    }
+    final_response = trusted_json_response(PAPER_PAGE_ADAPTER, construct_paper_page(transformed_papers, **page_fields))
+    _set_public_cache_headers(final_response)
     logger.info(f"Router: list_papers endpoint total execution time: {time.time() - router_start_time:.4f}s")
     return final_response
 
+# Declared before /{paper_id}, which would otherwise capture "suggest" as a paper ID
+@router.get("/suggest", response_model=SuggestResponse)
+@handle_service_errors
+async def suggest_papers(
+    q: str = Query(..., min_length=1, max_length=200, description="What the user has typed so far"),
+    limit: int = Query(5, ge=1, le=10, description="Completions returned per kind"),
+    service: PaperViewService = Depends(get_paper_view_service)
+):
+    """Title and author completions for the search box, served from memory on every keystroke."""
+    return service.suggest(q, limit)
+
+@router.post("/my-state", response_model=MyStateResponse)
+@handle_service_errors
+async def get_my_paper_states(
+    body: MyStateRequest,
+    service: PaperViewService = Depends(get_paper_view_service),
+    current_user: User = Depends(get_current_user)
+):
+    """The caller's upvote and implementability vote on up to 100 papers, in one indexed query."""
+    states = await service.get_user_paper_states(str(current_user.id), body.paper_ids)
+    return {"states": states}
+
 @router.get("/{paper_id}", response_model=PaperResponse)
 @handle_service_errors
 async def get_paper(
@@ -107,10 +171,9 @@ async def get_paper(
     user_id_str = str(current_user.id) if current_user and current_user.id else None # Corrected to check current_user.id
 
     try:
-        paper_doc = await service.get_paper_by_id(paper_id, user_id_str)
-        # Use batch transformation even for single paper (efficient implementation)
-        transformed_papers = await transform_papers_batch([paper_doc], user_id_str, detail_level="full")
-        paper_response = transformed_papers[0] if transformed_papers else None
+        # The cached public detail; the viewer's own votes come from POST /papers/my-state.
+        # The user is only needed to record the view
+        paper_response = await service.get_paper_detail(paper_id)
         
         if not paper_response:
             raise HTTPException(status_code=404, detail="Paper not found or transformation failed")
@@ -128,21 +191,17 @@ async def get_paper(
         raise HTTPException(status_code=500, detail="An unexpected error occurred while fetching the paper.")
     
     #logger.info(f"Router: Successfully fetched paper ID: {paper_id}")
-    return paper_response
+    return trusted_json_response(PAPER_ADAPTER, construct_paper(paper_response))
 
 @router.get("/by_arxiv_ids/", response_model=List[PaperResponse])
 @handle_service_errors
 async def get_papers_by_arxiv_ids_route(
-    # Parameters without default values first (none here)
-    # Then parameters with default values
     arxiv_ids: List[str] = Query(..., description="List of arXiv IDs to fetch papers for."),
-    service: PaperViewService = Depends(get_paper_view_service),
-    current_user: Optional[User] = Depends(get_current_user_optional)  
+    service: PaperViewService = Depends(get_paper_view_service)
 ):
     #logger.info(f"Router: Getting papers by arXiv IDs: {arxiv_ids}")
     if not arxiv_ids:
         return []
-    user_id_str = str(current_user.id) if current_user else None
     try:
         papers_db = await service.get_papers_by_arxiv_ids(arxiv_ids)
     except DatabaseOperationException as e:
@@ -154,24 +213,26 @@ async def get_papers_by_arxiv_ids_route(
 
     # OPTIMIZATION: Use batch transformation
     try:
-        transformed_papers = await transform_papers_batch(papers_db, user_id_str, detail_level="full")
-        response_papers = transformed_papers
+        transformed_papers = await transform_papers_batch(papers_db, None, detail_level="full")
     except Exception as e:
         logger.error(f"Router: Error batch transforming papers for arXiv ID list: {e}", exc_info=True)
-        response_papers = []
+        return []
     
-    #logger.info(f"Router: Successfully fetched {len(response_papers)} papers by arXiv IDs.")
-    return response_papers
+    #logger.info(f"Router: Successfully fetched {len(transformed_papers)} papers by arXiv IDs.")
+    response = trusted_json_response(PAPER_LIST_ADAPTER, construct_papers(transformed_papers))
+    _set_public_cache_headers(response)
+    return response
 
 @router.get("/meta/distinct_tags/", response_model=List[str])
 @handle_service_errors
 async def get_distinct_tags_route(
     query: Optional[str] = Query(default=None, description="Optional search term to filter tags"),
+    limit: int = Query(default=PaperViewService.TAG_SEARCH_LIMIT, ge=1, le=200, description="Maximum tags returned for a search"),
     service: PaperViewService = Depends(get_paper_view_service)
 ):
     #logger.info("Router: Getting distinct tags.")
     try:
-        tags = await service.get_distinct_tags(search_query=query)
+        tags = await service.get_distinct_tags(search_query=query, limit=limit)
     except DatabaseOperationException as e:
         logger.error(f"Router: Database error fetching distinct tags: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -198,14 +259,35 @@ async def get_distinct_venues_route(
     #logger.info(f"Router: Successfully fetched {len(venues)} distinct venues.")
     return venues
 
+@router.get("/meta/venues/", response_model=List[VenueOption])
+@handle_service_errors
+async def get_venue_options_route(
+    service: PaperViewService = Depends(get_paper_view_service)
+):
+    """Distinct venues with the normalized key the ``venue`` filter matches exactly."""
+    return await service.get_venue_options()
+
+@router.get("/meta/authors/", response_model=AuthorPage)
+@handle_service_errors
+async def get_authors_route(
+    prefix: Optional[str] = Query(default=None, max_length=200, description="Start of the author name (case and accents ignored)"),
+    limit: int = Query(default=50, ge=1, le=200),
+    after: Optional[str] = Query(default=None, description="nextCursor of the previous page"),
+    service: PaperViewService = Depends(get_paper_view_service)
+):
+    """Authors with their paper counts, in name order; keys feed the authorKey list filter."""
+    return await service.get_author_page(prefix=prefix, limit=limit, after=after)
+
 @router.get("/meta/distinct_authors/", response_model=List[str])
 @handle_service_errors
 async def get_distinct_authors_route(
+    prefix: Optional[str] = Query(default=None, max_length=200, description="Start of the author name (case and accents ignored)"),
+    limit: int = Query(default=50, ge=1, le=200),
     service: PaperViewService = Depends(get_paper_view_service)
 ):
     #logger.info("Router: Getting distinct authors.")
     try:
-        authors = await service.get_distinct_authors()
+        authors = await service.get_distinct_authors(prefix=prefix, limit=limit)
     except DatabaseOperationException as e:
         logger.error(f"Router: Database error fetching distinct authors: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
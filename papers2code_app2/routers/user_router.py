@@ -9,6 +9,7 @@ from ..dependencies import get_user_service # To be created
 from ..auth import get_current_user_optional, get_current_user, get_token_from_cookie
 from ..schemas.minimal import UserSchema, UserUpdateProfile
 from ..error_handlers import handle_service_errors
+from ..utils.serialization import USER_PROFILE_ADAPTER, trusted_json_response
 from ..services.exceptions import UserNotFoundException
 from ..database import get_users_collection_async
 from ..auth.token_utils import SECRET_KEY, ALGORITHM
@@ -32,7 +33,7 @@ async def get_user_profile(
         # The service will determine if the requesting user is the profile owner or an admin
         # for potential private data, though for now, all profile data is public.
         profile_data = await user_service.get_user_profile_by_username(username, current_user)
-        return profile_data
+        return trusted_json_response(USER_PROFILE_ADAPTER, profile_data)
     except UserNotFoundException:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     except Exception as e:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl, computed_field
-from typing import List, Optional, Literal, TYPE_CHECKING
+from typing import Dict, List, Optional, Literal, TYPE_CHECKING
 from datetime import datetime
 
 from .db_models import PyObjectId  # ADDED: Import PyObjectId
@@ -86,9 +86,72 @@ class PaginatedPaperResponse(BaseModel):
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Keyset cursor for the next page (absent for searches and the last page)
+    facets: Optional[Dict[str, Dict[str, int]]] = None  # Requested facet -> {value: count}, scoped to the filters
 
     model_config = camel_case_config
 
+class VenueOption(BaseModel):
+    """A venue in the filter list: the display name and the key the venue filter matches."""
+    name: str
+    key: str
+
+class TitleSuggestion(BaseModel):
+    """A paper whose title completes the typed prefix."""
+    id: str
+    title: str
+    upvote_count: int
+
+    model_config = camel_case_config
+
+class AuthorSuggestion(BaseModel):
+    """An author whose name (or surname) completes the typed prefix, with the key the authorKey filter matches."""
+    name: str
+    key: str
+    paper_count: int
+
+    model_config = camel_case_config
+
+class AuthorEntry(BaseModel):
+    """An author in the author index: display name, normalized key and number of papers."""
+    key: str
+    name: str
+    paper_count: int
+
+    model_config = camel_case_config
+
+class AuthorPage(BaseModel):
+    """A page of authors in key order; pass next_cursor as ``after`` for the next page."""
+    authors: List[AuthorEntry]
+    next_cursor: Optional[str] = None
+
+    model_config = camel_case_config
+
+class SuggestResponse(BaseModel):
+    """Typeahead completions for the search box, most popular first."""
+    titles: List[TitleSuggestion]
+    authors: List[AuthorSuggestion]
+
+MAX_MY_STATE_PAPERS = 100
+
+class MyStateRequest(BaseModel):
+    """Papers whose per-user state the client needs, typically the ones on screen."""
+    paper_ids: List[str] = Field(..., min_length=1, max_length=MAX_MY_STATE_PAPERS)
+
+    model_config = camel_case_config
+
+class PaperUserState(BaseModel):
+    """The caller's own votes on one paper, which the public paper payloads leave out."""
+    paper_id: str
+    current_user_vote: Optional[str] = None
+    current_user_implementability_vote: Optional[str] = None
+
+    model_config = camel_case_config
+
+class MyStateResponse(BaseModel):
+    """The caller's state for each requested paper, in request order (duplicates dropped)."""
+    states: List[PaperUserState]
+
 class SetImplementabilityRequest(BaseModel):
     """Request schema for setting or updating the implementability status of a paper."""
     status_to_set: str = Field(..., alias="statusToSet")
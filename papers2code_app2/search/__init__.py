@@ -0,0 +1,20 @@
+# Re-export the local search API so callers import from `papers2code_app2.search`
+# The on-disk segment format lives in segment.py, ranking and the overlay in engine.py,
+# the title/author typeahead in suggest.py, tag substring search in tags.py
+from .engine import LocalSearchIndex, SearchHit, local_search_index
+from .segment import Segment, SegmentWriter, tokenize
+from .suggest import SuggestIndex, normalize_prefix, suggest_index
+from .tags import TagIndex
+
+__all__ = [
+    'LocalSearchIndex',
+    'SearchHit',
+    'local_search_index',
+    'Segment',
+    'SegmentWriter',
+    'tokenize',
+    'SuggestIndex',
+    'normalize_prefix',
+    'suggest_index',
+    'TagIndex',
+]
@@ -0,0 +1,409 @@
+"""
+In-process full-text search over papers, usable without Atlas Search.
+
+``LocalSearchIndex`` ranks papers by BM25 over title, abstract and authors, with title matches
+weighted by ATLAS_SEARCH_TITLE_BOOST like the Atlas query, and filters by status, tags and
+publication date. The bulk of the index is an immutable segment (see segment.py) built from a
+snapshot of the papers collection and memory-mapped, so all workers share one copy; one worker
+rebuilds it every LOCAL_SEARCH_REBUILD_INTERVAL while the others keep serving the old one.
+Between rebuilds each worker keeps a small in-memory overlay: papers inserted since the snapshot
+(polled by ``_id``), status changes it makes itself, and papers it removes.
+
+Selected with SEARCH_BACKEND=local, or as the fallback when Atlas Search fails with
+SEARCH_FALLBACK=local.
+"""
+import asyncio
+import logging
+import math
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from bson import ObjectId  # type: ignore
+from bson.errors import InvalidId  # type: ignore
+from pymongo import ASCENDING  # type: ignore
+
+from ..cache import paper_cache
+from ..database import get_papers_collection_async
+from ..shared import config_settings
+from .segment import FIELDS, NO_DATE, Segment, SegmentWriter, date_days, field_tokens, tokenize
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (the Lucene defaults Atlas Search uses as well)
+K1 = 1.2
+B = 0.75
+
+
+class SearchHit(NamedTuple):
+    paper_id: ObjectId
+    score: float
+    date: int  # days since the epoch, NO_DATE if unknown
+
+
+class _OverlayPaper:
+    """A paper indexed in memory since the segment was built"""
+    __slots__ = ("status", "tags", "date", "lens", "tfs")
+
+    def __init__(self, paper: Dict[str, Any]):
+        counters = [Counter(tokens) for tokens in field_tokens(paper)]
+        self.status: str = paper.get("status") or ""
+        self.tags: Set[str] = set(paper.get("tasks") or [])
+        self.date: int = date_days(paper.get("publicationDate"))
+        self.lens: Tuple[int, ...] = tuple(sum(c.values()) for c in counters)
+        self.tfs: Dict[str, Tuple[int, ...]] = {
+            term: tuple(c.get(term, 0) for c in counters) for term in set().union(*counters)
+        }
+
+
+def _bm25_tf(tf: int, length: int, avg_len: float) -> float:
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_len))
+
+
+def _day_bounds(start_date: Optional[datetime], end_date: Optional[datetime]) -> Tuple[Optional[int], Optional[int]]:
+    return (
+        date_days(start_date) if start_date else None,
+        date_days(end_date) if end_date else None,
+    )
+
+
+class LocalSearchIndex:
+    SNAPSHOT_PROJECTION = {"title": 1, "abstract": 1, "authors": 1, "publicationDate": 1, "status": 1, "tasks": 1}
+    SNAPSHOT_BATCH_SIZE = 2000
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self.segment: Optional[Segment] = None
+        self._segment_stat: Optional[Tuple[int, int]] = None
+        self._retired: Optional[Segment] = None
+        self._tag_ids: Dict[str, int] = {}
+        self._status_ids: Dict[str, int] = {}
+        self._overlay: Dict[ObjectId, _OverlayPaper] = {}
+        self._hidden: Set[int] = set()  # segment docs superseded by the overlay or removed
+        self._status_overrides: Dict[int, str] = {}
+        self._watermark: Optional[ObjectId] = None
+        self._task: Optional["asyncio.Task[Any]"] = None
+        self._started = False
+        self.last_build: Dict[str, Any] = {}
+
+    @property
+    def path(self) -> str:
+        return (
+            self._path
+            or config_settings.LOCAL_SEARCH_INDEX_PATH
+            or os.path.join(tempfile.gettempdir(), "papers2code_search.seg")
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.segment is not None
+
+    @staticmethod
+    def enabled() -> bool:
+        return "local" in (config_settings.SEARCH_BACKEND, config_settings.SEARCH_FALLBACK)
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> None:
+        """Load or build the index in the background and keep it fresh (called on application startup)."""
+        if self._started or not self.enabled():
+            return
+        self._started = True
+        paper_cache.add_paper_listener(self.update_paper)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        for segment in (self.segment, self._retired):
+            if segment is not None:
+                segment.close()
+        self.segment = self._retired = None
+        self._segment_stat = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Local search index sync failed: {e}", exc_info=True)
+            await asyncio.sleep(config_settings.LOCAL_SEARCH_REFRESH_INTERVAL)
+
+    async def sync(self) -> None:
+        """Rebuild the segment if it is due (one worker at a time), map a newer one, then poll new papers."""
+        path = self.path
+        if self._is_stale(path) and self._acquire_build_lock(path):
+            try:
+                await self.build(path)
+            finally:
+                self._release_build_lock(path)
+        if os.path.exists(path) and self._stat(path) != self._segment_stat:
+            self.load(path)
+        if self.segment is not None:
+            await self.refresh()
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_ino, st.st_mtime_ns
+
+    @staticmethod
+    def _is_stale(path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(path) > config_settings.LOCAL_SEARCH_REBUILD_INTERVAL
+        except OSError:
+            return True
+
+    @staticmethod
+    def _acquire_build_lock(path: str) -> bool:
+        lock_path = f"{path}.lock"
+        for _ in range(2):
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                # A worker that died mid-build leaves its lock behind; take it over once it is old
+                try:
+                    if time.time() - os.path.getmtime(lock_path) < config_settings.LOCAL_SEARCH_REBUILD_INTERVAL:
+                        return False
+                    os.remove(lock_path)
+                except OSError:
+                    return False
+        return False
+
+    @staticmethod
+    def _release_build_lock(path: str) -> None:
+        try:
+            os.remove(f"{path}.lock")
+        except OSError:
+            pass
+
+    async def build(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Write a new segment from a snapshot of the papers collection. Tokenizing runs off the event loop."""
+        path = path or self.path
+        started = time.monotonic()
+        papers_collection = await get_papers_collection_async()
+        writer = SegmentWriter()
+        batch: List[Dict[str, Any]] = []
+        cursor = papers_collection.find({}, self.SNAPSHOT_PROJECTION).sort("_id", ASCENDING).batch_size(self.SNAPSHOT_BATCH_SIZE)
+        async for paper in cursor:
+            batch.append(paper)
+            if len(batch) >= self.SNAPSHOT_BATCH_SIZE:
+                await asyncio.to_thread(writer.add_many, batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(writer.add_many, batch)
+        header = await asyncio.to_thread(writer.write, path)
+
+        self.last_build = {
+            "docs": header["doc_count"],
+            "terms": header["term_count"],
+            "bytes": os.path.getsize(path),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Built local search segment {path}: {self.last_build}")
+        return self.last_build
+
+    def load(self, path: Optional[str] = None) -> None:
+        """Map a segment file and drop the overlay entries it now covers"""
+        path = path or self.path
+        stat = self._stat(path)
+        segment = Segment(path)
+        # A search may still be reading the previous segment in a worker thread; close it a swap later
+        if self._retired is not None:
+            self._retired.close()
+        self._retired = self.segment
+        self.segment = segment
+        self._segment_stat = stat
+        self._tag_ids = {tag: i for i, tag in enumerate(segment.tags)}
+        self._status_ids = {status: i for i, status in enumerate(segment.statuses)}
+        last_id = segment.last_id
+        self._overlay = {pid: paper for pid, paper in self._overlay.items() if last_id is None or pid > last_id}
+        self._hidden = set()
+        self._status_overrides = {}
+        if last_id is not None and (self._watermark is None or last_id > self._watermark):
+            self._watermark = last_id
+        logger.info(f"Loaded local search segment {path}: {segment.doc_count} papers, {segment.term_count} terms")
+
+    async def refresh(self) -> int:
+        """Index papers inserted since the segment (or the last refresh) was built. Returns how many."""
+        papers_collection = await get_papers_collection_async()
+        query = {"_id": {"$gt": self._watermark}} if self._watermark else {}
+        added = 0
+        async for paper in papers_collection.find(query, self.SNAPSHOT_PROJECTION).sort("_id", ASCENDING):
+            self.add_paper(paper)
+            added += 1
+        if added:
+            logger.info(f"Local search index: {added} new papers added to the overlay")
+        return added
+
+    # ==================== INCREMENTAL UPDATES ====================
+
+    def add_paper(self, paper: Dict[str, Any]) -> None:
+        """Index (or re-index) one paper in the overlay"""
+        paper_id = paper["_id"]
+        self._overlay[paper_id] = _OverlayPaper(paper)
+        self._hide(paper_id)
+        if self._watermark is None or paper_id > self._watermark:
+            self._watermark = paper_id
+
+    def remove_paper(self, paper_id: ObjectId) -> None:
+        self._overlay.pop(paper_id, None)
+        self._hide(paper_id)
+
+    def update_paper(self, paper_id: str, fields: Dict[str, Any]) -> None:
+        """Paper listener: reflect a status change made by this worker"""
+        if "status" not in fields:
+            return
+        try:
+            oid = ObjectId(paper_id)
+        except (InvalidId, TypeError):
+            return
+        status = fields["status"] or ""
+        if oid in self._overlay:
+            self._overlay[oid].status = status
+        elif self.segment is not None:
+            doc = self.segment.doc_index(oid)
+            if doc is not None:
+                self._status_overrides[doc] = status
+
+    def _hide(self, paper_id: ObjectId) -> None:
+        if self.segment is not None:
+            doc = self.segment.doc_index(paper_id)
+            if doc is not None:
+                self._hidden.add(doc)
+
+    # ==================== SEARCH ====================
+
+    def search(
+        self,
+        query: Optional[str],
+        author: Optional[str] = None,
+        status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[SearchHit]:
+        """
+        Papers matching any term of ``query`` (and every term of ``author`` in their authors),
+        best BM25 score first, newest first on ties. With only ``author`` every hit scores 0.
+        Every match is returned unless ``limit`` is given.
+        """
+        segment = self.segment
+        if segment is None:
+            raise RuntimeError("Local search index is not loaded")
+        terms = list(dict.fromkeys(tokenize(query)))
+        author_terms = list(dict.fromkeys(tokenize(author)))
+        if not terms and not author_terms:
+            return []
+
+        boost = config_settings.ATLAS_SEARCH_TITLE_BOOST
+        weights = (boost, 1.0, 1.0)
+        avg_lens = [segment.avg_len[field] or 1.0 for field in FIELDS]
+        doc_count = segment.doc_count - len(self._hidden) + len(self._overlay)
+
+        base_scores: Dict[int, float] = {}
+        overlay_scores: Dict[ObjectId, float] = {}
+        for term in terms:
+            postings = segment.postings(term)
+            overlay_tfs = [(pid, paper) for pid, paper in self._overlay.items() if term in paper.tfs]
+            df = (len(postings.docs) if postings else 0) + len(overlay_tfs)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            if postings:
+                title_lens, abstract_lens, author_lens = segment.doc_lens
+                title_w, abstract_w, author_w = weights
+                title_avg, abstract_avg, author_avg = avg_lens
+                for doc, title_tf, abstract_tf, author_tf in zip(postings.docs, *postings.tfs):
+                    score = 0.0
+                    if title_tf:
+                        score += title_w * _bm25_tf(title_tf, title_lens[doc], title_avg)
+                    if abstract_tf:
+                        score += abstract_w * _bm25_tf(abstract_tf, abstract_lens[doc], abstract_avg)
+                    if author_tf:
+                        score += author_w * _bm25_tf(author_tf, author_lens[doc], author_avg)
+                    base_scores[doc] = base_scores.get(doc, 0.0) + idf * score
+            for pid, paper in overlay_tfs:
+                score = sum(
+                    weight * _bm25_tf(tf, length, avg)
+                    for weight, tf, length, avg in zip(weights, paper.tfs[term], paper.lens, avg_lens)
+                    if tf
+                )
+                overlay_scores[pid] = overlay_scores.get(pid, 0.0) + idf * score
+
+        if author_terms:
+            author_docs: Optional[Set[int]] = None
+            author_pids: Optional[Set[ObjectId]] = None
+            for term in author_terms:
+                postings = segment.postings(term)
+                docs = {doc for doc, tf in zip(postings.docs, postings.tfs[2]) if tf} if postings else set()
+                pids = {pid for pid, paper in self._overlay.items() if paper.tfs.get(term, (0, 0, 0))[2]}
+                author_docs = docs if author_docs is None else author_docs & docs
+                author_pids = pids if author_pids is None else author_pids & pids
+            if terms:
+                base_scores = {doc: s for doc, s in base_scores.items() if doc in author_docs}
+                overlay_scores = {pid: s for pid, s in overlay_scores.items() if pid in author_pids}
+            else:
+                base_scores = dict.fromkeys(author_docs, 0.0)
+                overlay_scores = dict.fromkeys(author_pids, 0.0)
+
+        start_day, end_day = _day_bounds(start_date, end_date)
+        wanted_tags = set(tags) if tags else None
+        wanted_tag_ids = {self._tag_ids[t] for t in tags if t in self._tag_ids} if tags else None
+        status_id = self._status_ids.get(status, -1) if status else None
+
+        hits: List[SearchHit] = []
+        doc_dates, doc_status = segment.doc_dates, segment.doc_status
+        for doc, score in base_scores.items():
+            if doc in self._hidden:
+                continue
+            day = doc_dates[doc]
+            if start_day is not None and (day == NO_DATE or day < start_day):
+                continue
+            if end_day is not None and (day == NO_DATE or day > end_day):
+                continue
+            if status_id is not None:
+                override = self._status_overrides.get(doc)
+                if (override != status) if override is not None else (doc_status[doc] != status_id):
+                    continue
+            if wanted_tag_ids is not None and not any(t in wanted_tag_ids for t in segment.doc_tags(doc)):
+                continue
+            hits.append(SearchHit(segment.doc_id(doc), score, day))
+        for pid, score in overlay_scores.items():
+            paper = self._overlay[pid]
+            if start_day is not None and (paper.date == NO_DATE or paper.date < start_day):
+                continue
+            if end_day is not None and (paper.date == NO_DATE or paper.date > end_day):
+                continue
+            if status is not None and paper.status != status:
+                continue
+            if wanted_tags is not None and not paper.tags & wanted_tags:
+                continue
+            hits.append(SearchHit(pid, score, paper.date))
+
+        hits.sort(key=lambda hit: (-hit.score, -hit.date))
+        return hits[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        segment = self.segment
+        return {
+            "ready": segment is not None,
+            "path": self.path,
+            "segment_docs": segment.doc_count if segment else 0,
+            "segment_terms": segment.term_count if segment else 0,
+            "segment_age_seconds": round(time.time() - segment.built_at, 1) if segment else None,
+            "overlay_docs": len(self._overlay),
+            "hidden_docs": len(self._hidden),
+            "last_build": self.last_build,
+        }
+
+
+local_search_index = LocalSearchIndex()
@@ -0,0 +1,308 @@
+"""
+On-disk segment of the local full-text search index.
+
+A segment is one file holding an inverted index over the title, abstract and authors of a
+snapshot of the papers collection. It is laid out as flat typed arrays so it can be
+memory-mapped and read in place: every worker maps the same file and the OS shares its pages,
+so N workers cost one copy of the index rather than N.
+
+Layout: the magic, a 4-byte header length, a JSON header giving the offset, byte length and
+typecode of every array, then the arrays themselves (8-byte aligned, native byte order):
+
+    doc_ids            12-byte ObjectIds, ascending (binary searchable)
+    doc_dates          int32 days since 1970-01-01, NO_DATE when missing
+    doc_status         uint8 index into header["statuses"]
+    doc_<field>_len    uint16 token count of each field (capped at MAX_COUNT)
+    doc_tag_starts     uint32[N + 1] ranges into tag_ids
+    tag_ids            uint32 index into header["tags"]
+    term_offsets       uint32[T + 1] ranges into term_bytes; terms ascending by UTF-8 bytes
+    term_bytes
+    term_starts        uint32[T + 1] ranges into the posting columns
+    post_docs          uint32 doc index
+    post_<field>_tf    uint16 term frequency in each field (capped at MAX_COUNT)
+"""
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId  # type: ignore
+
+MAGIC = b"P2CSEG01"
+FIELDS = ("title", "abstract", "authors")
+MAX_COUNT = 65535
+NO_DATE = -(2 ** 31)
+
+_EPOCH = datetime(1970, 1, 1)
+_TOKEN_RE = re.compile(r"[^\W_]+")
+# Function words that match most papers and carry no signal for ranking
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the their this to "
+    "was we were which with our".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased alphanumeric tokens of ``text`` without stopwords"""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def field_tokens(paper: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+    """Tokens of the indexed fields of a paper document, in FIELDS order"""
+    authors = paper.get("authors") or []
+    if isinstance(authors, str):
+        authors = [authors]
+    return tokenize(paper.get("title")), tokenize(paper.get("abstract")), tokenize(" ".join(a for a in authors if a))
+
+
+def date_days(value: Any) -> int:
+    """Days since the epoch of a publication date, NO_DATE if it has none"""
+    if not isinstance(value, datetime):
+        return NO_DATE
+    return (value.replace(tzinfo=None) - _EPOCH).days
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class SegmentWriter:
+    """Accumulates papers (in ascending ``_id`` order) and writes them out as a segment file"""
+    def __init__(self):
+        self.doc_ids = bytearray()
+        self.doc_dates = array("i")
+        self.doc_status = array("B")
+        self.doc_lens = {field: array("H") for field in FIELDS}
+        self.doc_tag_starts = array("I", [0])
+        self.tag_ids = array("I")
+        self.statuses: Dict[str, int] = {}
+        self.tags: Dict[str, int] = {}
+        # term -> (doc indexes, then one tf column per field)
+        self.postings: Dict[str, Tuple[array, array, array, array]] = {}
+        self.length_totals = [0] * len(FIELDS)
+        self._last_id: Optional[ObjectId] = None
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.doc_dates)
+
+    def add(self, paper: Dict[str, Any]) -> None:
+        paper_id = paper["_id"]
+        if self._last_id is not None and paper_id <= self._last_id:
+            raise ValueError("Papers must be added in ascending _id order")
+        self._last_id = paper_id
+        doc = self.doc_count
+
+        self.doc_ids += paper_id.binary
+        self.doc_dates.append(date_days(paper.get("publicationDate")))
+        status = paper.get("status") or ""
+        if status not in self.statuses:
+            if len(self.statuses) > 255:
+                raise ValueError("Too many distinct statuses for a segment")
+            self.statuses[status] = len(self.statuses)
+        self.doc_status.append(self.statuses[status])
+        for tag in paper.get("tasks") or []:
+            self.tag_ids.append(self.tags.setdefault(tag, len(self.tags)))
+        self.doc_tag_starts.append(len(self.tag_ids))
+
+        counters = [Counter(tokens) for tokens in field_tokens(paper)]
+        for i, (field, tokens) in enumerate(zip(FIELDS, counters)):
+            length = min(sum(tokens.values()), MAX_COUNT)
+            self.doc_lens[field].append(length)
+            self.length_totals[i] += length
+        for term in set().union(*counters):
+            columns = self.postings.get(term)
+            if columns is None:
+                columns = self.postings[term] = (array("I"), array("H"), array("H"), array("H"))
+            columns[0].append(doc)
+            for column, counter in zip(columns[1:], counters):
+                column.append(min(counter.get(term, 0), MAX_COUNT))
+
+    def add_many(self, papers: Iterable[Dict[str, Any]]) -> None:
+        for paper in papers:
+            self.add(paper)
+
+    def write(self, path: str, extra_header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write the segment to ``path`` atomically (readers never see a partial file). Returns the header."""
+        terms = sorted(self.postings, key=lambda t: t.encode("utf-8"))
+        term_offsets = array("I", [0])
+        term_bytes = bytearray()
+        term_starts = array("I", [0])
+        post_columns = (array("I"), array("H"), array("H"), array("H"))
+        for term in terms:
+            term_bytes += term.encode("utf-8")
+            term_offsets.append(len(term_bytes))
+            for target, source in zip(post_columns, self.postings[term]):
+                target.extend(source)
+            term_starts.append(len(post_columns[0]))
+
+        doc_count = self.doc_count
+        arrays: List[Tuple[str, str, bytes]] = [
+            ("doc_ids", "B", bytes(self.doc_ids)),
+            ("doc_dates", "i", self.doc_dates.tobytes()),
+            ("doc_status", "B", self.doc_status.tobytes()),
+            *[(f"doc_{field}_len", "H", self.doc_lens[field].tobytes()) for field in FIELDS],
+            ("doc_tag_starts", "I", self.doc_tag_starts.tobytes()),
+            ("tag_ids", "I", self.tag_ids.tobytes()),
+            ("term_offsets", "I", term_offsets.tobytes()),
+            ("term_bytes", "B", bytes(term_bytes)),
+            ("term_starts", "I", term_starts.tobytes()),
+            ("post_docs", "I", post_columns[0].tobytes()),
+            *[(f"post_{field}_tf", "H", column.tobytes()) for field, column in zip(FIELDS, post_columns[1:])],
+        ]
+        layout: Dict[str, List[Any]] = {}
+        offset = 0
+        for name, typecode, data in arrays:
+            layout[name] = [offset, len(data), typecode]
+            offset = _align(offset + len(data))
+
+        header = {
+            "byteorder": sys.byteorder,
+            "doc_count": doc_count,
+            "term_count": len(terms),
+            "avg_len": {
+                field: (total / doc_count if doc_count else 0.0) for field, total in zip(FIELDS, self.length_totals)
+            },
+            "statuses": sorted(self.statuses, key=self.statuses.__getitem__),
+            "tags": sorted(self.tags, key=self.tags.__getitem__),
+            "built_at": time.time(),
+            "arrays": layout,
+            **(extra_header or {}),
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _align(len(MAGIC) + 4 + len(header_bytes))
+
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for name, _, data in arrays:
+                f.seek(data_start + layout[name][0])
+                f.write(data)
+            # An empty trailing array would not extend the file on its own
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+        return header
+
+
+class Postings:
+    """Zero-copy views of one term's postings"""
+    __slots__ = ("docs", "tfs")
+
+    def __init__(self, docs: memoryview, tfs: Tuple[memoryview, ...]):
+        self.docs = docs
+        self.tfs = tfs
+
+
+class Segment:
+    """A memory-mapped segment file, read in place"""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._views: List[memoryview] = []
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a search segment")
+            header_len = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 4], "little")
+            header_start = len(MAGIC) + 4
+            self.header: Dict[str, Any] = json.loads(self._mmap[header_start:header_start + header_len])
+            if self.header.get("byteorder") != sys.byteorder:
+                raise ValueError(f"{path} was written on a machine with a different byte order")
+            data_start = _align(header_start + header_len)
+            whole = memoryview(self._mmap)
+            self._views.append(whole)
+            arrays: Dict[str, memoryview] = {}
+            for name, (offset, length, typecode) in self.header["arrays"].items():
+                view = whole[data_start + offset:data_start + offset + length].cast(typecode)
+                self._views.append(view)
+                arrays[name] = view
+        except Exception:
+            self.close()
+            raise
+
+        self.doc_count: int = self.header["doc_count"]
+        self.term_count: int = self.header["term_count"]
+        self.avg_len: Dict[str, float] = self.header["avg_len"]
+        self.statuses: List[str] = self.header["statuses"]
+        self.tags: List[str] = self.header["tags"]
+        self.built_at: float = self.header["built_at"]
+        self.doc_ids = arrays["doc_ids"]
+        self.doc_dates = arrays["doc_dates"]
+        self.doc_status = arrays["doc_status"]
+        self.doc_lens = tuple(arrays[f"doc_{field}_len"] for field in FIELDS)
+        self.doc_tag_starts = arrays["doc_tag_starts"]
+        self.tag_ids = arrays["tag_ids"]
+        self._term_offsets = arrays["term_offsets"]
+        self._term_bytes = arrays["term_bytes"]
+        self._term_starts = arrays["term_starts"]
+        self._post_docs = arrays["post_docs"]
+        self._post_tfs = tuple(arrays[f"post_{field}_tf"] for field in FIELDS)
+
+    def close(self) -> None:
+        # Exported views must be released before the map can be closed. Postings handed out by
+        # postings() keep the buffer exported while a caller holds them; the map is then closed
+        # by garbage collection once they are gone.
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def _term(self, i: int) -> bytes:
+        return self._term_bytes[self._term_offsets[i]:self._term_offsets[i + 1]].tobytes()
+
+    def postings(self, term: str) -> Optional[Postings]:
+        """The postings of ``term``, found by binary search over the sorted term table"""
+        needle = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.term_count or self._term(lo) != needle:
+            return None
+        start, end = self._term_starts[lo], self._term_starts[lo + 1]
+        return Postings(self._post_docs[start:end], tuple(column[start:end] for column in self._post_tfs))
+
+    def doc_id(self, doc: int) -> ObjectId:
+        return ObjectId(self.doc_ids[doc * 12:doc * 12 + 12].tobytes())
+
+    def doc_index(self, paper_id: ObjectId) -> Optional[int]:
+        """Index of a paper in the segment, by binary search over the sorted ids"""
+        needle = paper_id.binary
+        lo, hi = 0, self.doc_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.doc_ids[mid * 12:mid * 12 + 12].tobytes() < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.doc_count and self.doc_ids[lo * 12:lo * 12 + 12].tobytes() == needle:
+            return lo
+        return None
+
+    def doc_tags(self, doc: int) -> memoryview:
+        return self.tag_ids[self.doc_tag_starts[doc]:self.doc_tag_starts[doc + 1]]
+
+    @property
+    def last_id(self) -> Optional[ObjectId]:
+        return self.doc_id(self.doc_count - 1) if self.doc_count else None
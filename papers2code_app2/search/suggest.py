@@ -0,0 +1,220 @@
+"""
+Title and author typeahead.
+
+``SuggestIndex`` keeps every paper title and author name in sorted arrays of normalized keys,
+so the completions of a prefix are one contiguous range found by binary search. Completions are
+ranked by popularity: a title by its paper's upvotes, an author by the upvotes of all their
+papers. The best completions of every prefix matching more than SCAN_LIMIT keys are precomputed;
+any other prefix scans its (small) range, so a lookup costs at most SCAN_LIMIT comparisons
+whatever is typed. Lookups never touch MongoDB.
+
+The index is rebuilt from the papers collection every SUGGEST_REBUILD_INTERVAL seconds, and soon
+after the metadata cache is invalidated in any worker (papers were added or removed).
+"""
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..cache import paper_cache
+from ..database import get_papers_collection_async
+from ..shared import config_settings
+from ..utils.authors import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prefix(text: Optional[str]) -> str:
+    """Normalized form of a title, name or typed prefix; author names normalize to their ``authorKeys`` key"""
+    return normalize_text(text)
+
+
+def _prefix_end(prefix: str) -> str:
+    """The smallest string greater than every string starting with ``prefix``"""
+    return prefix + "\U0010ffff"
+
+
+class _PrefixTable:
+    """Sorted normalized keys, each pointing at a weighted entry"""
+    __slots__ = ("keys", "entry_ids", "weights", "top")
+
+    def __init__(self, rows: List[Tuple[str, int, float]], top_k: int, scan_limit: int):
+        rows.sort()
+        self.keys = [key for key, _, _ in rows]
+        self.entry_ids = [entry_id for _, entry_id, _ in rows]
+        self.weights = [weight for _, _, weight in rows]
+        # prefix -> best entry ids, for every prefix whose range is too large to scan per keystroke.
+        # Large ranges are split by their next character, so only large sub-ranges are visited
+        self.top: Dict[str, List[int]] = {}
+        stack = [(0, len(self.keys), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            i = lo
+            while i < hi:
+                key = self.keys[i]
+                if len(key) <= depth:  # Equal to the prefix itself, already counted by it
+                    i += 1
+                    continue
+                prefix = key[:depth + 1]
+                j = bisect_left(self.keys, _prefix_end(prefix), i, hi)
+                if j - i > scan_limit:
+                    self.top[prefix] = self._best(i, j, top_k)
+                    stack.append((i, j, depth + 1))
+                i = j
+
+    def _best(self, lo: int, hi: int, limit: int) -> List[int]:
+        # One entry can be reachable through several keys (an author's full name and surname)
+        best = heapq.nlargest(2 * limit, range(lo, hi), key=lambda i: (self.weights[i], -self.entry_ids[i]))
+        return list(dict.fromkeys(self.entry_ids[i] for i in best))[:limit]
+
+    def lookup(self, prefix: str, limit: int) -> List[int]:
+        top = self.top.get(prefix)
+        if top is not None:
+            return top[:limit]
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, _prefix_end(prefix), lo)
+        return self._best(lo, hi, limit)
+
+
+class SuggestIndex:
+    SCAN_LIMIT = 256
+    MAX_LIMIT = 10
+    SNAPSHOT_PROJECTION = {"title": 1, "authors": 1, "upvoteCount": 1}
+    REFRESH_DEBOUNCE = 5.0  # seconds; invalidations in a burst trigger one rebuild
+
+    def __init__(self):
+        self._titles: Optional[_PrefixTable] = None
+        self._title_entries: List[Tuple[str, str, int]] = []  # (paper id, title, upvotes)
+        self._authors: Optional[_PrefixTable] = None
+        self._author_entries: List[Tuple[str, str, int]] = []  # (name, author key, paper count)
+        self._task: Optional["asyncio.Task[Any]"] = None
+        self._refresh = asyncio.Event()
+        self._started = False
+        self.built_at: Optional[float] = None
+        self.last_build: Dict[str, Any] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._titles is not None
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self) -> None:
+        """Build the index in the background and keep it fresh (called on application startup)."""
+        if self._started:
+            return
+        self._started = True
+        paper_cache.add_metadata_listener(self._on_metadata_invalidated)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def _on_metadata_invalidated(self, metadata_type: Optional[str]) -> None:  # noqa: ARG002 - any type means the catalogue changed
+        self._refresh.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.build()
+            except Exception as e:
+                logger.error(f"Typeahead index build failed: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._refresh.wait(), timeout=config_settings.SUGGEST_REBUILD_INTERVAL)
+                await asyncio.sleep(self.REFRESH_DEBOUNCE)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh.clear()
+
+    async def build(self) -> Dict[str, Any]:
+        """Rebuild both tables from the papers collection; lookups keep using the old ones until done."""
+        started = time.monotonic()
+        papers_collection = await get_papers_collection_async()
+        papers = await papers_collection.find({}, self.SNAPSHOT_PROJECTION).to_list(length=None)
+        # Sorting and the prefix tables are pure CPU work, so keep them off the event loop
+        self.load(await asyncio.to_thread(self._prepare, papers))
+        self.last_build = {
+            "titles": len(self._title_entries),
+            "authors": len(self._author_entries),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Built typeahead index: {self.last_build}")
+        return self.last_build
+
+    def _prepare(self, papers: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+        title_entries: List[Tuple[str, str, int]] = []
+        title_rows: List[Tuple[str, int, float]] = []
+        author_stats: Dict[str, List[Any]] = {}  # normalized name -> [display name, papers, upvotes]
+        for paper in papers:
+            upvotes = paper.get("upvoteCount") or 0
+            title = (paper.get("title") or "").strip()
+            key = normalize_prefix(title)
+            if key:
+                title_rows.append((key, len(title_entries), upvotes))
+                title_entries.append((str(paper["_id"]), title, upvotes))
+            authors = paper.get("authors") or []
+            if isinstance(authors, str):
+                authors = [authors]
+            for name in authors:
+                name_key = normalize_prefix(name)
+                if not name_key:
+                    continue
+                stats = author_stats.setdefault(name_key, [name.strip(), 0, 0])
+                stats[1] += 1
+                stats[2] += upvotes
+
+        author_entries: List[Tuple[str, str, int]] = []
+        author_rows: List[Tuple[str, int, float]] = []
+        for name_key, (name, paper_count, upvotes) in author_stats.items():
+            entry_id = len(author_entries)
+            author_entries.append((name, name_key, paper_count))
+            # Upvotes rank authors; the paper count breaks ties between unvoted authors
+            weight = upvotes + paper_count / (paper_count + 1)
+            author_rows.append((name_key, entry_id, weight))
+            # Typing a surname finds the author too
+            surname = name_key.rsplit(" ", 1)[-1]
+            if surname != name_key:
+                author_rows.append((surname, entry_id, weight))
+
+        return (
+            title_entries,
+            _PrefixTable(title_rows, self.MAX_LIMIT, self.SCAN_LIMIT),
+            author_entries,
+            _PrefixTable(author_rows, self.MAX_LIMIT, self.SCAN_LIMIT),
+        )
+
+    def load(self, prepared: Tuple[Any, ...]) -> None:
+        self._title_entries, self._titles, self._author_entries, self._authors = prepared
+        self.built_at = time.time()
+
+    def load_papers(self, papers: List[Dict[str, Any]]) -> None:
+        """Build synchronously from paper documents (tests and benchmarks)"""
+        self.load(self._prepare(papers))
+
+    # ==================== LOOKUP ====================
+
+    def suggest(self, query: str, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Best title and author completions of ``query``, most popular first"""
+        prefix = normalize_prefix(query)
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        if not prefix or self._titles is None or self._authors is None:
+            return {"titles": [], "authors": []}
+        titles = [self._title_entries[i] for i in self._titles.lookup(prefix, limit)]
+        authors = [self._author_entries[i] for i in self._authors.lookup(prefix, limit)]
+        return {
+            "titles": [{"id": paper_id, "title": title, "upvote_count": upvotes} for paper_id, title, upvotes in titles],
+            "authors": [
+                {"name": name, "key": key, "paper_count": paper_count} for name, key, paper_count in authors
+            ],
+        }
+
+
+suggest_index = SuggestIndex()
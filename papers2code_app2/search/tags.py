@@ -0,0 +1,55 @@
+"""
+Substring search over the tag list.
+
+``TagIndex`` numbers the tags in ranking order (most papers first) and keeps, for every 1-, 2-
+and 3-character substring of a case-folded tag, the sorted ids of the tags containing it. A
+query of up to three characters is answered by one posting list; a longer one scans only the
+posting list of its rarest trigram, verifying each candidate, and stops at ``limit`` matches.
+Because ids are in ranking order, the first matches found are the best ones.
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+GRAM = 3
+
+
+def _grams(key: str) -> set:
+    return {key[i:i + n] for n in range(1, GRAM + 1) for i in range(len(key) - n + 1)}
+
+
+class TagIndex:
+    def __init__(self, tags: Iterable[str], counts: Optional[Dict[str, int]] = None):
+        counts = counts or {}
+        self.tags: List[str] = sorted(set(tags), key=lambda tag: (-counts.get(tag, 0), tag.casefold(), tag))
+        self._keys = [tag.casefold() for tag in self.tags]
+        postings: Dict[str, List[int]] = {}
+        for tag_id, key in enumerate(self._keys):
+            for gram in _grams(key):
+                postings.setdefault(gram, []).append(tag_id)
+        self._postings = {gram: array("I", ids) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def search(self, query: Optional[str], limit: int) -> List[str]:
+        """Tags containing ``query`` (case-insensitive), most papers first, at most ``limit``"""
+        key = (query or "").strip().casefold()
+        if not key:
+            return self.tags[:limit]
+        if len(key) <= GRAM:
+            return [self.tags[tag_id] for tag_id in self._postings.get(key, ())[:limit]]
+
+        candidates = None
+        for i in range(len(key) - GRAM + 1):
+            posting = self._postings.get(key[i:i + GRAM])
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        matches: List[str] = []
+        for tag_id in candidates:
+            if key in self._keys[tag_id]:
+                matches.append(self.tags[tag_id])
+                if len(matches) >= limit:
+                    break
+        return matches
@@ -0,0 +1,95 @@
+"""
+Maintenance of the ``authors`` collection and the ``authorKeys`` field on papers.
+
+Each ``authors`` document is keyed by the normalized author name (``utils.authors.author_key``)
+and holds the display name and the number of papers, so the author list is a prefix range
+scan on ``_id`` instead of an $unwind/$group over every paper. Papers carry the same keys in
+the multikey ``authorKeys`` field, which backs the exact "papers by this author" filter.
+
+The ingestion scripts add the counts of the papers they insert (``author_count_ops``),
+``remove_paper_authors`` runs when a paper is deleted, and ``rebuild_author_index``
+recomputes everything from the papers collection.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, UpdateOne  # type: ignore
+
+from ..database import get_authors_collection_async, get_papers_collection_async
+from ..utils.authors import author_count_ops, author_keys, count_authors, prefix_range
+
+logger = logging.getLogger(__name__)
+
+AUTHOR_KEYS_FIELD = "authorKeys"
+
+
+async def remove_paper_authors(authors: Any) -> None:
+    """Take a deleted paper out of its authors' counts, dropping authors left with no papers."""
+    counts = count_authors([authors])
+    if not counts:
+        return
+    authors_collection = await get_authors_collection_async()
+    await authors_collection.bulk_write(author_count_ops(counts, sign=-1), ordered=False)
+    await authors_collection.delete_many({"_id": {"$in": list(counts)}, "paperCount": {"$lte": 0}})
+
+
+async def list_authors(prefix: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Authors whose key starts with ``prefix`` (already normalized), in key order, after the key ``after``."""
+    key_range: Dict[str, Any] = prefix_range(prefix) if prefix else {}
+    if after is not None:
+        key_range["$gt"] = after
+        if "$gte" in key_range and key_range["$gte"] <= after:
+            del key_range["$gte"]
+    query = {"_id": key_range} if key_range else {}
+    authors_collection = await get_authors_collection_async()
+    cursor = authors_collection.find(query).sort("_id", ASCENDING).limit(limit)
+    return [
+        {"key": doc["_id"], "name": doc.get("name") or doc["_id"], "paper_count": doc.get("paperCount", 0)}
+        for doc in await cursor.to_list(length=limit)
+    ]
+
+
+async def rebuild_author_index(batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Recompute ``authorKeys`` on every paper and the whole ``authors`` collection from the
+    papers' author lists. Returns the number of papers updated and authors written/removed.
+    """
+    papers_collection = await get_papers_collection_async()
+    authors_collection = await get_authors_collection_async()
+
+    author_lists: List[Any] = []
+    papers_updated = 0
+    operations: List[UpdateOne] = []
+    async for paper in papers_collection.find({}, {"authors": 1, AUTHOR_KEYS_FIELD: 1}):
+        authors = paper.get("authors") or []
+        author_lists.append(authors)
+        keys = author_keys(authors)
+        if paper.get(AUTHOR_KEYS_FIELD) != keys:
+            operations.append(UpdateOne({"_id": paper["_id"]}, {"$set": {AUTHOR_KEYS_FIELD: keys}}))
+        if len(operations) >= batch_size:
+            papers_updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        papers_updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+
+    counts = count_authors(author_lists)
+    written = 0
+    operations = [
+        UpdateOne({"_id": key}, {"$set": {"name": name, "paperCount": count}}, upsert=True)
+        for key, (name, count) in counts.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        result = await authors_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+        written += result.upserted_count + result.modified_count
+
+    # Authors whose papers are all gone
+    removed = 0
+    stale: List[str] = []
+    async for doc in authors_collection.find({}, {"_id": 1}):
+        if doc["_id"] not in counts:
+            stale.append(doc["_id"])
+    for start in range(0, len(stale), batch_size):
+        removed += (await authors_collection.delete_many({"_id": {"$in": stale[start:start + batch_size]}})).deleted_count
+
+    logger.info(f"Rebuilt author index: {papers_updated} papers updated, {written} authors written, {removed} removed")
+    return {"papers_updated": papers_updated, "authors_written": written, "authors_removed": removed}
@@ -0,0 +1,209 @@
+"""
+Adaptive warming of the paper search cache.
+
+``QueryLogRecorder`` counts how often each normalized parameter set is requested from
+``PaperViewService.get_papers_list``. ``CacheWarmer`` pre-populates the most popular ones
+(plus the first pages of the default sorts) at startup and shortly after a search cache
+generation rolls, within a query, concurrency and time budget so warming cannot overload
+MongoDB. The popular parameter sets are persisted in the cache so a fresh deploy knows
+what to warm before it has seen any traffic.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from ..cache import paper_cache
+from ..shared import config_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _query_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class QueryLogRecorder:
+    """Bounded frequency count of normalized search parameter sets."""
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._counts: Dict[str, float] = {}
+        self._params: Dict[str, Dict[str, Any]] = {}
+        self._last_decay = time.monotonic()
+
+    def record(self, params: Dict[str, Any]) -> None:
+        # Per-user and cursor-positioned result sets are not worth warming
+        if params.get("contributor_id") or params.get("cursor"):
+            return
+        key = _query_key(params)
+        if key not in self._counts:
+            if len(self._counts) >= self.max_entries:
+                least_used = min(self._counts, key=self._counts.__getitem__)
+                del self._counts[least_used]
+                del self._params[least_used]
+            self._counts[key] = 0
+            self._params[key] = dict(params)
+        self._counts[key] += 1
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        keys = sorted(self._counts, key=self._counts.__getitem__, reverse=True)[:n]
+        return [dict(self._params[key]) for key in keys]
+
+    def decay(self, factor: float = 0.5) -> None:
+        """Scale every count (halve by default) so popularity tracks recent traffic; forget sets that fade out."""
+        for key in list(self._counts):
+            self._counts[key] *= factor
+            if self._counts[key] < 0.5:
+                del self._counts[key]
+                del self._params[key]
+
+    def decay_if_due(self, now: Optional[float] = None) -> bool:
+        """
+        Halve the counts once per CACHE_WARM_DECAY_INTERVAL elapsed since the last decay, so
+        popularity fades with wall-clock time rather than with how often warming runs.
+        """
+        now = time.monotonic() if now is None else now
+        periods = int((now - self._last_decay) // config_settings.CACHE_WARM_DECAY_INTERVAL)
+        if periods < 1:
+            return False
+        self.decay(0.5 ** periods)
+        self._last_decay += periods * config_settings.CACHE_WARM_DECAY_INTERVAL
+        return True
+
+
+def _default_params(sort_by: str, page: int, limit: int = 20) -> Dict[str, Any]:
+    """The normalized cache parameters of an unfiltered list page, as get_papers_list builds them"""
+    return {
+        "skip": (page - 1) * limit,
+        "limit": limit,
+        "sort_by": sort_by,
+        "sort_order": "desc",
+        "search_query": None,
+        "author": None,
+        "start_date": None,
+        "end_date": None,
+        "main_status": None,
+        "impl_status": None,
+        "tags": None,
+        "has_official_impl": None,
+        "has_code": None,
+        "contributor_id": None,
+        "venue": None,
+        "author_key": None,
+        "cursor": None,
+        "facets": None,
+    }
+
+
+class CacheWarmer:
+    # Pages 1-3 of the default sorts are what almost every visitor lands on
+    DEFAULT_QUERIES = [_default_params(sort_by, page) for sort_by in ("newest", "upvotes") for page in (1, 2, 3)]
+
+    def __init__(self, recorder: QueryLogRecorder):
+        self.recorder = recorder
+        self._task: Optional["asyncio.Task[Any]"] = None
+        self._pending_dimensions: Set[str] = set()
+        self._started = False
+        self.runs = 0
+        self.last_run: Dict[str, Any] = {}
+
+    def start(self) -> None:
+        """Warm once in the background and re-warm after generation rolls (called on application startup)."""
+        if self._started or not config_settings.CACHE_WARM_ENABLED:
+            return
+        self._started = True
+        paper_cache.add_generation_listener(self._on_generation_roll)
+        self._schedule("global", delay=0)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def _on_generation_roll(self, dimension: str) -> None:
+        self._schedule(dimension, delay=config_settings.CACHE_WARM_DEBOUNCE)
+
+    def _schedule(self, dimension: str, delay: float) -> None:
+        # Rolls arriving while a warm is pending or running are picked up by the running task
+        self._pending_dimensions.add(dimension)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_after(delay))
+
+    async def _run_after(self, delay: float) -> None:
+        # Rolls that land during a pass invalidated pages it may already have warmed, so they get
+        # another pass after the debounce
+        while self._pending_dimensions:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            dimensions, self._pending_dimensions = self._pending_dimensions, set()
+            try:
+                await self.warm(None if "global" in dimensions else dimensions)
+            except Exception as e:
+                logger.error(f"Cache warming failed: {e}", exc_info=True)
+            delay = config_settings.CACHE_WARM_DEBOUNCE
+
+    async def _candidates(self, dimensions: Optional[Set[str]]) -> List[Dict[str, Any]]:
+        persisted = await paper_cache.get_warm_queries()
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for params in [*self.DEFAULT_QUERIES, *self.recorder.top(config_settings.CACHE_WARM_TOP_N), *persisted]:
+            if dimensions is not None and not dimensions & set(paper_cache.generation_dimensions(params)):
+                continue
+            candidates.setdefault(_query_key(params), params)
+        return list(candidates.values())[:config_settings.CACHE_WARM_TOP_N]
+
+    async def warm(self, dimensions: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Run the popular searches through get_papers_list so their pages land in the cache.
+        ``dimensions`` limits warming to pages depending on those generation dimensions.
+        """
+        from .paper_view_service import PaperViewService
+
+        service = PaperViewService()
+        candidates = await self._candidates(dimensions)
+        deadline = time.monotonic() + config_settings.CACHE_WARM_TIME_BUDGET
+        semaphore = asyncio.Semaphore(max(config_settings.CACHE_WARM_CONCURRENCY, 1))
+        warmed = 0
+        failed = 0
+
+        async def _warm_one(params: Dict[str, Any]) -> None:
+            nonlocal warmed, failed
+            async with semaphore:
+                # Queries not started within the time budget are skipped
+                if time.monotonic() >= deadline:
+                    return
+                try:
+                    await service.get_papers_list(**params, record_usage=False)
+                    warmed += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Cache warming query failed ({params}): {e}")
+
+        started = time.monotonic()
+        await asyncio.gather(*[_warm_one(params) for params in candidates])
+
+        # Persist what is popular now for the next deploy, then let old popularity fade
+        popular = self.recorder.top(config_settings.CACHE_WARM_TOP_N)
+        if popular:
+            await paper_cache.set_warm_queries(popular)
+        self.recorder.decay_if_due()
+
+        self.runs += 1
+        self.last_run = {
+            "dimensions": sorted(dimensions) if dimensions else ["global"],
+            "candidates": len(candidates),
+            "warmed": warmed,
+            "failed": failed,
+            "skipped": len(candidates) - warmed - failed,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Cache warming finished: {self.last_run}")
+        return self.last_run
+
+
+query_recorder = QueryLogRecorder()
+cache_warmer = CacheWarmer(query_recorder)
@@ -13,6 +13,7 @@ from ..database import (
 )
 from ..schemas.papers import PaperResponse
 from ..utils import transform_papers_batch
+from ..utils.serialization import construct_papers
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,7 @@ class DashboardService:
 
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(papers_list, None, detail_level="summary")
-            response = [PaperResponse(**paper) for paper in transformed_papers]
+            response = construct_papers(transformed_papers)
                 
             logger.info("Successfully retrieved and sorted trending papers based on upvotes.")
             return response
@@ -137,7 +138,7 @@ class DashboardService:
             
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(papers_list, user_id, detail_level="summary")
-            response = [PaperResponse(**paper) for paper in transformed_papers]
+            response = construct_papers(transformed_papers)
             
             logger.info(f"Successfully retrieved {len(response)} user contributions.")
             return response
@@ -194,7 +195,7 @@ class DashboardService:
             
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(ordered_papers, user_id, detail_level="summary")
-            response = [PaperResponse(**paper) for paper in transformed_papers]
+            response = construct_papers(transformed_papers)
                 
             logger.info(f"Successfully retrieved {len(response)} recently viewed papers.")
             return response
@@ -244,7 +245,7 @@ class DashboardService:
             
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(ordered_papers, user_id, detail_level="summary")
-            response = [PaperResponse(**paper) for paper in transformed_papers]
+            response = construct_papers(transformed_papers)
                 
             logger.info(f"Successfully retrieved {len(response)} upvoted papers.")
             return response
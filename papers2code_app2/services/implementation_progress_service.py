@@ -30,6 +30,7 @@ from .paper_action_service import (
     ACTION_PROJECT_STARTED,
     ACTION_PROJECT_JOINED,
 )
+from .paper_contributions import add_contributor
 from ..schemas.db_models import PyObjectId
 from ..email_templates import get_author_outreach_email_template
 
@@ -151,6 +152,7 @@ class ImplementationProgressService:
                             "createdAt": current_time,
                             "details": {"progress_id": str(existing_progress_data["_id"])},
                         }, session=session)
+                        await add_contributor(paper_obj_id, user_obj_id, session=session)
                     except Exception as e_log:
                         logger.error(
                             f"Failed to log ACTION_PROJECT_JOINED for user {user_id}, paper {paper_id}, progress {existing_progress_data['_id']}: {e_log}"
@@ -159,6 +161,8 @@ class ImplementationProgressService:
                     if ctx.is_transactional:
                         logger.debug(f"Contributor join recorded atomically for paper {paper_id} by user {user_id}")
 
+                await paper_cache.invalidate_paper_detail(paper_id)
+
             # Re-fetch to get the potentially updated document
             updated_progress_data = await progress_collection.find_one(
                 {"_id": existing_progress_data["_id"]}
@@ -186,9 +190,10 @@ class ImplementationProgressService:
 
                     result = await progress_collection.insert_one(progress_to_insert, session=session)
 
-                    # Update the paper's status to 'Started'
+                    # Update the paper's status to 'Started' and record the starter as a contributor
                     await papers_collection.update_one(
-                        {"_id": paper_obj_id}, {"$set": {"status": "Started"}},
+                        {"_id": paper_obj_id},
+                        {"$set": {"status": "Started"}, "$addToSet": {"contributorIds": user_obj_id}},
                         session=session
                     )
 
@@ -211,6 +216,7 @@ class ImplementationProgressService:
                         logger.debug(f"Project started atomically for paper {paper_id} by user {user_id}")
 
                 # Update paper status in cache (outside transaction since it's external)
+                await paper_cache.invalidate_paper_detail(paper_id)
                 await paper_cache.update_paper_in_cache(paper_id, "Started")
 
                 created_progress_data = await progress_collection.find_one(
@@ -266,6 +272,7 @@ class ImplementationProgressService:
                                     },
                                 },
                             )
+                            await paper_cache.invalidate_paper_detail(paper_id)
                         # Return the updated progress
                         updated_progress_data = await progress_collection.find_one(
                             {"_id": existing_progress_data["_id"]}
@@ -342,6 +349,7 @@ class ImplementationProgressService:
                 logger.debug(f"Email sent status updated atomically for paper {paper_id}")
 
         # Update paper status in cache (outside transaction since it's external)
+        await paper_cache.invalidate_paper_detail(paper_id)
         await paper_cache.update_paper_in_cache(paper_id, "Waiting for Author Response")
 
         # In a real application, you would integrate with an email sending service here.
@@ -495,6 +503,7 @@ class ImplementationProgressService:
                 logger.debug(f"Progress updated atomically for paper {paper_id}")
 
         # Update paper status in cache (outside transaction since it's external)
+        await paper_cache.invalidate_paper_detail(paper_id)
         if paper_status_update:
             await paper_cache.update_paper_in_cache(paper_id, paper_status_update)
 
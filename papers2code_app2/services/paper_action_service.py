@@ -1,3 +1,4 @@
+from ..cache import paper_cache
 from ..database import (
     get_papers_collection_async,
     get_user_actions_collection_async,
@@ -8,6 +9,7 @@ from ..schemas.papers import PaperActionsSummaryResponse, PaperActionUserDetail
 from ..schemas.minimal import UserMinimal
 from ..shared import IMPL_STATUS_COMMUNITY_IMPLEMENTABLE, IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE
 from .exceptions import PaperNotFoundException, VoteProcessingException, InvalidActionException
+from .paper_contributions import add_contributor, sync_contributor
 
 # MongoDB specific imports
 from bson import ObjectId # type: ignore
@@ -83,7 +85,7 @@ class PaperActionService:
 
                     updated_paper = await papers_collection.find_one_and_update(
                         {"_id": paper_obj_id},
-                        {"$inc": {"upvoteCount": 1}},
+                        {"$inc": {"upvoteCount": 1}, "$addToSet": {"contributorIds": user_obj_id}},
                         return_document=ReturnDocument.AFTER,
                         session=session
                     )
@@ -120,6 +122,7 @@ class PaperActionService:
                             return_document=ReturnDocument.AFTER,
                             session=session
                         )
+                        await sync_contributor(paper_obj_id, user_obj_id, session=session)
                         if ctx.is_transactional:
                             self.logger.debug(f"Service: Upvote removed atomically for paper {paper_id} by user {user_id}")
                     else:
@@ -133,12 +136,15 @@ class PaperActionService:
             self.logger.error(f"Service: Invalid vote_type '{vote_type}' received.")
             raise InvalidActionException(f"Invalid vote_type: {vote_type}. Must be 'up' or 'none'.")
 
+        await paper_cache.invalidate_paper_detail(paper_id)
         if not updated_paper:
             final_check_paper = await papers_collection.find_one({"_id": paper_obj_id})
             if not final_check_paper:
                 raise PaperNotFoundException(f"Paper with ID {paper_id} disappeared during vote processing.")
             return final_check_paper
 
+        # Patch the new upvote count into cached list pages holding this paper
+        await paper_cache.patch_paper_in_cache(paper_id, paper_cache.changed_fields(paper_doc, updated_paper))
         return updated_paper
 
     async def record_paper_related_action(self, paper_id: str, user_id: str, action_type: str, details: Optional[Dict[str, Any]] = None):
@@ -175,6 +181,7 @@ class PaperActionService:
 
         try:
             await user_actions_collection.insert_one(action_document)
+            await add_contributor(paper_obj_id, user_obj_id)
             self.logger.info(f"Service: Action '{action_type}' recorded for paper {paper_id} by user {user_id}.")
         except Exception as e:
             self.logger.exception(f"Service: Error inserting action '{action_type}' for paper {paper_id}")
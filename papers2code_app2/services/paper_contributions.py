@@ -0,0 +1,104 @@
+"""
+Maintenance of the materialized ``contributorIds`` field on papers.
+
+A user contributes to a paper once they have any action on it in ``user_actions`` (votes,
+implementability votes, admin settings, starting or joining an implementation). Keeping the
+set of contributors on the paper itself turns the contributor filter of the paper list into
+an indexed multikey predicate instead of an unbounded ``_id: {$in: [...]}`` list.
+
+Writers call ``add_contributor`` after inserting an action and ``sync_contributor`` after
+deleting one; ``rebuild_contributor_ids`` recomputes the field from ``user_actions``.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId  # type: ignore
+from pymongo import UpdateOne  # type: ignore
+
+from ..database import get_papers_collection_async, get_user_actions_collection_async
+
+logger = logging.getLogger(__name__)
+
+CONTRIBUTOR_IDS_FIELD = "contributorIds"
+
+
+async def add_contributor(paper_id: ObjectId, user_id: ObjectId, session: Optional[Any] = None) -> None:
+    """Record ``user_id`` as a contributor of ``paper_id`` (idempotent)."""
+    papers_collection = await get_papers_collection_async()
+    await papers_collection.update_one(
+        {"_id": paper_id},
+        {"$addToSet": {CONTRIBUTOR_IDS_FIELD: user_id}},
+        session=session,
+    )
+
+
+async def sync_contributor(paper_id: ObjectId, user_id: ObjectId, session: Optional[Any] = None) -> None:
+    """After deleting actions, drop ``user_id`` from the paper's contributors unless another action remains."""
+    user_actions_collection = await get_user_actions_collection_async()
+    remaining = await user_actions_collection.count_documents(
+        {"userId": user_id, "paperId": {"$in": [paper_id, str(paper_id)]}}, limit=1, session=session
+    )
+    if remaining:
+        return
+    papers_collection = await get_papers_collection_async()
+    await papers_collection.update_one(
+        {"_id": paper_id},
+        {"$pull": {CONTRIBUTOR_IDS_FIELD: user_id}},
+        session=session,
+    )
+
+
+async def remove_contributor_everywhere(user_id: ObjectId, session: Optional[Any] = None) -> int:
+    """Drop a user from every paper's contributors (account deletion). Returns the papers modified."""
+    papers_collection = await get_papers_collection_async()
+    result = await papers_collection.update_many(
+        {CONTRIBUTOR_IDS_FIELD: user_id},
+        {"$pull": {CONTRIBUTOR_IDS_FIELD: user_id}},
+        session=session,
+    )
+    return result.modified_count
+
+
+async def rebuild_contributor_ids(batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Recompute ``contributorIds`` for every paper from ``user_actions``.
+    Safe to re-run; papers whose contributors all left lose the field.
+    """
+    papers_collection = await get_papers_collection_async()
+    user_actions_collection = await get_user_actions_collection_async()
+
+    pipeline = [
+        {"$match": {"paperId": {"$exists": True, "$ne": None}, "userId": {"$exists": True, "$ne": None}}},
+        {"$group": {"_id": "$paperId", "userIds": {"$addToSet": "$userId"}}},
+    ]
+    contributors: Dict[ObjectId, set] = {}
+    agg_cursor = await user_actions_collection.aggregate(pipeline, allowDiskUse=True)
+    async for group in agg_cursor:
+        paper_id = group["_id"]
+        if isinstance(paper_id, str):
+            # Some older actions stored the paper id as a string
+            if not ObjectId.is_valid(paper_id):
+                continue
+            paper_id = ObjectId(paper_id)
+        user_ids = [u if isinstance(u, ObjectId) else ObjectId(u) for u in group["userIds"] if ObjectId.is_valid(u)]
+        contributors.setdefault(paper_id, set()).update(user_ids)
+
+    updated = 0
+    operations: List[UpdateOne] = []
+    for paper_id, user_ids in contributors.items():
+        operations.append(UpdateOne({"_id": paper_id}, {"$set": {CONTRIBUTOR_IDS_FIELD: sorted(user_ids)}}))
+        if len(operations) >= batch_size:
+            updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+
+    # Papers that still carry contributors but no longer have any actions
+    cleared = 0
+    async for paper in papers_collection.find({CONTRIBUTOR_IDS_FIELD: {"$exists": True}}, {"_id": 1}):
+        if paper["_id"] not in contributors:
+            await papers_collection.update_one({"_id": paper["_id"]}, {"$unset": {CONTRIBUTOR_IDS_FIELD: ""}})
+            cleared += 1
+
+    logger.info(f"Rebuilt contributorIds: {len(contributors)} papers with contributors, {updated} modified, {cleared} cleared")
+    return {"papers_with_contributors": len(contributors), "modified": updated, "cleared": cleared}
@@ -1,12 +1,15 @@
 import logging
 from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
 
 # MongoDB specific imports
 from bson import ObjectId # type: ignore
 from bson.errors import InvalidId # type: ignore
-from pymongo import ReturnDocument # type: ignore
+from pymongo import ReturnDocument, UpdateOne # type: ignore
 from pymongo.errors import DuplicateKeyError # type: ignore
 
+from ..cache import paper_cache
+from ..search import local_search_index
 from ..database import (
     get_papers_collection_async, 
     get_user_actions_collection_async, 
@@ -23,6 +26,8 @@ from ..shared import (
     MAIN_STATUS_NOT_STARTED
 )
 from .exceptions import PaperNotFoundException, UserActionException, InvalidActionException, ServiceException
+from .paper_contributions import add_contributor, sync_contributor
+from .author_index import remove_paper_authors
 
 class PaperModerationService:
     def __init__(self):
@@ -101,6 +106,80 @@ class PaperModerationService:
         #self.logger.info(f"Service:_recalculate: No status changes for paper {paper_id_obj}.")
         return current_paper_doc
 
+    async def reconcile_vote_counters(self, repair: bool = True, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Verifies the isImplementableVotes/nonImplementableVotes counters of every paper against
+        the community votes in user_actions, and (with ``repair``) rewrites the drifted ones in
+        bulk, then recalculates those papers' community status and refreshes their cached copies.
+        Admin-locked papers are skipped: locking zeroes their counters on purpose.
+        Returns the number of papers checked, drifted and repaired, and statuses changed.
+        """
+        papers_collection = await get_papers_collection_async()
+        user_actions_collection = await get_user_actions_collection_async()
+        admin_override_statuses = [IMPL_STATUS_ADMIN_IMPLEMENTABLE, IMPL_STATUS_ADMIN_NOT_IMPLEMENTABLE]
+
+        pipeline = [
+            {"$match": {"actionType": {"$in": [IMPL_STATUS_COMMUNITY_IMPLEMENTABLE, IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE]}}},
+            {"$group": {
+                "_id": "$paperId",
+                "isImplementableVotes": {"$sum": {"$cond": [{"$eq": ["$actionType", IMPL_STATUS_COMMUNITY_IMPLEMENTABLE]}, 1, 0]}},
+                "nonImplementableVotes": {"$sum": {"$cond": [{"$eq": ["$actionType", IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE]}, 1, 0]}},
+            }},
+        ]
+        agg_cursor = await user_actions_collection.aggregate(pipeline)
+        expected: Dict[Any, Tuple[int, int]] = {
+            doc["_id"]: (doc["isImplementableVotes"], doc["nonImplementableVotes"])
+            async for doc in agg_cursor
+        }
+
+        checked = 0
+        drifted: List[Dict[str, Any]] = []
+        # Every patchable field, so changed_fields() only reports what the recalculation changed
+        projection = {field: 1 for field in paper_cache.PATCHABLE_FIELDS}
+        async for paper in papers_collection.find({}, projection):
+            checked += 1
+            if paper.get("implementabilityStatus") in admin_override_statuses:
+                continue
+            is_votes, non_votes = expected.get(paper["_id"], (0, 0))
+            if (paper.get("isImplementableVotes", 0), paper.get("nonImplementableVotes", 0)) != (is_votes, non_votes):
+                drifted.append({**paper, "isImplementableVotes": is_votes, "nonImplementableVotes": non_votes})
+
+        result = {"papers_checked": checked, "papers_drifted": len(drifted), "papers_repaired": 0, "statuses_changed": 0}
+        if not repair or not drifted:
+            self.logger.info(f"Service: Vote counter reconciliation: {result}")
+            return result
+
+        for start in range(0, len(drifted), batch_size):
+            batch = drifted[start:start + batch_size]
+            write_result = await papers_collection.bulk_write([
+                UpdateOne(
+                    {"_id": paper["_id"]},
+                    {"$set": {
+                        "isImplementableVotes": paper["isImplementableVotes"],
+                        "nonImplementableVotes": paper["nonImplementableVotes"],
+                    }},
+                )
+                for paper in batch
+            ], ordered=False)
+            result["papers_repaired"] += write_result.modified_count
+
+        # Drift is rare, so the status recalculation and cache refresh go paper by paper
+        for paper in drifted:
+            paper_id = str(paper["_id"])
+            updated_paper = await self._recalculate_and_update_community_status(paper)
+            changed = {
+                "isImplementableVotes": paper["isImplementableVotes"],
+                "nonImplementableVotes": paper["nonImplementableVotes"],
+                **paper_cache.changed_fields(paper, updated_paper),
+            }
+            if "status" in changed or "implementabilityStatus" in changed:
+                result["statuses_changed"] += 1
+            await paper_cache.invalidate_paper_detail(paper_id)
+            await paper_cache.patch_paper_in_cache(paper_id, changed)
+
+        self.logger.info(f"Service: Vote counter reconciliation: {result}")
+        return result
+
     async def flag_paper_implementability(self, paper_id: str, user_id: str, action: str):
         #self.logger.info(f"Service: Async flagging implementability for paper_id: {paper_id}, user_id: {user_id}, action: {action}")
         
@@ -203,6 +282,11 @@ class PaperModerationService:
                 )
             elif user_action_operation == 'delete':
                 await user_actions_collection.delete_one({"_id": current_action_doc["_id"]})
+
+            if user_action_operation == 'insert':
+                await add_contributor(paper_obj_id, user_obj_id)
+            elif user_action_operation == 'delete':
+                await sync_contributor(paper_obj_id, user_obj_id)
             
             # Update paper vote counts if there are any operations in $inc
             updated_paper_after_vote_counts = None
@@ -240,6 +324,8 @@ class PaperModerationService:
 
             # Recalculate and update community status based on the new vote counts
             final_updated_paper = await self._recalculate_and_update_community_status(paper_to_recalculate)
+            await paper_cache.invalidate_paper_detail(paper_id)
+            await paper_cache.patch_paper_in_cache(paper_id, paper_cache.changed_fields(paper, final_updated_paper))
             return final_updated_paper
 
         except DuplicateKeyError:
@@ -338,10 +424,18 @@ class PaperModerationService:
                 # "details": {"status_set_to": status_to_set_by_admin}, # Removed as actionType is now specific
                 "createdAt": datetime.now(timezone.utc)
             })
+            await add_contributor(paper_obj_id, admin_obj_id)
         except Exception as e:
             self.logger.error(f"Service: Failed to log admin action for set_implementability on paper {paper_id}: {e}", exc_info=True)
             # Non-critical, so we don't re-raise, but good to know.
 
+        await paper_cache.invalidate_paper_detail(paper_id)
+        await paper_cache.patch_paper_in_cache(paper_id, {
+            field: updated_paper.get(field)
+            for field in update_doc["$set"]
+            if field in paper_cache.PATCHABLE_FIELDS
+        })
+
         #self.logger.info(f"Service: Admin {admin_user_id} successfully set implementability of paper {paper_id} to {status_to_set_by_admin}. New main status: {updated_paper.get('status')}")
         return updated_paper
 
@@ -383,6 +477,14 @@ class PaperModerationService:
                 # For now, raise an error.
                 raise ServiceException(f"Paper {paper_id} could not be deleted after being archived.")
 
+            # The paper disappears from every result set, so no cached page can be patched in place
+            await paper_cache.invalidate_search_results()
+            await paper_cache.invalidate_paper_detail(paper_id)
+            local_search_index.remove_paper(paper_obj_id)
+            # Its title and authors leave the author index and the typeahead
+            await remove_paper_authors(paper_to_delete.get("authors"))
+            await paper_cache.invalidate_metadata_cache("authors")
+
             # Optionally, delete related user actions (or mark them as related to a deleted paper)
             # For now, let's leave user_actions as they might be useful for audit, but this is a design choice.
             # Example: await user_actions_collection.delete_many({"paperId": paper_obj_id})
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import re
 import time
 from typing import List, Dict, Any, Optional, Tuple
 from bson import ObjectId  # type: ignore
@@ -9,22 +9,72 @@ from pymongo import DESCENDING, ASCENDING  # type: ignore
 from datetime import datetime
 
 from ..database import (
+    get_authors_collection_async,
     get_papers_collection_async,
     get_implementation_progress_collection_async,
-    get_user_actions_collection_async,
 )
-from .exceptions import PaperNotFoundException, DatabaseOperationException, ServiceException
+from .exceptions import PaperNotFoundException, DatabaseOperationException, ServiceException, InvalidRequestException
 from ..cache import paper_cache
+from ..search import TagIndex, local_search_index, suggest_index
+from .cache_warmer import query_recorder
 from ..shared import config_settings
+from ..utils.pagination import parse_cursor, sort_spec
+from ..utils.venues import venue_display_name, venue_key
+from ..utils.authors import author_key as normalize_author_key
+from ..utils import fetch_user_vote_flags, transform_papers_batch
+from .author_index import list_authors
 
 
 logger = logging.getLogger(__name__)
 
+# Substring index over the cached tag list, ranked by the cached per-tag paper counts. Dropped
+# whenever either is invalidated (in any worker) and rebuilt by the next tag search
+_tag_index: Optional[TagIndex] = None
+_tag_index_version = 0
+
+
+def _invalidate_tag_index(metadata_type: Optional[str]) -> None:
+    global _tag_index, _tag_index_version
+    if metadata_type in (None, "tags", "filter_counts"):
+        _tag_index = None
+        _tag_index_version += 1
+
+
+paper_cache.add_metadata_listener(_invalidate_tag_index)
+
+
 class PaperViewService:
     """
     Service for handling paper viewing logic, including fetching papers,
     details, and user-specific views.
     """
+    MAX_COUNT = 10000  # Cap count for performance (UI shows "10,000+ results")
+    LOCAL_SEARCH_BATCH = 5000  # Local search hit ids sent per MongoDB query when filtering or sorting them
+    # Facets the list endpoint can return, mapped to the paper field they count
+    FACET_FIELDS = {"status": "status", "tags": "tasks", "venue": "venueKey"}
+    FACET_BUCKETS = 50  # Most frequent values returned per facet
+    # Fields the list view renders; everything else stays on the server
+    LIST_VIEW_PROJECTION = {
+        "_id": 1,
+        "title": 1,
+        "authors": 1,
+        "publicationDate": 1,
+        "upvoteCount": 1,
+        "status": 1,
+        "urlGithub": 1,
+        "urlAbs": 1,
+        "urlPdf": 1,
+        "hasCode": 1,
+        "abstract": 1,
+        "venue": 1,
+        "tasks": 1,
+        "implementabilityStatus": 1,
+        "isImplementableVotes": 1,
+        "nonImplementableVotes": 1,
+        "pwcUrl": 1,
+        "arxivId": 1
+    }
+
     def __init__(self):
         # Ensure logger is initialized if not done by a base class or decorator
         self.logger = logging.getLogger(__name__)
@@ -34,10 +84,56 @@ class PaperViewService:
 
     async def get_paper_by_id(self, paper_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:  # noqa: ARG002 - user_id reserved for future user-specific data
         """
-        Retrieves a single paper by its ID.
-        Includes user-specific actions if user_id is provided and implementation progress.
+        Retrieves a single paper by its ID, with its implementation progress attached.
+        Concurrent requests for the same paper share one database read.
+        """
+        return await paper_cache.coalesce(f"paper_detail:{paper_id}", lambda: self._load_paper_by_id(paper_id))
+
+    async def get_paper_detail(self, paper_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        The paper as returned by the detail endpoint. Everything but the viewer's own votes comes
+        from the paper detail cache, which the progress, vote and moderation services drop on write.
+        Without ``user_id`` the payload is the same for every viewer; with it (responses to the
+        user's own actions) the viewer's votes are one live user_actions query.
+        """
+        async def _load_public_detail() -> Dict[str, Any]:
+            paper = await self._load_paper_by_id(paper_id)
+            transformed = await transform_papers_batch([paper], None, detail_level="full")
+            if not transformed:
+                raise PaperNotFoundException(f"Paper with ID {paper_id} could not be transformed.")
+            return transformed[0]
+
+        detail = await paper_cache.get_paper_detail(paper_id, _load_public_detail)
+        # The cached detail may be shared with other requests, so overlay the user's votes on a copy
+        user_flags = {"current_user_vote": None, "current_user_implementability_vote": None}
+        if user_id:
+            user_votes = await fetch_user_vote_flags([ObjectId(paper_id)], user_id)
+            user_flags.update(user_votes.get(paper_id, {}))
+        return {**detail, **user_flags}
+
+    async def get_user_paper_states(self, user_id: str, paper_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        The user's upvote and implementability vote on each paper, in request order, from one
+        user_actions query. The list and detail payloads are the same for every viewer, so the
+        client asks for this separately for the papers on screen.
         """
-        #self.logger.debug(f"Service: Attempting to get paper by ID: {paper_id} for user: {user_id}")
+        try:
+            paper_obj_ids = list(dict.fromkeys(ObjectId(paper_id) for paper_id in paper_ids))
+        except (InvalidId, TypeError):
+            raise InvalidRequestException("Invalid paper ID format in paper_ids.")
+        unique_ids = [str(paper_obj_id) for paper_obj_id in paper_obj_ids]
+
+        user_votes = await fetch_user_vote_flags(paper_obj_ids, user_id) if paper_obj_ids else {}
+        return [
+            {
+                "paper_id": paper_id,
+                "current_user_vote": user_votes.get(paper_id, {}).get("current_user_vote"),
+                "current_user_implementability_vote": user_votes.get(paper_id, {}).get("current_user_implementability_vote"),
+            }
+            for paper_id in unique_ids
+        ]
+
+    async def _load_paper_by_id(self, paper_id: str) -> Dict[str, Any]:
         try:
             obj_paper_id = ObjectId(paper_id)
         except InvalidId:
@@ -45,58 +141,42 @@ class PaperViewService:
             raise PaperNotFoundException(f"Invalid paper ID format: {paper_id}")
 
         papers_collection = await get_papers_collection_async()
+        implementation_progress_collection = await get_implementation_progress_collection_async()
+        # One round trip: the progress document's _id is the paper's _id, stored as an ObjectId
+        # or (older documents) as its string, so look up both on the progress _id index
+        pipeline = [
+            {"$match": {"_id": obj_paper_id}},
+            {"$addFields": {"_progressIds": ["$_id", {"$toString": "$_id"}]}},
+            {"$lookup": {
+                "from": implementation_progress_collection.name,
+                "localField": "_progressIds",
+                "foreignField": "_id",
+                "as": "_progress",
+            }},
+            {"$project": {"_progressIds": 0}},
+        ]
         try:
-            paper = await papers_collection.find_one({"_id": obj_paper_id})
+            agg_cursor = await papers_collection.aggregate(pipeline)
+            result = await agg_cursor.to_list(length=1)
         except PyMongoError as e:
             self.logger.error(f"Service: Database error while fetching paper {paper_id}: {e}", exc_info=True)
             raise DatabaseOperationException(f"Error fetching paper {paper_id}: {e}")
 
-        if not paper:
+        if not result:
             self.logger.warning(f"Service: Paper with ID {paper_id} not found.")
             raise PaperNotFoundException(f"Paper with ID {paper_id} not found.")
 
-        # Fetch and attach implementation progress
-        implementation_progress_collection = await get_implementation_progress_collection_async()
-        try:
-            # Updated: Now we search by _id since the implementation progress document's _id is the paper_id
-            try:
-                paper_obj_id = ObjectId(paper_id)
-                # First try with ObjectId
-                query_filter = {"_id": paper_obj_id}
-                self.logger.debug(f"Service: Using ObjectId query filter: {query_filter}")
-                progress_document = await implementation_progress_collection.find_one(query_filter)
-
-                # If not found with ObjectId, try with string (backward compatibility)
-                if not progress_document:
-                    query_filter = {"_id": paper_id}
-                    self.logger.debug(f"Service: Using string query filter: {query_filter}")
-                    progress_document = await implementation_progress_collection.find_one(query_filter)
-            except Exception:
-                # If ObjectId conversion fails, just try with string
-                query_filter = {"_id": paper_id}
-                self.logger.debug(f"Service: Using string query filter: {query_filter}")
-                progress_document = await implementation_progress_collection.find_one(query_filter)
-
-            self.logger.debug(f"Service: Result of find_one for paper_id '{paper_id}': {progress_document}")
-            if progress_document:
-                # Convert the raw document to a proper ImplementationProgress model
-                # This ensures that the _id field is converted to id and all other fields are properly validated
-                from ..schemas.implementation_progress import ImplementationProgress
-                progress_model = ImplementationProgress(**progress_document)
-                # Use model_dump(by_alias=True) to properly serialize with camelCase field names
-                # This will convert _id to id, snake_case to camelCase, etc.
-                progress_dict = progress_model.model_dump(by_alias=True, mode='json')
-                self.logger.debug(f"Service: Progress model ID: {progress_model.id}")
-                paper["implementationProgress"] = progress_dict
-            else:
-                paper["implementationProgress"] = None
-        except PyMongoError as e:
-            self.logger.error(f"Service: Database error while fetching implementation progress for paper {paper_id}: {e}", exc_info=True)
-            # Decide if this should raise an error or just log and continue without progress info
-            paper["implementationProgress"] = None # Default to None on error
-
+        paper = result[0]
+        progress_documents = paper.pop("_progress", [])
+        # Prefer the ObjectId-keyed document if both exist, as the two-query lookup did
+        progress_documents.sort(key=lambda doc: not isinstance(doc.get("_id"), ObjectId))
+        paper["implementationProgress"] = None
+        if progress_documents:
+            # Validate through the schema so _id becomes id and fields are camelCased
+            from ..schemas.implementation_progress import ImplementationProgress
+            progress_model = ImplementationProgress(**progress_documents[0])
+            paper["implementationProgress"] = progress_model.model_dump(by_alias=True, mode='json')
 
-        #self.logger.debug(f"Service: Successfully fetched paper: {paper_id}")
         return paper # The transformation to PaperResponse with user actions will be handled by utils.transform_paper_async in the router
 
     async def get_papers_list(
@@ -116,11 +196,43 @@ class PaperViewService:
         has_official_impl: Optional[bool] = None,
         has_code: Optional[bool] = None,
         contributor_id: Optional[str] = None,
-        venue: Optional[str] = None
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        venue: Optional[str] = None,
+        author_key: Optional[str] = None,
+        cursor: Optional[str] = None,
+        facets: Optional[List[str]] = None,
+        record_usage: bool = True
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Fetch a page of papers, the total matching count and, if requested, facet counts.
+        Pages are addressed by ``skip`` or, for the standard (non-search) query, by a keyset
+        ``cursor`` from ``encode_cursor``, which stays fast however deep the page is.
+        ``facets`` names any of FACET_FIELDS; their value counts are scoped to the current
+        filters and computed in the same round trip as the page (None if not requested).
+        ``author_key`` is an exact author filter on the indexed ``authorKeys``, unlike the
+        ``author`` text search; any spelling of the name is normalized to its key.
+        """
         service_start_time = time.time()
         self.logger.info(f"get_papers_list called with: skip={skip}, limit={limit}, sort_by='{sort_by}', searchQuery='{search_query}', author='{author}'")
         
+        keyset: Optional[Dict[str, Any]] = None
+        if cursor:
+            if search_query or author:
+                raise InvalidRequestException("Cursor pagination is not available for searches; use page numbers instead.")
+            try:
+                keyset = parse_cursor(cursor, sort_by, sort_order)
+            except ValueError as e:
+                raise InvalidRequestException(str(e))
+            skip = 0  # The cursor alone positions the page
+
+        if facets:
+            unknown = set(facets) - set(self.FACET_FIELDS)
+            if unknown:
+                raise InvalidRequestException(f"Unknown facets: {', '.join(sorted(unknown))}. Allowed: {', '.join(self.FACET_FIELDS)}.")
+            facets = sorted(set(facets))
+
+        if author_key is not None:
+            author_key = normalize_author_key(author_key) or ""
+
         # Create cache key from search parameters (exclude user_id from public cache)
         cache_params = {
             "skip": skip,
@@ -137,40 +249,60 @@ class PaperViewService:
             "has_official_impl": has_official_impl,
             "has_code": has_code,
             "contributor_id": contributor_id,
-            "venue": venue
+            "venue": venue,
+            "author_key": author_key,
+            "cursor": cursor,
+            "facets": facets or None
         }
+
+        # Popular parameter sets are what the cache warmer pre-populates (its own calls don't count)
+        if record_usage:
+            query_recorder.record(cache_params)
         
-        # Try to get from cache first
-        cached_result = await paper_cache.get_cached_result(**cache_params)
-        if cached_result:
-            self.logger.info(f"CACHE HIT: Returning cached result in {time.time() - service_start_time:.4f}s")
-            return cached_result["papers"], cached_result["total_count"]
-        
-        # Check if Atlas Search will be active
-        is_atlas_search_active = bool(search_query or author)
-        
-        if is_atlas_search_active:
-            # TWO-PHASE APPROACH FOR ATLAS SEARCH
-            papers, total_count = await self._get_papers_list_atlas_two_phase(
-                skip, limit, sort_by, sort_order, user_id, search_query, author,
-                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue
-            )
+        # Resolve the key once against the current cache generations and reuse it for the write,
+        # so a result computed before an invalidation is stored under the superseded generation
+        cache_key = await paper_cache.get_search_key(**cache_params)
+
+        async def _load_page() -> Dict[str, Any]:
+            # Searches go to the configured backend; the in-process index serves them once loaded
+            is_search_active = bool(search_query or author)
+            search_backend = config_settings.SEARCH_BACKEND
+
+            if is_search_active and search_backend == "local" and local_search_index.ready:
+                papers, total_count, facet_counts = await self._get_papers_list_local(
+                    skip, limit, sort_by, sort_order, search_query, author,
+                    start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                    author_key=author_key, facets=facets
+                )
+            elif is_search_active and search_backend == "atlas":
+                # TWO-PHASE APPROACH FOR ATLAS SEARCH
+                papers, total_count, facet_counts = await self._get_papers_list_atlas_two_phase(
+                    skip, limit, sort_by, sort_order, user_id, search_query, author,
+                    start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                    author_key=author_key, facets=facets
+                )
+            else:
+                # STANDARD MONGODB QUERY (unchanged)
+                papers, total_count, facet_counts = await self._get_papers_list_standard(
+                    skip, limit, sort_by, sort_order, user_id, search_query, author,
+                    start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                    author_key=author_key, keyset=keyset, facets=facets
+                )
+            return {
+                "papers": papers,
+                "total_count": total_count,
+                "facets": facet_counts
+            }
+
+        # Serve from cache when possible. Stale pages are returned immediately and refreshed in
+        # the background; misses run the query once for all concurrent callers and cache it
+        result, outcome = await paper_cache.get_page(cache_key, _load_page)
+
+        if outcome == "miss":
+            self.logger.info(f"CACHE MISS: Query completed and cached in {time.time() - service_start_time:.4f}s")
         else:
-            # STANDARD MONGODB QUERY (unchanged)
-            papers, total_count = await self._get_papers_list_standard(
-                skip, limit, sort_by, sort_order, user_id, search_query, author,
-                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue
-            )
-        
-        # Cache the result for future requests
-        result_to_cache = {
-            "papers": papers,
-            "total_count": total_count
-        }
-        await paper_cache.cache_result(result_to_cache, **cache_params)
-        
-        self.logger.info(f"CACHE MISS: Query completed and cached in {time.time() - service_start_time:.4f}s")
-        return papers, total_count
+            self.logger.info(f"CACHE {outcome.upper()}: Returning cached result in {time.time() - service_start_time:.4f}s")
+        return result["papers"], result["total_count"], result.get("facets")
 
     async def _get_papers_list_atlas_two_phase(
         self,
@@ -178,9 +310,14 @@ class PaperViewService:
         search_query: Optional[str], author: Optional[str], start_date: Optional[str],
         end_date: Optional[str], main_status: Optional[str], impl_status: Optional[str],
         tags: Optional[List[str]], has_official_impl: Optional[bool], has_code: Optional[bool], 
-        contributor_id: Optional[str], venue: Optional[str]
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """Two-phase Atlas Search: Get IDs first, then fetch full documents only for displayed items"""
+        contributor_id: Optional[str], venue: Optional[str],
+        author_key: Optional[str] = None,
+        facets: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Two-phase Atlas Search: Get IDs first, then fetch full documents only for displayed items.
+        Requested facets are collected by the same $search (the facet collector's $$SEARCH_META).
+        """
         
         self.logger.debug(f"Atlas Search starting: search_query='{search_query}', author='{author}'")
         
@@ -222,8 +359,10 @@ class PaperViewService:
         if tags:
             atlas_compound_filter.append({"terms": {"query": tags, "path": "tasks"}})
         if venue:
-            escaped_venue = re.escape(venue)
-            atlas_compound_filter.append({"regex": {"query": escaped_venue, "path": "proceeding", "allowAnalyzedField": True}})
+            # Exact match on the normalized key (mapped as a token field in the search index)
+            atlas_compound_filter.append({"equals": {"path": "venueKey", "value": venue_key(venue) or ""}})
+        if author_key is not None:
+            atlas_compound_filter.append({"equals": {"path": "authorKeys", "value": author_key}})
         
         # Date filters
         try:
@@ -241,40 +380,12 @@ class PaperViewService:
         except ValueError as e:
             self.logger.warning(f"Invalid date format: {e}. Date filter ignored.")
 
-        # Official implementation filter
+        # Official implementation and code filters: booleans precomputed at ingestion
+        # (backfilled by scripts/migrate_implementation_flags.py), so both cases are one equals
         if has_official_impl is not None:
-            if has_official_impl:
-                atlas_compound_filter.append({
-                    "compound": {
-                        "must": [{"exists": {"path": "pwc_url"}}],
-                        "mustNot": [{"term": {"query": "", "path": "pwc_url"}}]
-                    }
-                })
-            else:
-                atlas_compound_filter.append({
-                    "compound": {
-                        "should": [
-                            {"bool": {"mustNot": [{"exists": {"path": "pwc_url"}}]}},
-                            {"term": {"query": "", "path": "pwc_url"}}
-                        ],
-                        "minimumShouldMatch": 1
-                    }
-                })
-
-        # Has code filter (checks hasCode field)
+            atlas_compound_filter.append({"equals": {"path": "hasOfficialImpl", "value": has_official_impl}})
         if has_code is not None:
-            if has_code:
-                atlas_compound_filter.append({"term": {"query": True, "path": "hasCode"}})
-            else:
-                atlas_compound_filter.append({
-                    "compound": {
-                        "should": [
-                            {"term": {"query": False, "path": "hasCode"}},
-                            {"bool": {"mustNot": [{"exists": {"path": "hasCode"}}]}}
-                        ],
-                        "minimumShouldMatch": 1
-                    }
-                })
+            atlas_compound_filter.append({"equals": {"path": "hasCode", "value": has_code}})
 
         # Build Atlas search stage
         search_stage_compound: Dict[str, Any] = {}
@@ -289,7 +400,8 @@ class PaperViewService:
             self.logger.warning("Atlas Search compound is empty, falling back to standard query")
             return await self._get_papers_list_standard(
                 skip, limit, sort_by, sort_order, user_id, search_query, author,
-                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue
+                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                author_key=author_key, facets=facets
             )
 
         search_stage = {
@@ -300,6 +412,16 @@ class PaperViewService:
                 "returnStoredSource": True  # Return fields from index, skip collection fetch
             }
         }
+        if facets:
+            # The facet collector wraps the same operator; buckets arrive in $$SEARCH_META next to the count
+            search_stage["$search"].pop("compound")
+            search_stage["$search"]["facet"] = {
+                "operator": {"compound": search_stage_compound},
+                "facets": {
+                    name: {"type": "string", "path": self.FACET_FIELDS[name], "numBuckets": self.FACET_BUCKETS}
+                    for name in facets
+                },
+            }
 
         # Sorting — Atlas Search returns by relevance by default, only add $sort for non-relevance
         needs_explicit_sort = False
@@ -343,35 +465,175 @@ class PaperViewService:
             papers_list = await results_cursor.to_list(length=limit)
 
             # Extract count from $$SEARCH_META embedded in each document
-            MAX_COUNT = 10000
             total_papers = 0
+            facet_counts = self._empty_facets(facets)
             if papers_list:
                 meta = papers_list[0].get("meta", {})
-                total_papers = min(meta.get("count", {}).get("lowerBound", 0), MAX_COUNT)
+                total_papers = min(meta.get("count", {}).get("lowerBound", 0), self.MAX_COUNT)
+                for name in facets or []:
+                    buckets = meta.get("facet", {}).get(name, {}).get("buckets", [])
+                    facet_counts[name] = self._facet_buckets(buckets)
                 for paper in papers_list:
                     paper.pop("meta", None)
 
             self.logger.info(f"Atlas Search: {time.time() - search_start:.4f}s, {len(papers_list)} results, ~{total_papers} total")
 
-            return papers_list, total_papers
+            return papers_list, total_papers, facet_counts
             
         except PyMongoError as e:
             self.logger.error(f"Atlas Search error: {e}", exc_info=True)
+            if config_settings.SEARCH_FALLBACK == "local" and local_search_index.ready:
+                self.logger.info("Falling back to the local search index")
+                return await self._get_papers_list_local(
+                    skip, limit, sort_by, sort_order, search_query, author,
+                    start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                    author_key=author_key, facets=facets
+                )
             self.logger.info("Falling back to standard query")
             return await self._get_papers_list_standard(
                 skip, limit, sort_by, sort_order, user_id, search_query, author,
-                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue
+                start_date, end_date, main_status, impl_status, tags, has_official_impl, has_code, contributor_id, venue,
+                author_key=author_key, facets=facets
             )
 
+    async def _get_papers_list_local(
+        self,
+        skip: int, limit: int, sort_by: str, sort_order: str,
+        search_query: Optional[str], author: Optional[str], start_date: Optional[str],
+        end_date: Optional[str], main_status: Optional[str], impl_status: Optional[str],
+        tags: Optional[List[str]], has_official_impl: Optional[bool], has_code: Optional[bool],
+        contributor_id: Optional[str], venue: Optional[str],
+        author_key: Optional[str] = None,
+        facets: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Search with the in-process BM25 index (papers2code_app2/search). The index ranks and
+        applies the search, status, tag and date filters over every match; the remaining filters,
+        non-date sorts, the page documents and facets are resolved in MongoDB on the matching
+        ``_id``s. Results are capped at MAX_COUNT only once filtered and sorted, like the other paths.
+        """
+        search_start = time.time()
+        papers_collection = await get_papers_collection_async()
+
+        dt_start = dt_end = None
+        try:
+            if start_date:
+                dt_start = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+            if end_date:
+                dt_end = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+        except ValueError as e:
+            self.logger.warning(f"Invalid date format: {e}. Date filter ignored.")
+            dt_start = dt_end = None
+
+        # Scoring touches every posting of the query terms, so keep it off the event loop
+        hits = await asyncio.to_thread(
+            local_search_index.search, search_query, author, main_status, tags, dt_start, dt_end
+        )
+
+        other_conditions: List[Dict[str, Any]] = []
+        if impl_status:
+            other_conditions.append({"implementabilityStatus": impl_status})
+        if venue:
+            other_conditions.append({"venueKey": venue_key(venue) or ""})
+        if author_key is not None:
+            other_conditions.append({"authorKeys": author_key})
+        if has_official_impl is not None:
+            other_conditions.append({"hasOfficialImpl": has_official_impl})
+        if has_code is not None:
+            other_conditions.append({"hasCode": has_code})
+        if contributor_id:
+            try:
+                other_conditions.append({"contributorIds": ObjectId(contributor_id)})
+            except (InvalidId, TypeError) as e:
+                self.logger.warning(f"Invalid contributor ID format: {e}")
+                return [], 0, self._empty_facets(facets)
+
+        try:
+            sort_field, sort_direction = sort_spec(sort_by, sort_order)
+            if sort_by in ("relevance", "newest") and search_query:
+                # Index order: best score first
+                matched_ids = await self._filter_local_hits(papers_collection, [hit.paper_id for hit in hits], other_conditions)
+            elif sort_field == "publicationDate":
+                hits.sort(key=lambda hit: (hit.date, hit.paper_id), reverse=sort_direction == DESCENDING)
+                matched_ids = await self._filter_local_hits(papers_collection, [hit.paper_id for hit in hits], other_conditions)
+            else:
+                # Sorted on a field only MongoDB has: read it for every match, then sort here
+                sorted_ids = await self._sort_local_hits(
+                    papers_collection, [hit.paper_id for hit in hits], other_conditions, sort_field, sort_direction
+                )
+                matched_ids = sorted_ids[:self.MAX_COUNT]
+
+            page_ids = matched_ids[skip:skip + limit]
+            page_cursor = papers_collection.find({"_id": {"$in": page_ids}}, self.LIST_VIEW_PROJECTION)
+            by_id = {paper["_id"]: paper async for paper in page_cursor}
+            papers_list = [by_id[pid] for pid in page_ids if pid in by_id]
+
+            facet_counts = self._empty_facets(facets)
+            if facets and matched_ids:
+                agg_cursor = await papers_collection.aggregate([
+                    {"$match": {"_id": {"$in": matched_ids}}},
+                    {"$facet": self._facet_stages(facets)},
+                ])
+                result = await agg_cursor.to_list(length=1)
+                facet_result = result[0] if result else {}
+                facet_counts = {name: self._facet_buckets(facet_result.get(name, [])) for name in facets}
+
+            self.logger.info(f"Local search: {time.time() - search_start:.4f}s, {len(papers_list)} results, {len(matched_ids)} total")
+            return papers_list, len(matched_ids), facet_counts
+
+        except PyMongoError as e:
+            self.logger.error(f"Database error in local search: {e}", exc_info=True)
+            raise DatabaseOperationException(f"Error fetching papers list: {e}")
+
+    async def _filter_local_hits(
+        self, papers_collection: Any, hit_ids: List[ObjectId], conditions: List[Dict[str, Any]]
+    ) -> List[ObjectId]:
+        """The first MAX_COUNT of ``hit_ids`` (in order) that also match ``conditions``, checked in batches"""
+        if not conditions:
+            return hit_ids[:self.MAX_COUNT]
+        matched: List[ObjectId] = []
+        for start in range(0, len(hit_ids), self.LOCAL_SEARCH_BATCH):
+            batch = hit_ids[start:start + self.LOCAL_SEARCH_BATCH]
+            cursor = papers_collection.find({"$and": [{"_id": {"$in": batch}}, *conditions]}, {"_id": 1})
+            allowed = {doc["_id"] async for doc in cursor}
+            matched.extend(pid for pid in batch if pid in allowed)
+            if len(matched) >= self.MAX_COUNT:
+                break
+        return matched[:self.MAX_COUNT]
+
+    async def _sort_local_hits(
+        self, papers_collection: Any, hit_ids: List[ObjectId], conditions: List[Dict[str, Any]],
+        sort_field: str, sort_direction: int
+    ) -> List[ObjectId]:
+        """Every hit matching ``conditions``, ordered by ``sort_field`` then ``_id`` as MongoDB would sort them"""
+        rows: List[Tuple[Tuple[int, Any], ObjectId]] = []
+        for start in range(0, len(hit_ids), self.LOCAL_SEARCH_BATCH):
+            batch = hit_ids[start:start + self.LOCAL_SEARCH_BATCH]
+            cursor = papers_collection.find({"$and": [{"_id": {"$in": batch}}, *conditions]}, {"_id": 1, sort_field: 1})
+            async for doc in cursor:
+                value = doc.get(sort_field)
+                # BSON order: missing/null, then numbers, then strings
+                rank = 0 if value is None else 2 if isinstance(value, str) else 1
+                rows.append(((rank, value if value is not None else 0), doc["_id"]))
+        rows.sort(reverse=sort_direction == DESCENDING)
+        return [pid for _, pid in rows]
+
     async def _get_papers_list_standard(
         self,
         skip: int, limit: int, sort_by: str, sort_order: str, user_id: Optional[str],  # noqa: ARG002 - user_id reserved for future use
         search_query: Optional[str], author: Optional[str], start_date: Optional[str],
         end_date: Optional[str], main_status: Optional[str], impl_status: Optional[str],
         tags: Optional[List[str]], has_official_impl: Optional[bool], has_code: Optional[bool],
-        contributor_id: Optional[str], venue: Optional[str]
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """Standard MongoDB find query (no Atlas Search)"""
+        contributor_id: Optional[str], venue: Optional[str],
+        author_key: Optional[str] = None,
+        keyset: Optional[Dict[str, Any]] = None,
+        facets: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Standard MongoDB find query (no Atlas Search). ``keyset`` replaces ``skip`` with a cursor range predicate.
+        Requested facets are served from the filter-scoped cache, or computed together with the
+        page and total in one $facet aggregation.
+        """
         
         service_start_time = time.time()
         papers_collection = await get_papers_collection_async()
@@ -385,8 +647,11 @@ class PaperViewService:
         if tags:
             mongo_filter_conditions.append({"tasks": {"$in": tags}})
         if venue:
-            escaped_venue = re.escape(venue)
-            mongo_filter_conditions.append({"proceeding": {"$regex": escaped_venue, "$options": "i"}})
+            # Exact match on the normalized key, served by the venueKey/publicationDate index
+            mongo_filter_conditions.append({"venueKey": venue_key(venue) or ""})
+        if author_key is not None:
+            # Exact author match on the normalized multikey authorKeys (no $text involved)
+            mongo_filter_conditions.append({"authorKeys": author_key})
         
         # Text search: Use MongoDB text index for search_query and/or author
         # Note: MongoDB allows only ONE $text operator per query, so we combine them
@@ -420,131 +685,75 @@ class PaperViewService:
         except ValueError as e:
             self.logger.warning(f"Invalid date format: {e}. Date filter ignored.")
 
-        # Official implementation filter
+        # Official implementation and code filters: booleans precomputed at ingestion
+        # (backfilled by scripts/migrate_implementation_flags.py), so both cases are indexed equalities
         if has_official_impl is not None:
-            if has_official_impl:
-                mongo_filter_conditions.append({"pwc_url": {"$exists": True, "$nin": ["", None]}})
-            else:
-                mongo_filter_conditions.append({
-                    "$or": [{"pwc_url": {"$exists": False}}, {"pwc_url": ""}, {"pwc_url": None}]
-                })
-
-        # Has code filter
+            mongo_filter_conditions.append({"hasOfficialImpl": has_official_impl})
         if has_code is not None:
-            if has_code:
-                mongo_filter_conditions.append({"hasCode": True})
-            else:
-                mongo_filter_conditions.append({
-                    "$or": [{"hasCode": False}, {"hasCode": {"$exists": False}}]
-                })
+            mongo_filter_conditions.append({"hasCode": has_code})
 
-        # Contributor filter - find all papers where user has performed ANY action
+        # Contributor filter - papers where the user has performed ANY action, via the
+        # materialized contributorIds set (maintained by services/paper_contributions.py)
         if contributor_id:
             try:
-                contributor_obj_id = ObjectId(contributor_id)
-                user_actions_collection = await get_user_actions_collection_async()
-                
-                # Find all distinct paper IDs where this user has performed any action
-                paper_ids_with_actions = await user_actions_collection.distinct(
-                    "paperId",
-                    {"userId": contributor_obj_id}
-                )
-                
-                if paper_ids_with_actions:
-                    # Convert paper IDs to ObjectId if they're strings
-                    paper_obj_ids = []
-                    for pid in paper_ids_with_actions:
-                        try:
-                            if isinstance(pid, str):
-                                paper_obj_ids.append(ObjectId(pid))
-                            else:
-                                paper_obj_ids.append(pid)
-                        except Exception:
-                            continue
-                    
-                    if paper_obj_ids:
-                        mongo_filter_conditions.append({"_id": {"$in": paper_obj_ids}})
-                    else:
-                        # No valid paper IDs found
-                        self.logger.info(f"No papers found for contributor: {contributor_id}")
-                        return [], 0
-                else:
-                    # No actions found for this contributor, return empty result
-                    self.logger.info(f"No papers found for contributor: {contributor_id}")
-                    return [], 0
-            except Exception as e:
+                mongo_filter_conditions.append({"contributorIds": ObjectId(contributor_id)})
+            except (InvalidId, TypeError) as e:
                 self.logger.warning(f"Invalid contributor ID format: {e}")
-                return [], 0
+                return [], 0, self._empty_facets(facets)
 
         # Build final query
         final_query = {"$and": mongo_filter_conditions} if mongo_filter_conditions else {}
         
-        # Sorting
-        sort_doc: Dict[str, Any] = {}
-        parsed_sort_order_val = DESCENDING if sort_order == "desc" else ASCENDING
-        
-        if sort_by == "newest":
-            sort_doc = {"publicationDate": DESCENDING}
-        elif sort_by == "oldest":
-            sort_doc = {"publicationDate": ASCENDING}
-        elif sort_by == "upvotes":
-            sort_doc = {"upvoteCount": parsed_sort_order_val}
-        elif sort_by == "publication_date":
-            sort_doc = {"publicationDate": parsed_sort_order_val}
-        elif sort_by == "title":
-            sort_doc = {"title": parsed_sort_order_val}
-        else:
-            sort_doc = {"publicationDate": DESCENDING}
+        # The page itself is additionally bounded by the cursor; the total is not
+        find_query = {"$and": [*mongo_filter_conditions, keyset]} if keyset else final_query
+
+        # Sorting: _id breaks ties so the order is total and cursors never skip or repeat papers
+        sort_field, sort_direction = sort_spec(sort_by, sort_order)
+        sort_doc: Dict[str, Any] = {sort_field: sort_direction, "_id": sort_direction}
 
         try:
-            self.logger.info(f"Executing standard find query: {final_query} with sort: {sort_doc}, skip: {skip}, limit: {limit}")
+            self.logger.info(f"Executing standard find query: {find_query} with sort: {sort_doc}, skip: {skip}, limit: {limit}")
             sort_criteria = list(sort_doc.items()) if sort_doc else None
 
             find_call_start_time = time.time()
             
-            # OPTIMIZATION: Project only needed fields for list view
-            list_view_projection = {
-                "_id": 1,
-                "title": 1,
-                "authors": 1,
-                "publicationDate": 1,
-                "upvoteCount": 1,
-                "status": 1,
-                "urlGithub": 1,
-                "urlAbs": 1,
-                "urlPdf": 1,
-                "hasCode": 1,
-                "abstract": 1,
-                "venue": 1,
-                "tasks": 1,
-                "implementabilityStatus": 1,
-                "pwcUrl": 1,
-                "arxivId": 1
-            }
-            
             # Add query hints for better index usage
-            cursor = papers_collection.find(final_query, list_view_projection)
+            cursor = papers_collection.find(find_query, self.LIST_VIEW_PROJECTION)
             
             # Apply index hints based on query and sort criteria (if enabled)
             # Wrapped in try/except to gracefully handle missing indexes
             # NOTE: MongoDB does not allow hint() with $text queries - skip hints when text search is active
             uses_text_search = bool(text_search_terms)
-            if config_settings.ENABLE_QUERY_HINTS and sort_criteria and not uses_text_search:
+            # Keyset pages are left to the planner, which plans each branch of the cursor's
+            # $or as a range on the {sort field, _id} index; a hint would force one full scan
+            if config_settings.ENABLE_QUERY_HINTS and sort_criteria and not uses_text_search and not keyset:
                 sort_field = sort_criteria[0][0]
                 try:
                     # Use appropriate index hints for common sort patterns
-                    if sort_field == "publicationDate":
+                    if contributor_id:
+                        # The contributor's papers are few; seek them on the multikey index
+                        if sort_field == "publicationDate":
+                            cursor = cursor.hint("contributorIds_1_publicationDate_-1__id_-1_papers_async")
+                    elif author_key is not None:
+                        # An author's papers are few; seek them on the multikey index
+                        if sort_field == "publicationDate":
+                            cursor = cursor.hint("authorKeys_1_publicationDate_-1__id_-1_papers_async")
+                    elif venue and sort_field == "publicationDate":
+                        cursor = cursor.hint("venueKey_1_publicationDate_-1__id_-1_papers_async")
+                    elif has_official_impl is not None and not main_status and sort_field in ("publicationDate", "upvoteCount"):
+                        cursor = cursor.hint(f"hasOfficialImpl_1_{sort_field}_-1__id_-1_papers_async")
+                    elif sort_field == "publicationDate":
                         if main_status:
-                            cursor = cursor.hint("status_1_publicationDate_-1_papers_async")
+                            cursor = cursor.hint("status_1_publicationDate_-1__id_-1_papers_async")
                         else:
-                            cursor = cursor.hint("publicationDate_-1_papers_async")
+                            cursor = cursor.hint("publicationDate_-1__id_-1_papers_async")
                     elif sort_field == "upvoteCount":
                         if main_status:
-                            cursor = cursor.hint("status_1_upvoteCount_-1_papers_async")
+                            cursor = cursor.hint("status_1_upvoteCount_-1__id_-1_papers_async")
                         else:
-                            cursor = cursor.hint("upvoteCount_-1_papers_async")
+                            cursor = cursor.hint("upvoteCount_-1__id_-1_papers_async")
                     elif sort_field == "title":
-                        cursor = cursor.hint("title_1_papers_async")
+                        cursor = cursor.hint("title_1__id_1_papers_async")
                 except Exception as hint_error:
                     self.logger.warning(f"Index hint failed, proceeding without hint: {hint_error}")
 
@@ -555,41 +764,83 @@ class PaperViewService:
                 # Default hint for unsorted queries (skip if text search is active)
                 if config_settings.ENABLE_QUERY_HINTS and main_status and not uses_text_search:
                     try:
-                        cursor = cursor.hint("status_1_publicationDate_-1_papers_async")
+                        cursor = cursor.hint("status_1_publicationDate_-1__id_-1_papers_async")
                     except Exception as hint_error:
                         self.logger.warning(f"Default index hint failed: {hint_error}")
             
-            cursor = cursor.skip(skip).limit(limit)
+            cursor = cursor.limit(limit) if keyset else cursor.skip(skip).limit(limit)
             self.logger.info(f"Standard find query construction took: {time.time() - find_call_start_time:.4f}s")
             
-            find_fetch_start_time = time.time()
-            papers_list = await cursor.to_list(length=limit)
-            self.logger.info(f"Standard find cursor.to_list() took: {time.time() - find_fetch_start_time:.4f}s")
-            
-            count_start_time = time.time()
-            
-            # Optimize count operation - use bounded count for speed
-            MAX_COUNT = 10000  # Cap count for performance (UI shows "10,000+ results")
+            async def _fetch_page() -> List[Dict[str, Any]]:
+                find_fetch_start_time = time.time()
+                papers = await cursor.to_list(length=limit)
+                self.logger.info(f"Standard find cursor.to_list() took: {time.time() - find_fetch_start_time:.4f}s")
+                return papers
 
-            if not final_query:
-                # No filters - use cached estimated count
-                total_papers = await papers_collection.estimated_document_count()
-                self.logger.info(f"Standard estimated_document_count took: {time.time() - count_start_time:.4f}s")
-            else:
+            async def _count_matching() -> int:
+                count_start_time = time.time()
+                if not final_query:
+                    # No filters - use cached estimated count
+                    total = await papers_collection.estimated_document_count()
+                    self.logger.info(f"Standard estimated_document_count took: {time.time() - count_start_time:.4f}s")
+                    return total
                 # Use bounded count aggregation - much faster than count_documents for complex queries
                 # This avoids scanning the entire collection for text search queries
                 count_pipeline = [
                     {"$match": final_query},
-                    {"$limit": MAX_COUNT},  # Stop counting after MAX_COUNT
+                    {"$limit": self.MAX_COUNT},  # Stop counting after MAX_COUNT
                     {"$count": "total"}
                 ]
                 count_cursor = await papers_collection.aggregate(count_pipeline)
                 count_result = await count_cursor.to_list(length=1)
-                total_papers = count_result[0]["total"] if count_result else 0
-                self.logger.info(f"Standard bounded_count took: {time.time() - count_start_time:.4f}s (capped at {MAX_COUNT})")
-            
+                self.logger.info(f"Standard bounded_count took: {time.time() - count_start_time:.4f}s (capped at {self.MAX_COUNT})")
+                return count_result[0]["total"] if count_result else 0
+
+            # The total (and facets) depend only on the filters, so they are cached apart from the page
+            count_filters = {
+                "search_query": search_query,
+                "author": author,
+                "start_date": start_date,
+                "end_date": end_date,
+                "main_status": main_status,
+                "impl_status": impl_status,
+                "tags": sorted(tags) if tags else None,
+                "has_official_impl": has_official_impl,
+                "has_code": has_code,
+                "contributor_id": contributor_id,
+                "venue": venue,
+                "author_key": author_key,
+            }
+
+            async def _get_total() -> int:
+                if config_settings.APPROXIMATE_COUNTS:
+                    approximate = await self._get_approximate_count(count_filters)
+                    if approximate is not None:
+                        return approximate
+                count_key = await paper_cache.get_count_key(**count_filters)
+                return await paper_cache.get_count(count_key, _count_matching)
+
+            facet_counts = None
+            if facets:
+                facets_key = await paper_cache.get_facets_key(facets=facets, **count_filters)
+                facet_counts = await paper_cache.get_cached_facets(facets_key)
+                if facet_counts is None:
+                    # Cold filter set: page, total and facets in a single aggregation round trip
+                    papers_list, total_papers, facet_counts = await self._get_page_with_facets(
+                        papers_collection, final_query, keyset, sort_criteria, 0 if keyset else skip, limit,
+                        self.LIST_VIEW_PROJECTION, facets
+                    )
+                    if final_query:  # Unfiltered totals come from estimated_document_count instead
+                        await paper_cache.cache_count(await paper_cache.get_count_key(**count_filters), total_papers)
+                    await paper_cache.cache_facets(facets_key, facet_counts)
+                    self.logger.info(f"Standard faceted query total time: {time.time() - service_start_time:.4f}s")
+                    return papers_list, total_papers, facet_counts
+
+            # The page and the total are independent queries, so run them concurrently
+            papers_list, total_papers = await asyncio.gather(_fetch_page(), _get_total())
+
             self.logger.info(f"Standard query total time: {time.time() - service_start_time:.4f}s")
-            return papers_list, total_papers
+            return papers_list, total_papers, facet_counts
             
         except PyMongoError as e:
             self.logger.error(f"Database error in standard query: {e}", exc_info=True)
@@ -598,87 +849,233 @@ class PaperViewService:
             self.logger.error(f"Unexpected error in standard query: {e}", exc_info=True)
             raise ServiceException(f"An unexpected error occurred: {e}")
 
-    async def get_distinct_tags(self, search_query: Optional[str] = None) -> List[str]:
+    @staticmethod
+    def _empty_facets(facets: Optional[List[str]]) -> Optional[Dict[str, Dict[str, int]]]:
+        return {name: {} for name in facets} if facets else None
+
+    @staticmethod
+    def _facet_buckets(buckets: List[Dict[str, Any]]) -> Dict[str, int]:
+        """{value: count} from $group / Atlas facet buckets, dropping the null/missing bucket"""
+        return {str(bucket["_id"]): bucket["count"] for bucket in buckets if bucket.get("_id") is not None}
+
+    def _facet_stages(self, facets: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """$facet sub-pipelines counting the most frequent values of each requested facet"""
+        facet_stages: Dict[str, List[Dict[str, Any]]] = {}
+        for name in facets:
+            field = f"${self.FACET_FIELDS[name]}"
+            stages: List[Dict[str, Any]] = [{"$unwind": field}] if name == "tags" else []
+            stages += [
+                {"$group": {"_id": field, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": self.FACET_BUCKETS},
+            ]
+            facet_stages[name] = stages
+        return facet_stages
+
+    async def _get_page_with_facets(
+        self,
+        papers_collection: Any,
+        final_query: Dict[str, Any],
+        keyset: Optional[Dict[str, Any]],
+        sort_criteria: List[Tuple[str, int]],
+        skip: int,
+        limit: int,
+        projection: Dict[str, int],
+        facets: List[str],
+    ) -> Tuple[List[Dict[str, Any]], int, Dict[str, Dict[str, int]]]:
+        """Page, bounded total and facet counts for a filter set in one $facet aggregation"""
+        page_stages: List[Dict[str, Any]] = [{"$match": keyset}] if keyset else []
+        page_stages += [{"$sort": dict(sort_criteria)}, {"$skip": skip}, {"$limit": limit}, {"$project": projection}]
+        facet_stages: Dict[str, List[Dict[str, Any]]] = {
+            "page": page_stages,
+            "total": [{"$limit": self.MAX_COUNT}, {"$count": "total"}],
+            **self._facet_stages(facets),
+        }
+
+        pipeline: List[Dict[str, Any]] = [{"$match": final_query}] if final_query else []
+        pipeline.append({"$facet": facet_stages})
+
+        facet_start_time = time.time()
+        agg_cursor = await papers_collection.aggregate(pipeline, allowDiskUse=True)
+        result = await agg_cursor.to_list(length=1)
+        facet_result = result[0] if result else {}
+        self.logger.info(f"Standard $facet aggregation took: {time.time() - facet_start_time:.4f}s")
+
+        total_result = facet_result.get("total") or []
+        total = total_result[0]["total"] if total_result else 0
+        facet_counts = {name: self._facet_buckets(facet_result.get(name, [])) for name in facets}
+        return facet_result.get("page", []), total, facet_counts
+
+    async def get_filter_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Paper counts per status, tag and venue key, computed in one aggregation and
+        cached as metadata. Backs the approximate totals of single-filter list queries.
+        """
+        async def _load_filter_counts() -> Dict[str, Dict[str, int]]:
+            papers_collection = await get_papers_collection_async()
+            pipeline = [{"$facet": {
+                "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "tasks": [{"$unwind": "$tasks"}, {"$group": {"_id": "$tasks", "count": {"$sum": 1}}}],
+                "venueKey": [{"$group": {"_id": "$venueKey", "count": {"$sum": 1}}}],
+            }}]
+            agg_cursor = await papers_collection.aggregate(pipeline)
+            result = await agg_cursor.to_list(length=1)
+            facets = result[0] if result else {}
+            return {
+                field: {str(doc["_id"]): doc["count"] for doc in facets.get(field, []) if doc.get("_id")}
+                for field in ("status", "tasks", "venueKey")
+            }
+
+        try:
+            cached_counts = await paper_cache.get_cached_metadata("filter_counts")
+            if cached_counts is not None:
+                return cached_counts
+            return await paper_cache.fill_metadata("filter_counts", _load_filter_counts)
+        except PyMongoError as e:
+            self.logger.error(f"Database error computing filter counts: {e}", exc_info=True)
+            raise DatabaseOperationException(f"Error computing filter counts: {e}")
+
+    async def _get_approximate_count(self, filters: Dict[str, Any]) -> Optional[int]:
+        """
+        Total for a lone status, single-tag, venue or author filter from the precomputed counts.
+        Returns None for any other filter combination, which is then counted exactly.
+        """
+        active = {name: value for name, value in filters.items() if value is not None}
+        if len(active) != 1:
+            return None
+        name, value = next(iter(active.items()))
+        if name not in ("main_status", "tags", "venue", "author_key") or (name == "tags" and len(value) != 1):
+            return None
+        if name == "author_key":
+            authors_collection = await get_authors_collection_async()
+            author = await authors_collection.find_one({"_id": value}, {"paperCount": 1})
+            return min(author.get("paperCount", 0) if author else 0, self.MAX_COUNT)
+
+        counts = await self.get_filter_counts()
+        if name == "main_status":
+            total = counts["status"].get(value, 0)
+        elif name == "tags":
+            total = counts["tasks"].get(value[0], 0)
+        else:
+            total = counts.get("venueKey", {}).get(venue_key(value), 0)
+        return min(total, self.MAX_COUNT)
+
+    TAG_SEARCH_LIMIT = 50
+
+    async def get_distinct_tags(self, search_query: Optional[str] = None, limit: int = TAG_SEARCH_LIMIT) -> List[str]:
         """
         Retrieves a list of distinct tags from the papers collection.
-        Optionally filters tags by a search query.
+        With a search query, returns at most ``limit`` tags containing it, most papers first,
+        from the tag index (see ``search.tags``).
         Uses caching (1 hour TTL) since tags change rarely.
         """
+        global _tag_index
         try:
-            # Try cache first (for full list, filtering is done in-memory)
+            version = _tag_index_version
+            if search_query and search_query.strip() and _tag_index is not None:
+                return _tag_index.search(search_query, limit)
+
+            # Try cache first (the full list; searches go through the tag index built from it)
             cached_tags = await paper_cache.get_cached_metadata("tags")
             if cached_tags is not None:
                 all_tags = cached_tags
             else:
-                # Cache miss - fetch from database
-                papers_collection = await get_papers_collection_async()
-                all_tags = await papers_collection.distinct("tasks")
-                all_tags = sorted([tag for tag in all_tags if tag is not None])
-                # Cache the full list
-                await paper_cache.set_cached_metadata("tags", all_tags)
+                # Cache miss - fetch from database once for all concurrent callers, and cache the full list
+                async def _load_tags() -> List[str]:
+                    papers_collection = await get_papers_collection_async()
+                    tags = await papers_collection.distinct("tasks")
+                    return sorted([tag for tag in tags if tag is not None])
+
+                all_tags = await paper_cache.fill_metadata("tags", _load_tags)
 
-            # Filter tags if search query is provided (done in-memory, fast)
             if search_query and search_query.strip():
-                search_lower = search_query.strip().lower()
-                return [tag for tag in all_tags if search_lower in tag.lower()]
+                counts = await self.get_filter_counts()
+                index = TagIndex(all_tags, counts.get("tasks", {}))
+                if version == _tag_index_version:  # Not invalidated while loading
+                    _tag_index = index
+                return index.search(search_query, limit)
 
             return all_tags
         except PyMongoError as e:
             self.logger.error(f"Database error fetching distinct tags: {e}", exc_info=True)
             raise DatabaseOperationException(f"Error fetching distinct tags: {e}")
 
-    async def get_distinct_venues(self) -> List[str]:
+    async def get_venue_options(self) -> List[Dict[str, str]]:
         """
-        Retrieves a list of distinct venues from the papers collection.
+        Distinct venues as ``{"name": display name, "key": venueKey}``, one per key, sorted by name.
+        The key is what the venue filter matches exactly.
         Uses caching (1 hour TTL) since venues change rarely.
         """
         try:
             # Try cache first
-            cached_venues = await paper_cache.get_cached_metadata("venues")
-            if cached_venues is not None:
-                return cached_venues
+            cached_options = await paper_cache.get_cached_metadata("venue_options")
+            if cached_options is not None:
+                return cached_options
 
-            # Cache miss - fetch from database
-            papers_collection = await get_papers_collection_async()
-            venues = await papers_collection.distinct("proceeding")
-            venues = sorted([v for v in venues if v])
-            # Cache the result
-            await paper_cache.set_cached_metadata("venues", venues)
-            return venues
+            # Cache miss - fetch from database once for all concurrent callers, and cache the result
+            async def _load_venue_options() -> List[Dict[str, str]]:
+                papers_collection = await get_papers_collection_async()
+                proceedings = await papers_collection.distinct("proceeding")
+                names_by_key: Dict[str, str] = {}
+                for proceeding in sorted(p for p in proceedings if p):
+                    key = venue_key(proceeding)
+                    if key:
+                        names_by_key.setdefault(key, venue_display_name(proceeding))
+                return sorted(
+                    ({"name": name, "key": key} for key, name in names_by_key.items()),
+                    key=lambda option: option["name"].lower(),
+                )
+
+            return await paper_cache.fill_metadata("venue_options", _load_venue_options)
         except PyMongoError as e:
             self.logger.error(f"Database error fetching distinct venues: {e}", exc_info=True)
             raise DatabaseOperationException(f"Error fetching distinct venues: {e}")
 
-    async def get_distinct_authors(self) -> List[str]:
+    async def get_distinct_venues(self) -> List[str]:
         """
-        Retrieves a list of distinct authors from the papers collection.
-        Note: This flattens the authors array.
-        Uses caching (1 hour TTL) since author list changes rarely.
+        Retrieves the distinct venue names (one per edition-independent venue).
+        Any of them can be passed back as the venue filter.
         """
-        try:
-            # Try cache first
-            cached_authors = await paper_cache.get_cached_metadata("authors")
-            if cached_authors is not None:
-                return cached_authors
+        return [option["name"] for option in await self.get_venue_options()]
 
-            # Cache miss - fetch from database
-            papers_collection = await get_papers_collection_async()
-            # Use aggregation to unwind authors array and get distinct values
-            pipeline = [
-                {"$unwind": "$authors"},
-                {"$group": {"_id": "$authors"}},
-                {"$sort": {"_id": 1}},
-                {"$limit": 1000}  # Limit to prevent huge result sets
-            ]
-            agg_cursor = await papers_collection.aggregate(pipeline)
-            result = await agg_cursor.to_list(length=1000)
-            authors = [doc["_id"] for doc in result if doc.get("_id")]
-            # Cache the result
-            await paper_cache.set_cached_metadata("authors", authors)
-            return authors
+    def suggest(self, query: str, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Typeahead completions from the in-memory prefix index (empty until its first build)"""
+        if not suggest_index.ready:
+            self.logger.info("Typeahead index not built yet; returning no suggestions")
+        return suggest_index.suggest(query, limit)
+
+    AUTHOR_PAGE_SIZE = 50
+
+    async def get_author_page(
+        self, prefix: Optional[str] = None, limit: int = AUTHOR_PAGE_SIZE, after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Authors from the ``authors`` collection whose normalized name starts with ``prefix``, in key
+        order, with their paper counts. ``after`` is the ``next_cursor`` of the previous page.
+        An index range scan on ``_id``; the first unfiltered page is cached as metadata.
+        """
+        key_prefix = normalize_author_key(prefix) if prefix else None
+
+        async def _load_page() -> Dict[str, Any]:
+            authors = await list_authors(key_prefix, limit + 1, after)
+            next_cursor = authors[limit - 1]["key"] if len(authors) > limit else None
+            return {"authors": authors[:limit], "next_cursor": next_cursor}
+
+        try:
+            if key_prefix or after or limit != self.AUTHOR_PAGE_SIZE:
+                return await _load_page()
+            cached_page = await paper_cache.get_cached_metadata("authors")
+            if cached_page is not None:
+                return cached_page
+            return await paper_cache.fill_metadata("authors", _load_page)
         except PyMongoError as e:
-            self.logger.error(f"Database error fetching distinct authors: {e}", exc_info=True)
-            raise DatabaseOperationException(f"Error fetching distinct authors: {e}")
+            self.logger.error(f"Database error fetching authors: {e}", exc_info=True)
+            raise DatabaseOperationException(f"Error fetching authors: {e}")
+
+    async def get_distinct_authors(self, prefix: Optional[str] = None, limit: int = AUTHOR_PAGE_SIZE) -> List[str]:
+        """Display names of the authors matching ``prefix`` (see ``get_author_page``)."""
+        page = await self.get_author_page(prefix, limit)
+        return [author["name"] for author in page["authors"]]
 
     async def get_paper_count_by_status(self) -> Dict[str, int]:
         """
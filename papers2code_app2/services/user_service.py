@@ -15,8 +15,10 @@ from ..schemas.users import UserProfileResponse
 from ..schemas.papers import PaperResponse
 from ..schemas.minimal import UserSchema, UserUpdateProfile
 from ..services.exceptions import UserNotFoundException
+from ..services.paper_contributions import remove_contributor_everywhere
 from ..shared import IMPL_STATUS_COMMUNITY_IMPLEMENTABLE, IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE
 from ..utils import transform_papers_batch
+from ..utils.serialization import construct_papers
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +90,7 @@ class UserService:
             
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(paper_docs, requesting_user_id_str, detail_level="summary")
-            upvoted_papers_list = [PaperResponse(**paper) for paper in transformed_papers]
+            upvoted_papers_list = construct_papers(transformed_papers)
 
         # --- Contributed Papers ---
         contributed_paper_ids = set()
@@ -112,7 +114,7 @@ class UserService:
             
             # OPTIMIZATION: Use batch transformation
             transformed_papers = await transform_papers_batch(paper_docs, requesting_user_id_str, detail_level="summary")
-            contributed_papers_list = [PaperResponse(**paper) for paper in transformed_papers]
+            contributed_papers_list = construct_papers(transformed_papers)
 
         return UserProfileResponse(
             user_details=user_details,
@@ -481,6 +483,8 @@ class UserService:
                         session=session
                     )
                     logger.info(f"Deleted {delete_actions_result.deleted_count} user actions")
+                    removed_from = await remove_contributor_everywhere(user_id, session=session)
+                    logger.info(f"Removed user from contributors of {removed_from} papers")
                     
                     # Step 5: Delete the user document
                     delete_user_result = await self.users_collection.delete_one(
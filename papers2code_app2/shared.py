@@ -1,7 +1,7 @@
 import os
 import logging
 from pathlib import Path
-from typing import Optional, Any
+from typing import Literal, Optional, Any
 from datetime import datetime
 from urllib.parse import urlparse
 from dotenv import load_dotenv
@@ -224,21 +224,52 @@ class AppSettings(BaseSettings):    # Core settings
     ATLAS_SEARCH_OVERALL_LIMIT: int = Field(100, env="ATLAS_SEARCH_OVERALL_LIMIT")
     ATLAS_SEARCH_TITLE_BOOST: float = Field(10.0, env="ATLAS_SEARCH_TITLE_BOOST")
 
+    # Search backend: "atlas" (Atlas Search), "local" (in-process BM25 index) or "text" (MongoDB $text index)
+    SEARCH_BACKEND: Literal["atlas", "local", "text"] = Field("atlas", env="SEARCH_BACKEND")
+    SEARCH_FALLBACK: Literal["atlas", "local", "text"] = Field("text", env="SEARCH_FALLBACK")  # Used when Atlas Search fails: "local" or "text"
+    LOCAL_SEARCH_INDEX_PATH: str = Field("", env="LOCAL_SEARCH_INDEX_PATH")  # Shared segment file (defaults to the temp dir)
+    LOCAL_SEARCH_REFRESH_INTERVAL: float = Field(60.0, env="LOCAL_SEARCH_REFRESH_INTERVAL")  # Seconds between polls for new papers
+    LOCAL_SEARCH_REBUILD_INTERVAL: float = Field(21600.0, env="LOCAL_SEARCH_REBUILD_INTERVAL")  # Rebuild the segment once it is this old (6 hours)
+    SUGGEST_REBUILD_INTERVAL: float = Field(600.0, env="SUGGEST_REBUILD_INTERVAL")  # Seconds between typeahead index rebuilds (also rebuilt on metadata invalidation)
+
     STATUS_CONFIRMED_NOT_IMPLEMENTABLE_DB: str = Field(MAIN_STATUS_NOT_IMPLEMENTABLE, env="STATUS_CONFIRMED_NOT_IMPLEMENTABLE_DB")
 
     # Redis Cache Settings
     REDIS_URL: Optional[str] = Field(None, env="REDIS_URL")
     CACHE_TTL: int = Field(300, env="CACHE_TTL")  # 5 minutes default
+    CACHE_STALE_TTL: int = Field(600, env="CACHE_STALE_TTL")  # Serve stale search pages while refreshing for this long past CACHE_TTL (0 disables)
     ENABLE_CACHE: bool = Field(True, env="ENABLE_CACHE")
     CACHE_KEY_PREFIX: str = Field("papers2code", env="CACHE_KEY_PREFIX")
     REDIS_MAX_CONNECTIONS: int = Field(20, env="REDIS_MAX_CONNECTIONS")
     REDIS_SOCKET_KEEPALIVE: bool = Field(True, env="REDIS_SOCKET_KEEPALIVE")
+    REDIS_SOCKET_TIMEOUT: float = Field(1.0, env="REDIS_SOCKET_TIMEOUT")  # Per-command timeout (seconds)
+    REDIS_CONNECT_TIMEOUT: float = Field(2.0, env="REDIS_CONNECT_TIMEOUT")  # Connection timeout (seconds)
+    MEMORY_CACHE_MAX_ENTRIES: int = Field(2000, env="MEMORY_CACHE_MAX_ENTRIES")  # In-process fallback entry cap
+    MEMORY_CACHE_MAX_BYTES: int = Field(64 * 1024 * 1024, env="MEMORY_CACHE_MAX_BYTES")  # In-process fallback size cap (64 MB)
+    CACHE_CODEC: str = Field("msgpack", env="CACHE_CODEC")  # json, orjson or msgpack (falls back to json with a warning if the 'cache' extra is not installed)
+    CACHE_COMPRESSION: str = Field("zstd", env="CACHE_COMPRESSION")  # none, zstd or lz4 (falls back to none with a warning if the 'cache' extra is not installed)
+    CACHE_COMPRESS_MIN_BYTES: int = Field(1024, env="CACHE_COMPRESS_MIN_BYTES")  # Only compress payloads at least this large
+    CACHE_L1_TTL: int = Field(5, env="CACHE_L1_TTL")  # Per-worker in-process cache of decoded hot values (seconds, 0 disables)
+    CACHE_L1_MAX_ENTRIES: int = Field(256, env="CACHE_L1_MAX_ENTRIES")
+    CACHE_DISTRIBUTED_LOCK: bool = Field(False, env="CACHE_DISTRIBUTED_LOCK")  # Coalesce cache misses across workers via a Redis lock
+    CACHE_LOCK_TIMEOUT: float = Field(5.0, env="CACHE_LOCK_TIMEOUT")  # Lock expiry and max wait for another worker's fill (seconds)
+    CACHE_WARM_ENABLED: bool = Field(True, env="CACHE_WARM_ENABLED")  # Pre-populate popular search pages at startup and after invalidations
+    CACHE_WARM_TOP_N: int = Field(20, env="CACHE_WARM_TOP_N")  # Max search parameter sets warmed per run
+    CACHE_WARM_CONCURRENCY: int = Field(2, env="CACHE_WARM_CONCURRENCY")  # Max warming queries in flight against MongoDB
+    CACHE_WARM_TIME_BUDGET: float = Field(15.0, env="CACHE_WARM_TIME_BUDGET")  # Queries not started within this many seconds are skipped
+    CACHE_WARM_DEBOUNCE: float = Field(30.0, env="CACHE_WARM_DEBOUNCE")  # Wait this long after a generation roll before re-warming
+    CACHE_WARM_DECAY_INTERVAL: float = Field(1800.0, env="CACHE_WARM_DECAY_INTERVAL")  # Halve recorded query popularity once per this many seconds
+    CACHE_COUNT_TTL: int = Field(900, env="CACHE_COUNT_TTL")  # Result totals and facet counts, cached per filter set independently of page and sort
+    CACHE_DETAIL_TTL: int = Field(600, env="CACHE_DETAIL_TTL")  # Public part of a paper's detail view; dropped on every write to the paper, its progress or its votes
+    PUBLIC_RESPONSE_MAX_AGE: int = Field(30, env="PUBLIC_RESPONSE_MAX_AGE")  # Cache-Control max-age of the paper list, which is the same for every viewer; 0 disables
+    LIST_JSON_FAST_PATH: bool = Field(False, env="LIST_JSON_FAST_PATH")  # Encode list pages straight from the projected documents (utils/paper_json.py), skipping the transformation and response models
     
     # Database Performance Settings
     MONGO_MAX_POOL_SIZE: int = Field(50, env="MONGO_MAX_POOL_SIZE")
     MONGO_MIN_POOL_SIZE: int = Field(5, env="MONGO_MIN_POOL_SIZE")
     ENABLE_QUERY_HINTS: bool = Field(True, env="ENABLE_QUERY_HINTS")
     OPTIMIZE_COUNT_QUERIES: bool = Field(True, env="OPTIMIZE_COUNT_QUERIES")
+    APPROXIMATE_COUNTS: bool = Field(False, env="APPROXIMATE_COUNTS")  # Answer single status/tag/venue filter totals from precomputed counts (up to an hour stale)
     
     # Performance Settings for transformation
     PAPER_TRANSFORM_BATCH_SIZE: int = Field(20, env="PAPER_TRANSFORM_BATCH_SIZE")
@@ -1,12 +1,14 @@
 # Re-export transformation utilities from the transformations module
 # This keeps the package clean - all implementation lives in transformations.py
 from .transformations import (
+    fetch_user_vote_flags,
     transform_papers_batch,
     _transform_authors,
     _transform_url,
 )
 
 __all__ = [
+    'fetch_user_vote_flags',
     'transform_papers_batch',
     '_transform_authors',
     '_transform_url',
@@ -0,0 +1,76 @@
+"""
+Author name normalization shared by the API and the ingestion scripts.
+
+The same person appears as ``"Kaiming He"``, ``"kaiming he"`` or ``"Kaiming  He"``, and accented
+names are often typed without accents. ``author_key`` folds case, accents and punctuation, so
+the ``authorKeys`` multikey field on papers and the ``_id`` of the ``authors`` collection match
+however a name was written or typed.
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne  # type: ignore
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case- and accent-insensitive form of ``text``, words separated by one space"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(" ", stripped).strip()
+
+
+def author_key(name: Optional[str]) -> Optional[str]:
+    """Normalized key of an author name, e.g. ``"sara sanchez"`` for ``"Sara Sánchez"``. Idempotent."""
+    return normalize_text(name) or None
+
+
+def author_keys(authors: Any) -> List[str]:
+    """Distinct keys of a paper's author list, in author order"""
+    if isinstance(authors, str):
+        authors = [authors]
+    keys = (author_key(name) for name in authors or [] if isinstance(name, str))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def prefix_range(prefix: str) -> Dict[str, str]:
+    """Query operator matching every string that starts with ``prefix`` (an index range scan)"""
+    return {"$gte": prefix, "$lt": prefix + "\U0010ffff"}
+
+
+def count_authors(
+    author_lists: Iterable[Any], into: Optional[Dict[str, Tuple[str, int]]] = None
+) -> Dict[str, Tuple[str, int]]:
+    """key -> (display name, number of papers) over the author lists of some papers, added to ``into`` if given"""
+    counts: Dict[str, Tuple[str, int]] = {} if into is None else into
+    for authors in author_lists:
+        if isinstance(authors, str):
+            authors = [authors]
+        names = {}
+        for name in authors or []:
+            key = author_key(name) if isinstance(name, str) else None
+            if key and key not in names:
+                names[key] = " ".join(name.split())
+        for key, name in names.items():
+            display, count = counts.get(key, (name, 0))
+            counts[key] = (display, count + 1)
+    return counts
+
+
+def author_count_ops(counts: Dict[str, Tuple[str, int]], sign: int = 1) -> List[UpdateOne]:
+    """
+    Upserts adding (sign=1) or removing (sign=-1) papers from the ``authors`` collection counts.
+    Works with both the sync and the async client; delete authors left at zero papers afterwards.
+    """
+    return [
+        UpdateOne(
+            {"_id": key},
+            {"$inc": {"paperCount": sign * count}, "$setOnInsert": {"name": name}},
+            upsert=sign > 0,
+        )
+        for key, (name, count) in counts.items()
+    ]
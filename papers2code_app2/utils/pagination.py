@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination for the paper list.
+
+A cursor encodes the sort key and ``_id`` of the last paper on a page. The next page is a
+range predicate on ``(sort field, _id)``, so MongoDB seeks straight to it on the
+``{sort field, _id}`` indexes instead of scanning and discarding ``skip`` entries.
+"""
+import base64
+import binascii
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId, json_util  # type: ignore
+from bson.errors import InvalidId  # type: ignore
+from pymongo import ASCENDING, DESCENDING  # type: ignore
+
+
+def sort_spec(sort_by: str, sort_order: str) -> Tuple[str, int]:
+    """The (field, direction) a paper list sort mode orders by; ``_id`` in the same direction breaks ties"""
+    direction = DESCENDING if sort_order == "desc" else ASCENDING
+    if sort_by == "newest":
+        return "publicationDate", DESCENDING
+    if sort_by == "oldest":
+        return "publicationDate", ASCENDING
+    if sort_by == "upvotes":
+        return "upvoteCount", direction
+    if sort_by == "publication_date":
+        return "publicationDate", direction
+    if sort_by == "title":
+        return "title", direction
+    return "publicationDate", DESCENDING
+
+
+def encode_cursor(paper: Dict[str, Any], sort_by: str, sort_order: str) -> str:
+    """Opaque cursor pointing just past ``paper`` in the given sort"""
+    field, direction = sort_spec(sort_by, sort_order)
+    payload = json_util.dumps({"f": field, "d": direction, "v": paper.get(field), "id": paper["_id"]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, ObjectId]:
+    """
+    Return the (sort value, _id) a cursor points past.
+    Raises ValueError if the cursor is malformed or was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        field, direction, value, last_id = payload["f"], payload["d"], payload["v"], payload["id"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, InvalidId) as e:
+        raise ValueError("Malformed pagination cursor") from e
+    if (field, direction) != sort_spec(sort_by, sort_order):
+        raise ValueError("Pagination cursor was issued for a different sort order")
+    if not isinstance(last_id, ObjectId):
+        raise ValueError("Malformed pagination cursor")
+    return value, last_id
+
+
+def keyset_filter(field: str, direction: int, value: Any, last_id: ObjectId) -> Dict[str, Any]:
+    """
+    Match the papers after ``(value, last_id)`` in ``(field, _id)`` order.
+
+    Null and missing values sort before every other value, so they come last in descending
+    order and first in ascending order; a plain $lt/$gt would never reach them.
+    """
+    if direction == DESCENDING:
+        if value is None:
+            return {field: None, "_id": {"$lt": last_id}}
+        return {"$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}},
+            {field: None},
+        ]}
+    if value is None:
+        return {"$or": [
+            {field: None, "_id": {"$gt": last_id}},
+            {field: {"$ne": None}},
+        ]}
+    return {"$or": [
+        {field: {"$gt": value}},
+        {field: value, "_id": {"$gt": last_id}},
+    ]}
+
+
+def parse_cursor(cursor: Optional[str], sort_by: str, sort_order: str) -> Optional[Dict[str, Any]]:
+    """The keyset filter for ``cursor``, or None when paginating by page number"""
+    if not cursor:
+        return None
+    value, last_id = decode_cursor(cursor, sort_by, sort_order)
+    field, direction = sort_spec(sort_by, sort_order)
+    return keyset_filter(field, direction, value, last_id)
+
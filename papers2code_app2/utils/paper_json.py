@@ -0,0 +1,124 @@
+"""
+Direct JSON encoding of paper list pages.
+
+The regular list response goes document -> ``transform_papers_batch`` dict -> constructed
+``PaperResponse`` -> JSON (``utils.serialization``). ``encode_paper_page`` maps each projected
+document field straight to its response key through a table compiled once at import and
+serializes the page in one call, producing the same JSON as the regular path. Documents may be
+dicts or ``RawBSONDocument``s; only the fields in ``PaperViewService.LIST_VIEW_PROJECTION`` are read.
+"""
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..shared import (
+    IMPL_STATUS_VOTING,
+    IMPL_STATUS_COMMUNITY_IMPLEMENTABLE,
+    IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE,
+    IMPL_STATUS_ADMIN_IMPLEMENTABLE,
+    IMPL_STATUS_ADMIN_NOT_IMPLEMENTABLE,
+)
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_KNOWN_IMPLEMENTABILITY = {
+    IMPL_STATUS_COMMUNITY_IMPLEMENTABLE,
+    IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE,
+    IMPL_STATUS_ADMIN_IMPLEMENTABLE,
+    IMPL_STATUS_ADMIN_NOT_IMPLEMENTABLE,
+}
+_MISSING = object()
+
+
+def _url(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and value.strip() else None
+
+
+def _datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    return value
+
+
+def _authors(value: Any) -> List[str]:
+    if value and isinstance(value, list):
+        if all(isinstance(author, Mapping) for author in value):  # Subdocuments of a RawBSONDocument are not dicts
+            return [author.get("name") for author in value if author.get("name")]
+        if all(isinstance(author, str) for author in value):
+            return value
+    return []
+
+
+def _implementability(value: Any) -> str:
+    if value in _KNOWN_IMPLEMENTABILITY:
+        return value
+    return IMPL_STATUS_VOTING
+
+
+def _count(value: Any) -> int:
+    return int(value) if value else 0
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+# (response key, document field, default when the field is absent, converter), in the
+# field order of PaperResponse so the output matches its serialization byte for byte
+_FIELDS: Tuple[Tuple[str, str, Any, Callable[[Any], Any]], ...] = (
+    ("pwcUrl", "pwcUrl", None, _url),
+    ("arxivId", "arxivId", None, _same),
+    ("title", "title", None, _same),
+    ("abstract", "abstract", "", _same),
+    ("authors", "authors", [], _authors),
+    ("urlAbs", "urlAbs", None, _url),
+    ("urlPdf", "urlPdf", None, _url),
+    ("urlGithub", "urlGithub", None, _url),
+    ("publicationDate", "publicationDate", None, _datetime),
+    ("proceeding", "venue", None, _same),
+    ("tasks", "tasks", [], _same),
+    ("hasCode", "hasCode", False, bool),
+    ("upvoteCount", "upvoteCount", 0, _count),
+    ("status", "status", "Not Started", _same),
+    ("implementabilityStatus", "implementabilityStatus", IMPL_STATUS_VOTING, _implementability),
+)
+
+
+def paper_to_json_dict(doc: Mapping[str, Any]) -> Dict[str, Any]:
+    """The public list-view JSON object of one projected paper document"""
+    item: Dict[str, Any] = {}
+    for key, field, default, convert in _FIELDS:
+        value = doc.get(field, _MISSING)
+        item[key] = default if value is _MISSING else convert(value)
+    item["id"] = str(doc["_id"])
+    item["currentUserImplementabilityVote"] = None
+    item["currentUserVote"] = None
+    item["nonImplementableVotes"] = _count(doc.get("nonImplementableVotes"))
+    item["isImplementableVotes"] = _count(doc.get("isImplementableVotes"))
+    item["implementationProgress"] = None
+    item["isImplementable"] = item["status"] != "Not Implementable"
+    return item
+
+
+def encode_paper_page(docs: Iterable[Mapping[str, Any]], page_fields: Dict[str, Any]) -> bytes:
+    """
+    JSON body of a ``PaginatedPaperResponse`` (camelCase keys, as the API sends it) for projected
+    paper documents. ``page_fields`` holds the other response fields by their Python names.
+    """
+    body = {
+        "papers": [paper_to_json_dict(doc) for doc in docs if "_id" in doc],
+        "totalCount": page_fields["total_count"],
+        "countCapped": page_fields.get("count_capped", False),
+        "page": page_fields["page"],
+        "pageSize": page_fields["page_size"],
+        "hasMore": page_fields["has_more"],
+        "nextCursor": page_fields.get("next_cursor"),
+        "facets": page_fields.get("facets"),
+    }
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
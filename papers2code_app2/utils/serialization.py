@@ -0,0 +1,55 @@
+"""
+Serialization of API responses built from trusted data.
+
+Paper responses are assembled by our own code (``transform_papers_batch``) from documents that
+were validated when they were written, so validating every item again against the response model,
+including an ``HttpUrl`` parse of each URL, only costs CPU. Routes returning such data build the
+models with ``model_construct`` and render them with the ``TypeAdapter``s below, compiled once at
+import. ``trusted_json_response`` returns the rendered bytes directly, so FastAPI skips its own
+response-model pass as well. URLs are sent as stored.
+
+Request bodies, ingestion and writes keep full validation; only the read path trusts the data.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from ..schemas.papers import PaginatedPaperResponse, PaperResponse
+from ..schemas.users import UserProfileResponse
+
+PAPER_ADAPTER = TypeAdapter(PaperResponse)
+PAPER_LIST_ADAPTER = TypeAdapter(List[PaperResponse])
+PAPER_PAGE_ADAPTER = TypeAdapter(PaginatedPaperResponse)
+PAPER_SECTIONS_ADAPTER = TypeAdapter(Dict[str, List[PaperResponse]])  # e.g. the dashboard's named lists
+USER_PROFILE_ADAPTER = TypeAdapter(UserProfileResponse)
+
+
+def construct_paper(data: Mapping[str, Any]) -> PaperResponse:
+    """A ``PaperResponse`` from a ``transform_papers_batch`` item, without validation"""
+    return PaperResponse.model_construct(**data)
+
+
+def construct_papers(items: Iterable[Mapping[str, Any]]) -> List[PaperResponse]:
+    return [PaperResponse.model_construct(**item) for item in items]
+
+
+def construct_paper_page(papers: Iterable[Mapping[str, Any]], **page_fields: Any) -> PaginatedPaperResponse:
+    """A ``PaginatedPaperResponse`` of transformed papers; ``page_fields`` are its other fields"""
+    return PaginatedPaperResponse.model_construct(papers=construct_papers(papers), **page_fields)
+
+
+def trusted_json_response(
+    adapter: TypeAdapter, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    The JSON response for ``content`` (camelCase keys, like every API response). Serializer
+    warnings are off because constructed models hold stored values, such as URL strings in
+    ``HttpUrl`` fields, that serialize correctly but are not the declared type.
+    """
+    return Response(
+        content=adapter.dump_json(content, by_alias=True, warnings=False),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -20,6 +20,9 @@ from ..cache import paper_cache
 
 logger = logging.getLogger(__name__)
 
+# Answers "this user's actions on these papers, newest first" from one index range per paper
+USER_PAPER_ACTIONS_INDEX = "userId_1_paperId_1_timestamp_-1_user_actions_async"
+
 # --- Helper functions ---
 
 def _transform_authors(authors_data: Any) -> List[str]:
@@ -39,6 +42,69 @@ def _transform_url(url_value: Any) -> Optional[str]:
     return None
 
 
+async def fetch_user_vote_flags(
+    paper_obj_ids: List[ObjectId], current_user_id_str: str
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    The user's own votes on each paper, in one user_actions query:
+    paper id -> {"current_user_vote", "current_user_implementability_vote"}.
+    Papers the user never acted on are left out.
+    """
+    user_data_map: Dict[str, Dict[str, Optional[str]]] = {}
+    try:
+        user_obj_id = ObjectId(current_user_id_str)
+        user_actions_collection = await get_user_actions_collection_async()
+        
+        from ..schemas.user_activity import LoggedActionTypes
+        
+        # Single query to get all user actions for all papers
+        user_actions = await user_actions_collection.find(
+            {
+                "userId": user_obj_id,
+                "paperId": {"$in": paper_obj_ids}
+            },
+            {"paperId": 1, "actionType": 1, "timestamp": 1}
+        ).sort([("timestamp", DESCENDING)]).hint(USER_PAPER_ACTIONS_INDEX).to_list(length=None)
+        
+        # Group actions by paper
+        paper_actions = {}
+        for action in user_actions:
+            paper_id_str = str(action["paperId"])
+            if paper_id_str not in paper_actions:
+                paper_actions[paper_id_str] = []
+            paper_actions[paper_id_str].append(action)
+        
+        # Process actions for each paper
+        implementability_action_types_map = {
+            LoggedActionTypes.ADMIN_IMPLEMENTABLE.value: "up",
+            LoggedActionTypes.COMMUNITY_IMPLEMENTABLE.value: "up",
+            LoggedActionTypes.COMMUNITY_NOT_IMPLEMENTABLE.value: "down",
+            LoggedActionTypes.ADMIN_NOT_IMPLEMENTABLE.value: "down",
+        }
+        
+        for paper_id_str, actions in paper_actions.items():
+            has_upvote = False
+            latest_implementability_action = None
+            
+            for action in actions:
+                action_type = action.get("actionType")
+                
+                if action_type == LoggedActionTypes.UPVOTE.value:
+                    has_upvote = True
+                
+                if action_type in implementability_action_types_map and latest_implementability_action is None:
+                    latest_implementability_action = action_type
+            
+            user_data_map[paper_id_str] = {
+                "current_user_vote": "up" if has_upvote else None,
+                "current_user_implementability_vote": implementability_action_types_map.get(latest_implementability_action) if latest_implementability_action else None
+            }
+            
+    except (InvalidId, Exception) as e:
+        logger.error(f"Error batch fetching user-specific data: {e}", exc_info=True)
+    return user_data_map
+
+
 # --- Main Transform Function ---
 
 async def transform_papers_batch(
@@ -52,12 +118,12 @@ async def transform_papers_batch(
     PERFORMANCE: This is MUCH more efficient than calling transform_paper_async() 
     for each paper individually:
     - Individual: N papers × 2 queries = 2N queries
-    - Batch: 2 queries total (user actions + vote counts)
-    - ~50% performance improvement for typical paper lists
+    - Batch: at most 1 query total (user actions, only for a signed-in user)
     
     Optimizations:
     - Single query for all user-specific data across all papers
-    - Single aggregation for all vote counts across all papers
+    - Vote counts read from the isImplementableVotes/nonImplementableVotes counters on the
+      paper documents (kept in sync by PaperModerationService), so no aggregation
     - In-memory grouping and processing
     
     Args:
@@ -97,108 +163,7 @@ async def transform_papers_batch(
     # This replaces N queries with 1 query
     user_data_map = {}
     if current_user_id_str and detail_level != "summary":
-        try:
-            user_obj_id = ObjectId(current_user_id_str)
-            user_actions_collection = await get_user_actions_collection_async()
-            
-            from ..schemas.user_activity import LoggedActionTypes
-            
-            # Single query to get all user actions for all papers
-            user_actions = await user_actions_collection.find(
-                {
-                    "userId": user_obj_id,
-                    "paperId": {"$in": paper_obj_ids}
-                },
-                {"paperId": 1, "actionType": 1, "timestamp": 1}
-            ).sort([("timestamp", DESCENDING)]).to_list(length=None)
-            
-            # Group actions by paper
-            paper_actions = {}
-            for action in user_actions:
-                paper_id_str = str(action["paperId"])
-                if paper_id_str not in paper_actions:
-                    paper_actions[paper_id_str] = []
-                paper_actions[paper_id_str].append(action)
-            
-            # Process actions for each paper
-            implementability_action_types_map = {
-                LoggedActionTypes.ADMIN_IMPLEMENTABLE.value: "up",
-                LoggedActionTypes.COMMUNITY_IMPLEMENTABLE.value: "up",
-                LoggedActionTypes.COMMUNITY_NOT_IMPLEMENTABLE.value: "down",
-                LoggedActionTypes.ADMIN_NOT_IMPLEMENTABLE.value: "down",
-            }
-            
-            for paper_id_str, actions in paper_actions.items():
-                has_upvote = False
-                latest_implementability_action = None
-                
-                for action in actions:
-                    action_type = action.get("actionType")
-                    
-                    if action_type == LoggedActionTypes.UPVOTE.value:
-                        has_upvote = True
-                    
-                    if action_type in implementability_action_types_map and latest_implementability_action is None:
-                        latest_implementability_action = action_type
-                
-                user_data_map[paper_id_str] = {
-                    "current_user_vote": "up" if has_upvote else None,
-                    "current_user_implementability_vote": implementability_action_types_map.get(latest_implementability_action) if latest_implementability_action else None
-                }
-                
-        except (InvalidId, Exception) as e:
-            logger.error(f"Error batch fetching user-specific data: {e}", exc_info=True)
-    
-    # OPTIMIZATION: Batch fetch aggregate vote counts for all papers
-    # This replaces N aggregation pipelines with 1 aggregation
-    vote_counts_map = {}
-    if detail_level == "full":
-        try:
-            from ..schemas.user_activity import LoggedActionTypes
-            user_actions_collection = await get_user_actions_collection_async()
-            
-            pipeline = [
-                {"$match": {"paperId": {"$in": paper_obj_ids}}},
-                {"$group": {
-                    "_id": {
-                        "paperId": "$paperId",
-                        "actionType": "$actionType"
-                    },
-                    "count": {"$sum": 1}
-                }}
-            ]
-            
-            cursor = await user_actions_collection.aggregate(pipeline)
-            results = [doc async for doc in cursor]
-            
-            not_implementable_action_types = {
-                LoggedActionTypes.COMMUNITY_NOT_IMPLEMENTABLE.value,
-                LoggedActionTypes.ADMIN_NOT_IMPLEMENTABLE.value
-            }
-            
-            implementable_action_types = {
-                LoggedActionTypes.COMMUNITY_IMPLEMENTABLE.value,
-                LoggedActionTypes.ADMIN_IMPLEMENTABLE.value
-            }
-            
-            for result in results:
-                paper_id_str = str(result["_id"]["paperId"])
-                action_type = result["_id"]["actionType"]
-                count = result["count"]
-                
-                if paper_id_str not in vote_counts_map:
-                    vote_counts_map[paper_id_str] = {
-                        "not_implementable_votes": 0,
-                        "implementable_votes": 0,
-                    }
-                
-                if action_type in not_implementable_action_types:
-                    vote_counts_map[paper_id_str]["not_implementable_votes"] += count
-                elif action_type in implementable_action_types:
-                    vote_counts_map[paper_id_str]["implementable_votes"] += count
-                    
-        except Exception as e:
-            logger.error(f"Error batch fetching aggregate vote counts: {e}", exc_info=True)
+        user_data_map = await fetch_user_vote_flags(paper_obj_ids, current_user_id_str)
     
     # Transform all papers using the batch-fetched data
     transformed_papers = []
@@ -267,13 +232,12 @@ async def transform_papers_batch(
             })
             transformed_data.update(user_data)
         
-        # Add aggregate votes from batch lookup
+        # Implementability vote counters maintained on the paper by the moderation service
         if detail_level == "full":
-            vote_counts = vote_counts_map.get(paper_id_str, {
-                "not_implementable_votes": 0,
-                "implementable_votes": 0,
+            transformed_data.update({
+                "not_implementable_votes": paper_doc.get("nonImplementableVotes", 0),
+                "implementable_votes": paper_doc.get("isImplementableVotes", 0),
             })
-            transformed_data.update(vote_counts)
         
         transformed_papers.append(transformed_data)
     
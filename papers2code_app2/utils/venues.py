@@ -0,0 +1,33 @@
+"""
+Venue normalization shared by the API and the ingestion scripts.
+
+Papers With Code proceedings look like ``"NeurIPS 2020 12"`` or ``"EMNLP (Findings) 2021 11"``:
+a venue name followed by the year and month. The venue filter matches on ``venueKey``, the
+lower-cased, punctuation-free venue name without the date, so one indexed equality covers
+every edition of a venue.
+"""
+import re
+from typing import Optional
+
+_DATE_SUFFIX_RE = re.compile(r"\s*\b(?:19|20)\d{2}\b.*$")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def venue_display_name(proceeding: Optional[str]) -> Optional[str]:
+    """The venue name of a proceeding without its year and month, e.g. ``"NeurIPS"``"""
+    if not proceeding:
+        return None
+    name = " ".join(_DATE_SUFFIX_RE.sub("", proceeding).split())
+    return name or None
+
+
+def venue_key(venue: Optional[str]) -> Optional[str]:
+    """
+    Normalized key of a venue or proceeding, e.g. ``"neurips"`` for ``"NeurIPS 2020 12"``.
+    Idempotent, so display names, raw proceedings and keys all map to the same key.
+    """
+    name = venue_display_name(venue)
+    if not name:
+        return None
+    key = _NON_ALNUM_RE.sub("-", name.lower()).strip("-")
+    return key or None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark
+
+Compares the cache codecs (json, orjson, msgpack) and compressions (none, zstd, lz4)
+on synthetic search result pages shaped like the ones PaperSearchCache stores:
+stored bytes per page and encode/decode time per page. The legacy
+``json.dumps(default=str)`` format is included as the baseline.
+
+Usage:
+- python scripts/benchmark_cache_codecs.py
+- python scripts/benchmark_cache_codecs.py --papers 50 --iterations 2000
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.cache.codecs import CacheCodec, available_codecs, available_compressions
+
+WORDS = (
+    "model learning neural network training data attention transformer graph "
+    "representation optimization benchmark dataset language vision reinforcement"
+).split()
+
+
+def make_page(num_papers: int, seed: int = 0) -> Dict[str, Any]:
+    """Build a cached search page envelope with realistic field sizes."""
+    rng = random.Random(seed)
+    papers = []
+    for _ in range(num_papers):
+        papers.append({
+            "_id": ObjectId(),
+            "title": " ".join(rng.choices(WORDS, k=10)).title(),
+            "authors": [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+            "publicationDate": datetime(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+            "upvoteCount": rng.randint(0, 500),
+            "status": rng.choice(["Not Started", "Started", "Completed"]),
+            "urlGithub": None,
+            "urlAbs": f"https://arxiv.org/abs/{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+            "urlPdf": None,
+            "hasCode": rng.random() < 0.4,
+            "abstract": " ".join(rng.choices(WORDS, k=rng.randint(120, 250))),
+            "venue": rng.choice(["NeurIPS", "ICML", "ICLR", "CVPR", None]),
+            "tasks": rng.sample(WORDS, k=3),
+            "implementabilityStatus": "Voting",
+            "pwcUrl": None,
+            "arxivId": f"{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+        })
+    return {"fresh_until": time.time() + 300, "data": {"papers": papers, "total_count": 10000}}
+
+
+def time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Average microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def run(num_papers: int, iterations: int) -> List[Dict[str, Any]]:
+    page = make_page(num_papers)
+    results = []
+
+    # Baseline: the format used before the codec layer
+    legacy = json.dumps(page, default=str)
+    results.append({
+        "codec": "legacy json(default=str)",
+        "bytes": len(legacy.encode("utf-8")),
+        "encode_us": time_per_call(lambda: json.dumps(page, default=str), iterations),
+        "decode_us": time_per_call(lambda: json.loads(legacy), iterations),
+    })
+
+    for codec_name, codec_ok in available_codecs().items():
+        for compression_name, compression_ok in available_compressions().items():
+            if not (codec_ok and compression_ok):
+                continue
+            codec = CacheCodec(codec_name, compression_name)
+            encoded = codec.encode(page)
+            assert codec.decode(encoded) == page, f"{codec.name} did not round-trip"
+            results.append({
+                "codec": codec.name,
+                "bytes": len(encoded),
+                "encode_us": time_per_call(lambda: codec.encode(page), iterations),
+                "decode_us": time_per_call(lambda: codec.decode(encoded), iterations),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache codecs on synthetic search pages")
+    parser.add_argument("--papers", type=int, default=20, help="Papers per page (default: 20, the list page size)")
+    parser.add_argument("--iterations", type=int, default=500, help="Encode/decode calls per measurement")
+    args = parser.parse_args()
+
+    missing = [name for name, ok in {**available_codecs(), **available_compressions()}.items() if not ok]
+    if missing:
+        print(f"Skipping codecs that are not installed: {', '.join(missing)}")
+
+    results = run(args.papers, args.iterations)
+    baseline = results[0]["bytes"]
+    print(f"\n{args.papers} papers per page, {args.iterations} iterations\n")
+    print(f"{'codec':<26}{'bytes':>10}{'vs legacy':>11}{'encode us':>12}{'decode us':>12}")
+    for row in results:
+        print(
+            f"{row['codec']:<26}{row['bytes']:>10}{row['bytes'] / baseline:>10.0%}"
+            f"{row['encode_us']:>12.1f}{row['decode_us']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+List Serialization Benchmark
+
+CPU time to turn one page of list-view paper documents into the response body, starting from
+the BSON the server receives from MongoDB:
+
+- regular: decode to dicts, ``transform_papers_batch``, then the constructed
+  ``PaginatedPaperResponse`` rendered by utils/serialization.py (the default route)
+- fast (dict): decode to dicts, ``encode_paper_page`` (the LIST_JSON_FAST_PATH route)
+- fast (raw): decode to ``RawBSONDocument``s, ``encode_paper_page``
+
+Both paths produce the same bytes; the script checks that before timing.
+
+Usage:
+- python scripts/benchmark_list_serialization.py
+- python scripts/benchmark_list_serialization.py --pages 20 100 --iterations 500
+"""
+
+import os
+import sys
+import random
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.utils import transform_papers_batch
+from papers2code_app2.utils.paper_json import encode_paper_page
+from papers2code_app2.utils.serialization import PAPER_PAGE_ADAPTER, construct_paper_page
+
+WORDS = (
+    "model learning neural network training data attention transformer graph "
+    "representation optimization benchmark dataset language vision reinforcement"
+).split()
+RAW_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def make_papers(num_papers: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """List-view projections of synthetic papers with realistic field sizes."""
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": " ".join(rng.choices(WORDS, k=10)).title(),
+            "authors": [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+            "publicationDate": datetime(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+            "upvoteCount": rng.randint(0, 500),
+            "status": rng.choice(["Not Started", "Started", "Completed"]),
+            "urlGithub": f"https://github.com/user{rng.randint(1, 5000)}/repo" if rng.random() < 0.4 else None,
+            "urlAbs": f"https://arxiv.org/abs/{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+            "urlPdf": f"https://arxiv.org/pdf/{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+            "hasCode": rng.random() < 0.4,
+            "abstract": " ".join(rng.choices(WORDS, k=rng.randint(120, 250))),
+            "venue": rng.choice(["NeurIPS", "ICML", "ICLR", "CVPR", None]),
+            "tasks": rng.sample(WORDS, k=3),
+            "implementabilityStatus": "Voting",
+            "isImplementableVotes": rng.randint(0, 5),
+            "nonImplementableVotes": rng.randint(0, 5),
+            "pwcUrl": None,
+            "arxivId": f"{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+        }
+        for _ in range(num_papers)
+    ]
+
+
+def page_fields(num_papers: int) -> Dict[str, Any]:
+    return {
+        "total_count": 10000, "count_capped": True, "page": 1, "page_size": num_papers,
+        "has_more": True, "next_cursor": None, "facets": None,
+    }
+
+
+async def regular_path(wire: List[bytes], fields: Dict[str, Any]) -> bytes:
+    papers = [bson.decode(data) for data in wire]
+    transformed = await transform_papers_batch(papers, None, detail_level="full")
+    return PAPER_PAGE_ADAPTER.dump_json(construct_paper_page(transformed, **fields), by_alias=True, warnings=False)
+
+
+def fast_path(wire: List[bytes], fields: Dict[str, Any]) -> bytes:
+    return encode_paper_page([bson.decode(data) for data in wire], fields)
+
+
+def fast_raw_path(wire: List[bytes], fields: Dict[str, Any]) -> bytes:
+    return encode_paper_page([bson.decode(data, codec_options=RAW_OPTIONS) for data in wire], fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list page serialization")
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100], help="Page sizes (default: 20 100)")
+    parser.add_argument("--iterations", type=int, default=200, help="Pages encoded per measurement")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"\n{'page size':<11}{'path':<14}{'ms/page':>10}{'speedup':>10}")
+    for size in args.pages:
+        wire = [bson.encode(paper) for paper in make_papers(size)]
+        fields = page_fields(size)
+        expected = loop.run_until_complete(regular_path(wire, fields))
+        assert fast_path(wire, fields) == expected and fast_raw_path(wire, fields) == expected, "paths disagree"
+
+        timings = {}
+        start = time.process_time()
+        for _ in range(args.iterations):
+            loop.run_until_complete(regular_path(wire, fields))
+        timings["regular"] = (time.process_time() - start) / args.iterations * 1000
+        for name, encode in (("fast (dict)", fast_path), ("fast (raw)", fast_raw_path)):
+            start = time.process_time()
+            for _ in range(args.iterations):
+                encode(wire, fields)
+            timings[name] = (time.process_time() - start) / args.iterations * 1000
+
+        for name, ms in timings.items():
+            print(f"{size:<11}{name:<14}{ms:>10.3f}{timings['regular'] / ms:>9.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Local Search Benchmark
+
+Builds a local search segment (papers2code_app2/search) from synthetic papers and reports
+build time, file size, and query latency for typical searches: one and several terms,
+an author search, and a search with status, tag and date filters.
+
+Usage:
+- python scripts/benchmark_local_search.py
+- python scripts/benchmark_local_search.py --papers 200000 --iterations 50
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.search import LocalSearchIndex, SegmentWriter
+
+WORDS = (
+    "model learning neural network training data attention transformer graph "
+    "representation optimization benchmark dataset language vision reinforcement "
+    "convolutional generative adversarial diffusion retrieval segmentation detection "
+    "contrastive supervised unsupervised federated sparse efficient robust"
+).split()
+TASKS = ["Image Classification", "Machine Translation", "Object Detection", "Question Answering", "Text Generation"]
+
+
+def make_papers(num_papers: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Synthetic papers with realistic field sizes, in ascending _id order."""
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(5, 12))).title(),
+            "abstract": " ".join(rng.choices(WORDS, k=rng.randint(120, 250))),
+            "authors": [f"Author{rng.randint(1, 50000)} Surname{rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+            "publicationDate": datetime(2010, 1, 1) + timedelta(days=rng.randint(0, 5000)),
+            "status": rng.choice(["Not Started", "Started", "Completed"]),
+            "tasks": rng.sample(TASKS, k=2),
+        }
+        for _ in range(num_papers)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local search index on synthetic papers")
+    parser.add_argument("--papers", type=int, default=50000, help="Papers in the segment (default: 50000)")
+    parser.add_argument("--iterations", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    papers = make_papers(args.papers)
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.seg")
+
+    start = time.perf_counter()
+    writer = SegmentWriter()
+    writer.add_many(papers)
+    header = writer.write(path)
+    build_seconds = time.perf_counter() - start
+
+    index = LocalSearchIndex(path)
+    index.load()
+    print(f"\n{header['doc_count']} papers, {header['term_count']} terms, "
+          f"{os.path.getsize(path) / 1024 / 1024:.1f} MB, built in {build_seconds:.2f}s\n")
+
+    queries = {
+        "one term": {"query": "diffusion"},
+        "three terms": {"query": "sparse attention transformer"},
+        "author": {"query": None, "author": papers[0]["authors"][0]},
+        "filtered": {
+            "query": "graph retrieval",
+            "status": "Completed",
+            "tags": ["Machine Translation"],
+            "start_date": datetime(2015, 1, 1),
+        },
+    }
+    print(f"{'query':<14}{'hits':>8}{'ms':>10}")
+    for name, params in queries.items():
+        hits = index.search(**params)
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            index.search(**params)
+        elapsed_ms = (time.perf_counter() - start) / args.iterations * 1000
+        print(f"{name:<14}{len(hits):>8}{elapsed_ms:>10.1f}")
+
+    index.segment.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+
+CPU time to turn ``transform_papers_batch`` output into a response body, for list pages of
+20 and 100 papers and for the dashboard's ``PaperResponse(**paper)`` lists:
+
+- validated: FastAPI's response-model pass (``PaginatedPaperResponse`` validation, including
+  the ``HttpUrl`` fields, and serialization), then ``json.dumps`` as AliasJSONResponse does
+- trusted: ``model_construct`` plus the precompiled ``TypeAdapter`` in utils/serialization.py
+
+Both produce the same bytes for data in the stored shape; the script checks that before timing.
+
+Usage:
+- python scripts/benchmark_response_serialization.py
+- python scripts/benchmark_response_serialization.py --pages 20 100 --iterations 1000
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from papers2code_app2.schemas.papers import PaginatedPaperResponse, PaperResponse
+from papers2code_app2.utils import transform_papers_batch
+from papers2code_app2.utils.serialization import (
+    PAPER_PAGE_ADAPTER,
+    PAPER_SECTIONS_ADAPTER,
+    construct_paper_page,
+    construct_papers,
+)
+
+WORDS = (
+    "model learning neural network training data attention transformer graph "
+    "representation optimization benchmark dataset language vision reinforcement"
+).split()
+RESPONSE_FIELD = create_model_field("Response_list_papers", PaginatedPaperResponse, mode="serialization")
+
+
+def make_papers(num_papers: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """List-view projections of synthetic papers with realistic field sizes."""
+    rng = random.Random(seed)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": " ".join(rng.choices(WORDS, k=10)).title(),
+            "authors": [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))],
+            "publicationDate": datetime(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+            "upvoteCount": rng.randint(0, 500),
+            "status": rng.choice(["Not Started", "Started", "Completed"]),
+            "urlGithub": f"https://github.com/user{rng.randint(1, 5000)}/repo" if rng.random() < 0.4 else None,
+            "urlAbs": f"https://arxiv.org/abs/{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+            "urlPdf": f"https://arxiv.org/pdf/{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+            "hasCode": rng.random() < 0.4,
+            "abstract": " ".join(rng.choices(WORDS, k=rng.randint(120, 250))),
+            "venue": rng.choice(["NeurIPS", "ICML", "ICLR", "CVPR", None]),
+            "tasks": rng.sample(WORDS, k=3),
+            "implementabilityStatus": "Voting",
+            "isImplementableVotes": rng.randint(0, 5),
+            "nonImplementableVotes": rng.randint(0, 5),
+            "pwcUrl": f"https://paperswithcode.com/paper/p{rng.randint(1, 99999)}",
+            "arxivId": f"{rng.randint(1000, 2400)}.{rng.randint(10000, 99999)}",
+        }
+        for _ in range(num_papers)
+    ]
+
+
+def dumps(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validated vs trusted response serialization")
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100], help="Page sizes (default: 20 100)")
+    parser.add_argument("--iterations", type=int, default=300, help="Responses rendered per measurement")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"\n{'response':<22}{'validated ms':>14}{'trusted ms':>12}{'speedup':>10}")
+    for size in args.pages:
+        full = loop.run_until_complete(transform_papers_batch(make_papers(size), None, detail_level="full"))
+        summary = loop.run_until_complete(transform_papers_batch(make_papers(size, seed=1), None, detail_level="summary"))
+        fields = {
+            "total_count": 10000, "count_capped": True, "page": 1, "page_size": size,
+            "has_more": True, "next_cursor": None, "facets": None,
+        }
+
+        def validated_page() -> bytes:
+            content = {"papers": full, **fields}
+            return dumps(loop.run_until_complete(serialize_response(field=RESPONSE_FIELD, response_content=content)))
+
+        def trusted_page() -> bytes:
+            return PAPER_PAGE_ADAPTER.dump_json(construct_paper_page(full, **fields), by_alias=True, warnings=False)
+
+        def validated_sections() -> bytes:
+            # The dashboard's PaperResponse(**paper) lists, encoded by FastAPI without a response model
+            return dumps(jsonable_encoder({"trendingPapers": [PaperResponse(**paper) for paper in summary]}))
+
+        def trusted_sections() -> bytes:
+            return PAPER_SECTIONS_ADAPTER.dump_json(
+                {"trendingPapers": construct_papers(summary)}, by_alias=True, warnings=False
+            )
+
+        cases = (
+            (f"list page ({size})", validated_page, trusted_page),
+            (f"dashboard list ({size})", validated_sections, trusted_sections),
+        )
+        for name, validated, trusted in cases:
+            assert validated() == trusted(), f"{name}: outputs differ"
+            validated_ms = time_per_call(validated, args.iterations)
+            trusted_ms = time_per_call(trusted, args.iterations)
+            print(f"{name:<22}{validated_ms:>14.3f}{trusted_ms:>12.3f}{validated_ms / trusted_ms:>9.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
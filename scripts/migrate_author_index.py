@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Build the authors collection and papers.authorKeys
+
+The author list endpoints now read the authors collection (normalized author key ->
+display name, paper count) with an index range scan instead of unwinding every paper's
+authors, and the exact author filter matches the multikey papers.authorKeys field.
+This script writes authorKeys on every paper, recounts the authors collection from
+scratch and creates the authorKeys index. It is safe to re-run.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.cache import paper_cache
+from papers2code_app2.database import (
+    initialize_async_db,
+    ensure_db_indexes_async,
+    get_papers_collection_async,
+)
+from papers2code_app2.services.author_index import AUTHOR_KEYS_FIELD, rebuild_author_index
+
+
+def setup_logging():
+    """Configure logging for the migration."""
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+async def run_migration():
+    """Run the complete migration process."""
+    logger = setup_logging()
+
+    try:
+        logger.info("🚀 Starting author index migration...")
+        await initialize_async_db()
+
+        logger.info("📦 Step 1: Writing authorKeys and recounting the authors collection...")
+        result = await rebuild_author_index()
+
+        logger.info("🗂️  Step 2: Ensuring indexes (creates the authorKeys index)...")
+        await ensure_db_indexes_async()
+
+        logger.info("✅ Step 3: Verifying migration...")
+        papers_collection = await get_papers_collection_async()
+        missing = await papers_collection.count_documents({AUTHOR_KEYS_FIELD: {"$exists": False}})
+        if missing:
+            logger.error(f"❌ {missing} papers still lack {AUTHOR_KEYS_FIELD}")
+            return False
+
+        logger.info("🧹 Step 4: Clearing the cached author list...")
+        await paper_cache.invalidate_metadata_cache("authors")
+
+        logger.info("🎉 Migration completed successfully!")
+        logger.info("📋 Summary:")
+        logger.info(f"  ✅ {result['papers_updated']} papers updated")
+        logger.info(f"  ✅ {result['authors_written']} authors written, {result['authors_removed']} removed")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"💥 Migration failed: {e}", exc_info=True)
+        return False
+
+
+def main():
+    """Main entry point."""
+    try:
+        success = asyncio.run(run_migration())
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        print("Migration interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Fatal migration error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
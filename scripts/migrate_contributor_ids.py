@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Backfill papers.contributorIds
+
+The contributor filter of the paper list now reads the materialized contributorIds set on
+each paper instead of collecting every paper id a user has acted on from user_actions.
+This script builds the set for existing papers from user_actions and creates the
+contributorIds index. It is safe to re-run: the set is recomputed from scratch each time.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.database import (
+    initialize_async_db,
+    ensure_db_indexes_async,
+    get_papers_collection_async,
+)
+from papers2code_app2.services.paper_contributions import CONTRIBUTOR_IDS_FIELD, rebuild_contributor_ids
+
+
+def setup_logging():
+    """Configure logging for the migration."""
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+async def run_migration():
+    """Run the complete migration process."""
+    logger = setup_logging()
+
+    try:
+        logger.info("🚀 Starting contributorIds backfill migration...")
+        await initialize_async_db()
+
+        logger.info("📦 Step 1: Rebuilding contributorIds from user_actions...")
+        summary = await rebuild_contributor_ids()
+
+        logger.info("🗂️  Step 2: Ensuring indexes (creates the contributorIds index)...")
+        await ensure_db_indexes_async()
+
+        logger.info("✅ Step 3: Verifying migration...")
+        papers_collection = await get_papers_collection_async()
+        with_contributors = await papers_collection.count_documents({CONTRIBUTOR_IDS_FIELD: {"$exists": True}})
+        if with_contributors != summary["papers_with_contributors"]:
+            logger.warning(
+                f"⚠️  {with_contributors} papers carry contributorIds but {summary['papers_with_contributors']} "
+                "have actions (actions may reference deleted papers)"
+            )
+
+        logger.info("🎉 Migration completed successfully!")
+        logger.info("📋 Summary:")
+        logger.info(f"  ✅ {summary['papers_with_contributors']} papers with contributors")
+        logger.info(f"  ✅ {summary['modified']} papers updated, {summary['cleared']} stale sets cleared")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"💥 Migration failed: {e}", exc_info=True)
+        return False
+
+
+def main():
+    """Main entry point."""
+    try:
+        success = asyncio.run(run_migration())
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        print("Migration interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Fatal migration error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
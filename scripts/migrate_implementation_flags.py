@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Backfill papers.hasOfficialImpl and papers.hasCode
+
+The has_official_impl and has_code list filters are now plain equalities on
+boolean flags (served by the hasOfficialImpl/hasCode compound indexes) instead
+of $exists / $or scans. This script writes the flags on every paper:
+- hasCode defaults to false where it is missing
+- hasOfficialImpl is true when the paper has code from an official repository
+  (hasCode and isOfficialCode, as ingested from Papers With Code)
+It only uses server-side updates and is safe to re-run.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.cache import paper_cache
+from papers2code_app2.database import (
+    initialize_async_db,
+    ensure_db_indexes_async,
+    get_papers_collection_async,
+)
+
+
+def setup_logging():
+    """Configure logging for the migration."""
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+async def backfill_flags():
+    """Write hasCode / hasOfficialImpl where missing or out of date; returns the modified counts."""
+    papers_collection = await get_papers_collection_async()
+
+    has_code = await papers_collection.update_many(
+        {"hasCode": {"$ne": True}},
+        {"$set": {"hasCode": False}},
+    )
+    official = await papers_collection.update_many(
+        {"hasCode": True, "isOfficialCode": True, "hasOfficialImpl": {"$ne": True}},
+        {"$set": {"hasOfficialImpl": True}},
+    )
+    not_official = await papers_collection.update_many(
+        {
+            "$or": [{"hasCode": False}, {"isOfficialCode": {"$ne": True}}],
+            "hasOfficialImpl": {"$ne": False},
+        },
+        {"$set": {"hasOfficialImpl": False}},
+    )
+    return {
+        "hasCode": has_code.modified_count,
+        "hasOfficialImpl": official.modified_count + not_official.modified_count,
+    }
+
+
+async def run_migration():
+    """Run the complete migration process."""
+    logger = setup_logging()
+
+    try:
+        logger.info("🚀 Starting hasOfficialImpl / hasCode backfill migration...")
+        await initialize_async_db()
+
+        logger.info("📦 Step 1: Writing the boolean flags...")
+        modified = await backfill_flags()
+
+        logger.info("🗂️  Step 2: Ensuring indexes (creates the hasOfficialImpl indexes)...")
+        await ensure_db_indexes_async()
+
+        logger.info("✅ Step 3: Verifying migration...")
+        papers_collection = await get_papers_collection_async()
+        missing = await papers_collection.count_documents(
+            {"$or": [{"hasCode": {"$exists": False}}, {"hasOfficialImpl": {"$exists": False}}]}
+        )
+        if missing:
+            logger.error(f"❌ {missing} papers still lack a flag")
+            return False
+
+        logger.info("🧹 Step 4: Clearing cached search pages...")
+        await paper_cache.invalidate_search_results("global")
+
+        logger.info("🎉 Migration completed successfully!")
+        logger.info("📋 Summary:")
+        logger.info(f"  ✅ hasCode written on {modified['hasCode']} papers")
+        logger.info(f"  ✅ hasOfficialImpl written on {modified['hasOfficialImpl']} papers")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"💥 Migration failed: {e}", exc_info=True)
+        return False
+
+
+def main():
+    """Main entry point."""
+    try:
+        success = asyncio.run(run_migration())
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        print("Migration interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Fatal migration error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Backfill papers.venueKey
+
+The venue filter now matches the normalized venueKey exactly (served by the
+venueKey/publicationDate index) instead of running a case-insensitive regex over
+proceeding. This script derives venueKey from proceeding (or the older venue field)
+for every paper whose key is missing or out of date, and creates the index.
+It is safe to re-run.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+
+from pymongo import UpdateOne
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from papers2code_app2.cache import paper_cache
+from papers2code_app2.database import (
+    initialize_async_db,
+    ensure_db_indexes_async,
+    get_papers_collection_async,
+)
+from papers2code_app2.utils.venues import venue_key
+
+BATCH_SIZE = 1000
+
+
+def setup_logging():
+    """Configure logging for the migration."""
+    log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+        ]
+    )
+
+    return logging.getLogger(__name__)
+
+
+async def backfill_venue_keys():
+    """Set venueKey on every paper with a venue; returns (scanned, updated)."""
+    logger = logging.getLogger(__name__)
+    papers_collection = await get_papers_collection_async()
+
+    scanned = 0
+    updated = 0
+    operations = []
+    cursor = papers_collection.find(
+        {"$or": [{"proceeding": {"$nin": [None, ""]}}, {"venue": {"$nin": [None, ""]}}]},
+        {"proceeding": 1, "venue": 1, "venueKey": 1},
+    )
+    async for paper in cursor:
+        scanned += 1
+        key = venue_key(paper.get("proceeding") or paper.get("venue"))
+        if paper.get("venueKey") == key:
+            continue
+        update = {"$set": {"venueKey": key}} if key else {"$unset": {"venueKey": ""}}
+        operations.append(UpdateOne({"_id": paper["_id"]}, update))
+        if len(operations) >= BATCH_SIZE:
+            updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+            logger.info(f"  ... {scanned} papers scanned, {updated} updated")
+    if operations:
+        updated += (await papers_collection.bulk_write(operations, ordered=False)).modified_count
+
+    return scanned, updated
+
+
+async def run_migration():
+    """Run the complete migration process."""
+    logger = setup_logging()
+
+    try:
+        logger.info("🚀 Starting venueKey backfill migration...")
+        await initialize_async_db()
+
+        logger.info("📦 Step 1: Deriving venueKey from proceeding...")
+        scanned, updated = await backfill_venue_keys()
+
+        logger.info("🗂️  Step 2: Ensuring indexes (creates the venueKey index)...")
+        await ensure_db_indexes_async()
+
+        logger.info("🧹 Step 3: Clearing cached venue lists, filter counts and search pages...")
+        await paper_cache.invalidate_metadata_cache("venue_options")
+        await paper_cache.invalidate_metadata_cache("filter_counts")
+        await paper_cache.invalidate_search_results("global")
+
+        logger.info("🎉 Migration completed successfully!")
+        logger.info("📋 Summary:")
+        logger.info(f"  ✅ {scanned} papers with a venue scanned")
+        logger.info(f"  ✅ {updated} papers updated")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"💥 Migration failed: {e}", exc_info=True)
+        return False
+
+
+def main():
+    """Main entry point."""
+    try:
+        success = asyncio.run(run_migration())
+        sys.exit(0 if success else 1)
+    except KeyboardInterrupt:
+        print("Migration interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Fatal migration error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
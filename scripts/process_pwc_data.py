@@ -5,17 +5,24 @@ import polars as pl
 import logging
 import io
 import os
+import sys
 import glob
 import subprocess
 import shutil
 from typing import List, Dict, Any, Optional
 from pymongo import MongoClient
-from pymongo.operations import ReplaceOne
+from pymongo.operations import ReplaceOne, UpdateOne
 from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
 import time # For timing operations
 from tqdm import tqdm
 import certifi  # Use certifi CA bundle for TLS
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from papers2code_app2.utils.venues import venue_key
+from papers2code_app2.utils.authors import author_keys, count_authors
+
 # --- Configuration ---
 LINKS_URL = "https://production-media.paperswithcode.com/about/links-between-papers-and-code.json.gz"
 ABSTRACTS_URL = "https://production-media.paperswithcode.com/about/papers-with-abstracts.json.gz"
@@ -24,6 +31,7 @@ PARQUET_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), "PwC-archive-old_d
 # MongoDB Config
 DB_NAME = "papers2code"
 COLLECTION_NAME = "papers_without_code"
+AUTHORS_COLLECTION_NAME = "authors"  # Normalized author key -> name, paper count
 # Adjust based on testing, RAM, network, and Mongo instance size.
 # Larger batches reduce network round trips but increase memory per batch & Mongo load.
 MONGO_WRITE_BATCH_SIZE = 10000 # Increased, test what works best (e.g., 5k, 10k, 20k)
@@ -214,6 +222,15 @@ def save_lazyframe_to_mongodb_batched(
             for record in batch_df.to_dicts():
                 # Transform keys from snake_case to camelCase for MongoDB
                 transformed = {snake_to_camel(k): v for k, v in record.items()}
+                # Normalized venue for the indexed venue filter
+                key = venue_key(transformed.get("proceeding") or transformed.get("venue"))
+                if key:
+                    transformed["venueKey"] = key
+                # Normalized author names for the exact author filter
+                transformed["authorKeys"] = author_keys(transformed.get("authors"))
+                # Precomputed flags for the indexed code / official implementation filters
+                transformed["hasCode"] = bool(transformed.get("hasCode"))
+                transformed["hasOfficialImpl"] = transformed["hasCode"] and bool(transformed.get("isOfficialCode"))
                 # Basic validation - ensure we have pwcUrl
                 if transformed.get("pwcUrl"):
                     ops_to_add.append(
@@ -285,6 +302,27 @@ def save_lazyframe_to_mongodb_batched(
 
 
 
+def rebuild_authors_collection(client: MongoClient, db_name: str, collection_name: str, batch_size: int = 10000):
+    """
+    Recount the 'authors' collection (normalized author key -> display name, paper count)
+    from every paper in the collection, after a full load has replaced the papers.
+    """
+    db = client[db_name]
+    start = time.time()
+    counts = count_authors(doc.get("authors") for doc in db[collection_name].find({}, {"authors": 1}))
+    authors_collection = db[AUTHORS_COLLECTION_NAME]
+    operations = [
+        UpdateOne({"_id": key}, {"$set": {"name": name, "paperCount": count}}, upsert=True)
+        for key, (name, count) in counts.items()
+    ]
+    for i in range(0, len(operations), batch_size):
+        authors_collection.bulk_write(operations[i:i + batch_size], ordered=False)
+    stale = [doc["_id"] for doc in authors_collection.find({}, {"_id": 1}) if doc["_id"] not in counts]
+    for i in range(0, len(stale), batch_size):
+        authors_collection.delete_many({"_id": {"$in": stale[i:i + batch_size]}})
+    logging.info("Rebuilt authors collection: %d authors, %d removed in %.2fs", len(counts), len(stale), time.time() - start)
+
+
 def find_papers_without_code_polars_lazy(
     papers_with_abstracts_data: List[Dict[str, Any]],
     links_data: List[Dict[str, Any]]
@@ -311,6 +349,7 @@ def find_papers_without_code_polars_lazy(
             "arxivId": pl.Utf8,
             "publicationDate": pl.Datetime,
             "tasks": pl.List(pl.Utf8),
+            "proceeding": pl.Utf8,
             "status": pl.Utf8,
             "isImplementable": pl.Boolean,
             "hasCode": pl.Boolean,
@@ -337,7 +376,8 @@ def find_papers_without_code_polars_lazy(
             pl.col("url_abs").fill_null("").cast(pl.Utf8).alias("urlAbs"),
             pl.col("arxiv_id").fill_null("").cast(pl.Utf8).alias("arxivId"),
             pl.col("date").str.strptime(pl.Datetime, "%Y-%m-%d", strict=False, exact=True).alias("publicationDate"),
-            pl.col("tasks").cast(pl.List(pl.Utf8), strict=False).fill_null([]).alias("tasks")
+            pl.col("tasks").cast(pl.List(pl.Utf8), strict=False).fill_null([]).alias("tasks"),
+            pl.col("proceeding").cast(pl.Utf8).alias("proceeding"),
         ])
         .filter(pl.col("publicationDate").is_not_null())
     )
@@ -590,6 +630,7 @@ def main():
         mongo_batch_size=MONGO_WRITE_BATCH_SIZE,
         polars_batch_size=POLARS_STREAMING_BATCH_SIZE
     )
+    rebuild_authors_collection(mongo_client, DB_NAME, COLLECTION_NAME)
 
     mongo_client.close()
     logging.info("Job finished in %.2fs", time.time() - start_total_time)
@@ -38,7 +38,7 @@ async def main():
     parser.add_argument(
         "task_name",
         type=str,
-        choices=["update_email_statuses", "update_view_analytics"],
+        choices=["update_email_statuses", "update_view_analytics", "reconcile_vote_counters"],
         help="The name of the task to run."
     )
     args = parser.parse_args()
@@ -13,6 +13,8 @@ from pymongo import MongoClient, UpdateOne, InsertOne  # <-- Import UpdateOne, I
 from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
 from scripts.utils_dbkeys import get_pwc_url, snake_to_camel
+from papers2code_app2.utils.venues import venue_key
+from papers2code_app2.utils.authors import author_count_ops, author_keys, count_authors
 import time # For timing operations
 from tqdm import tqdm
 from datetime import datetime, timezone # <-- Import datetime
@@ -27,6 +29,7 @@ DB_NAME = "papers2code"
 # We'll use the existing name for now.
 COLLECTION_NAME = "papers_without_code"
 REMOVED_COLLECTION_NAME = "removed_papers"
+AUTHORS_COLLECTION_NAME = "authors"  # Normalized author key -> name, paper count
 MONGO_WRITE_BATCH_SIZE = 10000  # Adjust batch size as needed
 POLARS_PROCESSING_BATCH_SIZE = 10000 # How many rows Polars processes at once for new papers
 
@@ -94,6 +97,20 @@ def batch_mongo_updates(collection, operations: List[UpdateOne], batch_size: int
     logging.info(f"Finished updates. Total documents modified: {total_modified}")
     return total_modified
 
+def add_inserted_authors(db, author_lists: List[Any], write_errors: Optional[List[Dict[str, Any]]] = None):
+    """
+    Add the authors of a batch of inserted papers to the 'authors' collection counts.
+    ``write_errors`` are the BulkWriteError details of the batch; those papers were not inserted.
+    """
+    failed = {error["index"] for error in write_errors or []}
+    counts = count_authors(authors for i, authors in enumerate(author_lists) if i not in failed)
+    if not counts:
+        return
+    try:
+        db[AUTHORS_COLLECTION_NAME].bulk_write(author_count_ops(counts), ordered=False)
+    except Exception as e:
+        logging.error(f"Failed to update author counts (run scripts/migrate_author_index.py to rebuild): {e}")
+
 def insert_new_papers_batched(
     client: MongoClient,
     db_name: str,
@@ -129,6 +146,7 @@ def insert_new_papers_batched(
     # --- Prepare and Execute Inserts ---
     total_inserted = 0
     mongo_ops_buffer = []
+    authors_buffer = []  # Author list of each buffered insert, for the authors collection
     num_batches = math.ceil(new_papers_df.height / polars_batch_size)
     logging.info(f"Processing {new_papers_df.height} new papers for insertion...")
 
@@ -137,13 +155,24 @@ def insert_new_papers_batched(
             continue
 
         ops_to_add = []
+        authors_to_add = []
         try:
             for record in batch_df.to_dicts():
                 # Normalize incoming record keys to camelCase for storage
                 record = snake_to_camel(record)
+                # Normalized author names for the exact author filter
+                record["authorKeys"] = author_keys(record.get("authors"))
+                # Normalized venue for the indexed venue filter
+                key = venue_key(record.get("proceeding") or record.get("venue"))
+                if key:
+                    record["venueKey"] = key
+                # New papers are papers without code; the flags back indexed filters
+                record.setdefault("hasCode", False)
+                record.setdefault("hasOfficialImpl", False)
                 if get_pwc_url(record): # Basic validation
                     # Use InsertOne for new documents
                     ops_to_add.append(InsertOne(record))
+                    authors_to_add.append(record.get("authors"))
                 else:
                     logging.warning("Skipping new record due to missing 'pwcUrl': %s", record.get('title', 'N/A'))
         except Exception as e:
@@ -151,18 +180,23 @@ def insert_new_papers_batched(
              continue # Skip this batch
 
         mongo_ops_buffer.extend(ops_to_add)
+        authors_buffer.extend(authors_to_add)
 
         # Write to MongoDB when buffer is full
         while len(mongo_ops_buffer) >= mongo_batch_size:
             ops_to_write = mongo_ops_buffer[:mongo_batch_size]
             mongo_ops_buffer = mongo_ops_buffer[mongo_batch_size:]
+            authors_to_write = authors_buffer[:mongo_batch_size]
+            authors_buffer = authors_buffer[mongo_batch_size:]
             try:
                 result = collection.bulk_write(ops_to_write, ordered=False)
                 inserted_count = result.inserted_count
                 total_inserted += inserted_count
+                add_inserted_authors(db, authors_to_write)
                 logging.debug(f"Insert Batch: Inserted {inserted_count} new papers.")
             except BulkWriteError as bwe:
                 logging.error(f"Insert BulkWriteError: {bwe.details}")
+                add_inserted_authors(db, authors_to_write, bwe.details.get("writeErrors"))
                 # Optionally log which documents failed if needed
             except Exception as e:
                 logging.error(f"Generic insert error: {e}")
@@ -173,9 +207,11 @@ def insert_new_papers_batched(
             result = collection.bulk_write(mongo_ops_buffer, ordered=False)
             inserted_count = result.inserted_count
             total_inserted += inserted_count
+            add_inserted_authors(db, authors_buffer)
             logging.debug(f"Final Insert Batch: Inserted {inserted_count} new papers.")
         except BulkWriteError as bwe:
             logging.error(f"Final Insert BulkWriteError: {bwe.details}")
+            add_inserted_authors(db, authors_buffer, bwe.details.get("writeErrors"))
         except Exception as e:
             logging.error(f"Final generic insert error: {e}")
 
@@ -245,6 +281,10 @@ def main_update():
     # --- Step 1: Update papers that gained code ---
     logging.info("Step 1: Checking for existing papers that gained code...")
     papers_with_code_urls: Set[str] = {link['paper_url'] for link in links_data if link.get('paper_url')}
+    official_code_urls: Set[str] = {
+        link['paper_url'] for link in links_data
+        if link.get('paper_url') and (link.get('is_official') or link.get('official'))
+    }
     logging.info(f"Found {len(papers_with_code_urls)} papers with code links in the latest data.")
 
     # Find papers currently marked as needing code. We'll fetch both key names for compatibility
@@ -271,6 +311,8 @@ def main_update():
                 {"_id": paper['_id']},
                 {"$set": {
                     "status": "Official Code Posted", # Or your preferred status
+                    "hasCode": True,
+                    "hasOfficialImpl": paper_url in official_code_urls,
                     "lastUpdated": datetime.now(timezone.utc)
                  }
                 }
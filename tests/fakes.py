@@ -0,0 +1,88 @@
+"""
+In-memory stand-ins for the papers and user_actions collections, for tests of services that
+read them. Each test supplies its own documents and, for ``aggregate``, a function standing in
+for its pipeline's ``$group`` stage.
+"""
+from types import SimpleNamespace
+
+_MISSING = object()
+
+
+class AsyncIter:
+    def __init__(self, items):
+        self.items = list(items)
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for item in self.items:
+            yield item
+
+
+def _matches(doc, query):
+    """``$and``, equality, ``$in`` and ``$exists`` conditions, which is all the services under test use"""
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(_matches(doc, sub_query) for sub_query in condition):
+                return False
+            continue
+        value = doc.get(field, _MISSING)
+        if isinstance(condition, dict):
+            if "$exists" in condition and (value is not _MISSING) != condition["$exists"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeActions:
+    def __init__(self, actions, group):
+        self.actions = actions
+        self.group = group
+
+    async def count_documents(self, query, limit=0, session=None):
+        return sum(1 for action in self.actions if _matches(action, query))
+
+    async def aggregate(self, pipeline, **kwargs):
+        return AsyncIter(self.group(self.actions))
+
+
+class FakePapers:
+    def __init__(self, papers):
+        self.papers = {p["_id"]: p for p in papers}
+
+    def find(self, query, projection=None):
+        return AsyncIter(dict(p) for p in self.papers.values() if _matches(p, query))
+
+    async def find_one(self, query, projection=None):
+        paper = self.papers.get(query["_id"])
+        return dict(paper) if paper else None
+
+    async def update_one(self, query, update, session=None):
+        paper = self.papers[query["_id"]]
+        paper.update(update.get("$set", {}))
+        for field, value in update.get("$pull", {}).items():
+            paper[field] = [v for v in paper.get(field, []) if v != value]
+        for field in update.get("$unset", {}):
+            paper.pop(field, None)
+        return SimpleNamespace(matched_count=1)
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            self.papers[op._filter["_id"]].update(op._doc["$set"])
+        return SimpleNamespace(modified_count=len(operations))
+
+
+def install_collections(monkeypatch, module, papers, actions):
+    """Make ``module``'s collection getters return the fakes"""
+    async def get_papers():
+        return papers
+
+    async def get_actions():
+        return actions
+
+    monkeypatch.setattr(module, "get_papers_collection_async", get_papers)
+    monkeypatch.setattr(module, "get_user_actions_collection_async", get_actions)
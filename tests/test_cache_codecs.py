@@ -0,0 +1,93 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.cache import codecs
+from papers2code_app2.cache.codecs import CacheCodec, CodecError, available_codecs, available_compressions
+
+INSTALLED_CODECS = [name for name, ok in available_codecs().items() if ok]
+INSTALLED_COMPRESSIONS = [name for name, ok in available_compressions().items() if ok]
+
+
+def _page():
+    return {
+        "fresh_until": 1700000000.5,
+        "data": {
+            "papers": [
+                {
+                    "_id": ObjectId(),
+                    "title": "Attention Is All You Need",
+                    "publicationDate": datetime(2017, 6, 12, 8, 30, 15, 123000),  # naive UTC, as PyMongo returns
+                    "lastUpdated": datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+                    "score": Decimal128("0.125"),
+                    "abstract": "The dominant sequence transduction models " * 40,
+                    "tasks": ["Machine Translation"],
+                    "upvoteCount": 12,
+                    "hasCode": True,
+                    "venue": None,
+                }
+            ],
+            "total_count": 1,
+        },
+    }
+
+
+@pytest.mark.parametrize("codec", INSTALLED_CODECS)
+@pytest.mark.parametrize("compression", INSTALLED_COMPRESSIONS)
+def test_codecs_round_trip_bson_types_exactly(codec, compression):
+    page = _page()
+    decoded = CacheCodec(codec, compression).decode(CacheCodec(codec, compression).encode(page))
+
+    assert decoded == page
+    paper = decoded["data"]["papers"][0]
+    assert isinstance(paper["_id"], ObjectId)
+    assert paper["publicationDate"].tzinfo is None
+    assert paper["lastUpdated"].tzinfo is not None
+
+
+def test_any_codec_reads_values_written_by_another():
+    page = _page()
+    writers = [CacheCodec(codec, compression) for codec in INSTALLED_CODECS for compression in INSTALLED_COMPRESSIONS]
+    reader = CacheCodec("json", "none")
+
+    for writer in writers:
+        assert reader.decode(writer.encode(page)) == page
+
+
+def test_small_payloads_are_not_compressed():
+    if INSTALLED_COMPRESSIONS == ["none"]:
+        pytest.skip("no compression library installed")
+    codec = CacheCodec("json", INSTALLED_COMPRESSIONS[-1], compress_min_bytes=1024)
+
+    small = codec.encode(["nlp", "vision"])
+    assert small.endswith(b'["nlp","vision"]')
+    assert len(codec.encode(_page())) < len(CacheCodec("json", "none").encode(_page()))
+
+
+def test_legacy_json_and_garbage_payloads():
+    codec = CacheCodec()
+
+    assert codec.decode(b'{"papers": [], "total_count": 0}') == {"papers": [], "total_count": 0}
+    with pytest.raises(CodecError):
+        codec.decode(b"\x01\x63\x00payload")  # current format version, unknown codec id
+    with pytest.raises(ValueError):
+        CacheCodec("pickle")
+
+
+def test_missing_codec_library_falls_back_with_a_warning(monkeypatch, caplog):
+    monkeypatch.setitem(codecs._SERIALIZER_AVAILABLE, "msgpack", False)
+    monkeypatch.setitem(codecs._COMPRESSOR_AVAILABLE, "zstd", False)
+
+    with caplog.at_level("WARNING", logger=codecs.__name__):
+        codec = CacheCodec("msgpack", "zstd")
+
+    assert codec.name == "json+none"
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 2 and all("'cache' extra" in message for message in warnings)
@@ -0,0 +1,167 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.cache import InMemoryCache, PaperSearchCache
+from papers2code_app2.services import cache_warmer as cache_warmer_module
+from papers2code_app2.services.cache_warmer import CacheWarmer, QueryLogRecorder
+from papers2code_app2.services.paper_view_service import PaperViewService
+from papers2code_app2.shared import config_settings
+
+
+def _params(**overrides):
+    params = dict(CacheWarmer.DEFAULT_QUERIES[0])
+    params.update(overrides)
+    return params
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+    monkeypatch.setattr(cache_warmer_module, "paper_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def warmed(monkeypatch):
+    """Records the parameter sets the warmer runs instead of querying MongoDB"""
+    calls = []
+
+    async def fake_get_papers_list(self, record_usage=True, **params):
+        assert record_usage is False
+        calls.append(params)
+        return [], 0
+
+    monkeypatch.setattr(PaperViewService, "get_papers_list", fake_get_papers_list)
+    return calls
+
+
+def test_recorder_ranks_by_frequency_and_stays_bounded():
+    recorder = QueryLogRecorder(max_entries=2)
+    for _ in range(3):
+        recorder.record(_params(search_query="gan"))
+    recorder.record(_params(search_query="bert"))
+    recorder.record(_params(search_query="vit"))  # evicts the least used entry
+    recorder.record(_params(contributor_id="u1"))  # per-user sets are never recorded
+
+    assert [p["search_query"] for p in recorder.top(5)] == ["gan", "vit"]
+
+    recorder.decay()
+    recorder.decay()
+    assert [p["search_query"] for p in recorder.top(5)] == ["gan"]
+
+
+def test_recorder_decays_on_wall_clock_interval(monkeypatch):
+    monkeypatch.setattr(config_settings, "CACHE_WARM_DECAY_INTERVAL", 60.0)
+    recorder = QueryLogRecorder()
+    start = recorder._last_decay
+    for _ in range(4):
+        recorder.record(_params(search_query="gan"))
+    recorder.record(_params(search_query="bert"))
+
+    # However many warm runs happen within an interval, counts are left alone
+    assert not recorder.decay_if_due(start + 30)
+    assert not recorder.decay_if_due(start + 59)
+    assert [p["search_query"] for p in recorder.top(5)] == ["gan", "bert"]
+
+    assert recorder.decay_if_due(start + 61)  # 4 -> 2, 1 -> 0.5
+    assert [p["search_query"] for p in recorder.top(5)] == ["gan", "bert"]
+    assert not recorder.decay_if_due(start + 90)
+
+    assert recorder.decay_if_due(start + 185)  # two more intervals: 2 -> 0.5, bert fades out
+    assert [p["search_query"] for p in recorder.top(5)] == ["gan"]
+
+
+@pytest.mark.asyncio
+async def test_warm_respects_query_budget_and_persists_popular_queries(cache, warmed, monkeypatch):
+    monkeypatch.setattr(config_settings, "CACHE_WARM_TOP_N", 8)
+    recorder = QueryLogRecorder()
+    for query in ("gan", "gan", "bert"):
+        recorder.record(_params(search_query=query))
+    warmer = CacheWarmer(recorder)
+
+    result = await warmer.warm()
+
+    assert result["warmed"] == len(warmed) == 8
+    assert warmed[:6] == CacheWarmer.DEFAULT_QUERIES
+    assert [p["search_query"] for p in warmed[6:]] == ["gan", "bert"]
+    assert [p["search_query"] for p in await cache.get_warm_queries()] == ["gan", "bert"]
+
+
+@pytest.mark.asyncio
+async def test_warm_after_dimension_roll_skips_unaffected_pages(cache, warmed):
+    recorder = QueryLogRecorder()
+    recorder.record(_params(main_status="Completed"))
+    warmer = CacheWarmer(recorder)
+
+    await warmer.warm({"status"})
+
+    assert warmed == [_params(main_status="Completed")]
+
+
+@pytest.mark.asyncio
+async def test_warm_stops_starting_queries_past_the_time_budget(cache, monkeypatch):
+    monkeypatch.setattr(config_settings, "CACHE_WARM_CONCURRENCY", 1)
+    monkeypatch.setattr(config_settings, "CACHE_WARM_TIME_BUDGET", 0.05)
+
+    async def slow_get_papers_list(self, record_usage=True, **params):
+        await asyncio.sleep(0.1)
+        return [], 0
+
+    monkeypatch.setattr(PaperViewService, "get_papers_list", slow_get_papers_list)
+
+    result = await CacheWarmer(QueryLogRecorder()).warm()
+
+    assert result["warmed"] == 1
+    assert result["skipped"] == len(CacheWarmer.DEFAULT_QUERIES) - 1
+
+
+@pytest.mark.asyncio
+async def test_generation_roll_triggers_a_debounced_warm(cache, warmed, monkeypatch):
+    monkeypatch.setattr(config_settings, "CACHE_WARM_ENABLED", True)
+    monkeypatch.setattr(config_settings, "CACHE_WARM_DEBOUNCE", 0.01)
+    warmer = CacheWarmer(QueryLogRecorder())
+    warmer.start()
+    await warmer._task  # startup warm
+    warmed.clear()
+
+    await cache.invalidate_search_results("upvotes")
+    await cache.invalidate_search_results("global")
+    await warmer._task
+
+    assert warmer.runs == 2
+    assert warmer.last_run["dimensions"] == ["global"]
+    assert warmed == CacheWarmer.DEFAULT_QUERIES
+    await warmer.stop()
+
+
+@pytest.mark.asyncio
+async def test_generation_roll_during_a_warm_gets_another_pass(cache, monkeypatch):
+    monkeypatch.setattr(config_settings, "CACHE_WARM_ENABLED", True)
+    monkeypatch.setattr(config_settings, "CACHE_WARM_DEBOUNCE", 0.01)
+    calls = []
+
+    async def fake_get_papers_list(self, record_usage=True, **params):
+        calls.append(params)
+        if len(calls) == 1:
+            # A vote lands while the startup warm is running
+            await cache.invalidate_search_results("upvotes")
+        return [], 0
+
+    monkeypatch.setattr(PaperViewService, "get_papers_list", fake_get_papers_list)
+    warmer = CacheWarmer(QueryLogRecorder())
+    warmer.start()
+    await warmer._task
+
+    assert warmer.runs == 2
+    assert warmer.last_run["dimensions"] == ["upvotes"]
+    upvote_pages = [p for p in CacheWarmer.DEFAULT_QUERIES if p["sort_by"] == "upvotes"]
+    assert calls[len(CacheWarmer.DEFAULT_QUERIES):] == upvote_pages
+    await warmer.stop()
@@ -0,0 +1,135 @@
+"""
+Tests for the in-process search index: the memory-mapped segment format, BM25 ranking with
+the title boost, filters, and the in-memory overlay that tracks writes between rebuilds.
+"""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from papers2code_app2.search import LocalSearchIndex, Segment, SegmentWriter, tokenize
+from papers2code_app2.search.segment import NO_DATE
+
+
+def _paper(title, abstract="", authors=None, status="Not Started", tasks=None, date=datetime(2023, 1, 1)):
+    return {
+        "_id": ObjectId(),
+        "title": title,
+        "abstract": abstract,
+        "authors": authors or [],
+        "status": status,
+        "tasks": tasks or [],
+        "publicationDate": date,
+    }
+
+
+@pytest.fixture
+def papers():
+    return [
+        _paper("Attention is all you need", "We propose the transformer, based on attention.",
+               ["Ashish Vaswani", "Noam Shazeer"], tasks=["Machine Translation"], date=datetime(2017, 6, 12)),
+        _paper("Deep residual learning", "Residual networks ease training; attention is not used.",
+               ["Kaiming He"], status="Completed", tasks=["Image Classification"], date=datetime(2015, 12, 10)),
+        _paper("Graph networks", "Message passing over graphs with attention heads.",
+               ["Peter Battaglia"], tasks=["Graph Classification", "Machine Translation"], date=datetime(2018, 6, 4)),
+        _paper("Untitled preprint", "No date on this one.", ["Anonymous"], date=None),
+    ]
+
+
+@pytest.fixture
+def index(tmp_path, papers):
+    path = str(tmp_path / "papers.seg")
+    writer = SegmentWriter()
+    writer.add_many(papers)
+    writer.write(path)
+    local_index = LocalSearchIndex(path)
+    local_index.load()
+    yield local_index
+    local_index.segment.close()
+    if local_index._retired is not None:
+        local_index._retired.close()
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The Transformer: attention-based, for NLP_tasks!") == ["transformer", "attention", "based", "nlp", "tasks"]
+    assert tokenize(None) == []
+
+
+def test_segment_round_trip(tmp_path, papers):
+    path = str(tmp_path / "papers.seg")
+    writer = SegmentWriter()
+    writer.add_many(papers)
+    header = writer.write(path)
+
+    segment = Segment(path)
+    try:
+        assert segment.doc_count == header["doc_count"] == 4
+        assert [segment.doc_id(i) for i in range(4)] == [p["_id"] for p in papers]
+        assert segment.doc_index(papers[2]["_id"]) == 2
+        assert segment.doc_index(ObjectId()) is None
+        assert segment.doc_dates[3] == NO_DATE
+
+        postings = segment.postings("attention")
+        assert list(postings.docs) == [0, 1, 2]
+        assert list(postings.tfs[0]) == [1, 0, 0]  # title
+        assert list(postings.tfs[1]) == [1, 1, 1]  # abstract
+        assert segment.postings("missing") is None
+        assert [segment.tags[t] for t in segment.doc_tags(2)] == ["Graph Classification", "Machine Translation"]
+    finally:
+        segment.close()
+
+
+def test_writer_requires_ascending_ids(papers):
+    writer = SegmentWriter()
+    writer.add(papers[1])
+    with pytest.raises(ValueError):
+        writer.add(papers[0])
+
+
+def test_title_matches_rank_first(index, papers):
+    hits = index.search("attention")
+    assert [hit.paper_id for hit in hits][0] == papers[0]["_id"]
+    assert {hit.paper_id for hit in hits} == {p["_id"] for p in papers[:3]}
+
+
+def test_filters(index, papers):
+    assert [h.paper_id for h in index.search("attention", status="Completed")] == [papers[1]["_id"]]
+    assert {h.paper_id for h in index.search("attention", tags=["Machine Translation"])} == {papers[0]["_id"], papers[2]["_id"]}
+    assert [h.paper_id for h in index.search("attention", start_date=datetime(2018, 1, 1))] == [papers[2]["_id"]]
+    assert [h.paper_id for h in index.search("attention", end_date=datetime(2015, 12, 10))] == [papers[1]["_id"]]
+
+
+def test_author_search_requires_every_author_term(index, papers):
+    assert [h.paper_id for h in index.search(None, author="Kaiming He")] == [papers[1]["_id"]]
+    assert index.search(None, author="Kaiming Vaswani") == []
+    assert [h.paper_id for h in index.search("attention", author="vaswani")] == [papers[0]["_id"]]
+
+
+def test_overlay_tracks_inserts_updates_and_removals(index, papers):
+    new_paper = _paper("Sparse attention transformers", "Attention over long sequences.", ["Rewon Child"])
+    index.add_paper(new_paper)
+    assert new_paper["_id"] in {h.paper_id for h in index.search("sparse")}
+
+    index.update_paper(str(papers[0]["_id"]), {"status": "Completed"})
+    completed = {h.paper_id for h in index.search("attention", status="Completed")}
+    assert completed == {papers[0]["_id"], papers[1]["_id"]}
+
+    index.update_paper(str(new_paper["_id"]), {"upvoteCount": 3})  # Not indexed; ignored
+    index.remove_paper(papers[1]["_id"])
+    assert papers[1]["_id"] not in {h.paper_id for h in index.search("attention")}
+
+
+def test_reload_keeps_only_overlay_papers_newer_than_the_segment(index, papers, tmp_path):
+    inserted = _paper("Sparse attention transformers")
+    index.add_paper(inserted)
+    index.remove_paper(papers[1]["_id"])
+
+    # A rebuild that already contains the inserted paper supersedes the overlay
+    writer = SegmentWriter()
+    writer.add_many([*papers, inserted])
+    writer.write(index.path)
+    index.load()
+
+    assert index.stats()["overlay_docs"] == 0
+    assert index.stats()["hidden_docs"] == 0
+    assert inserted["_id"] in {h.paper_id for h in index.search("sparse")}
@@ -0,0 +1,82 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.utils.pagination import decode_cursor, encode_cursor, parse_cursor, sort_spec
+
+
+def _sort_key(value):
+    # MongoDB orders null/missing before any other value
+    return (value is not None, value if value is not None else 0)
+
+
+def _matches(doc, condition):
+    """Evaluate the subset of the query language keyset filters use"""
+    for key, expected in condition.items():
+        if key == "$or":
+            if not any(_matches(doc, branch) for branch in expected):
+                return False
+            continue
+        actual = doc.get(key)
+        if isinstance(expected, dict):
+            for op, operand in expected.items():
+                if op == "$ne":
+                    if actual == operand:
+                        return False
+                elif actual is None or (op == "$lt" and not actual < operand) or (op == "$gt" and not actual > operand):
+                    return False
+        elif actual != expected:
+            return False
+    return True
+
+
+def _paginate(docs, sort_by, sort_order, limit):
+    field, direction = sort_spec(sort_by, sort_order)
+    ordered = sorted(docs, key=lambda d: (_sort_key(d.get(field)), d["_id"]), reverse=direction < 0)
+    seen, cursor = [], None
+    while True:
+        keyset = parse_cursor(cursor, sort_by, sort_order)
+        page = [d for d in ordered if keyset is None or _matches(d, keyset)][:limit]
+        seen.extend(page)
+        if len(page) < limit:
+            return ordered, seen
+        cursor = encode_cursor(page[-1], sort_by, sort_order)
+
+
+@pytest.mark.parametrize("sort_by,sort_order", [
+    ("newest", "desc"), ("oldest", "asc"), ("upvotes", "desc"), ("upvotes", "asc"), ("title", "asc"), ("title", "desc"),
+])
+def test_cursor_pages_visit_every_paper_once_in_order(sort_by, sort_order):
+    docs = []
+    for i in range(23):
+        docs.append({
+            "_id": ObjectId(),
+            "publicationDate": datetime(2020, 1, 1 + i % 5),
+            # Ties and missing values exercise the _id tiebreaker and the null branches
+            "upvoteCount": None if i % 7 == 0 else i % 4,
+            "title": f"Paper {i % 6}",
+        })
+
+    ordered, seen = _paginate(docs, sort_by, sort_order, limit=5)
+
+    assert [d["_id"] for d in seen] == [d["_id"] for d in ordered]
+
+
+def test_cursor_round_trips_and_rejects_a_different_sort():
+    paper = {"_id": ObjectId(), "publicationDate": datetime(2021, 5, 4, 3, 2, 1)}
+    cursor = encode_cursor(paper, "newest", "desc")
+
+    value, last_id = decode_cursor(cursor, "newest", "desc")
+    assert last_id == paper["_id"]
+    assert value.replace(tzinfo=None) == paper["publicationDate"]
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "upvotes", "desc")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "newest", "desc")
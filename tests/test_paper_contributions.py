@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.services import paper_contributions
+from tests.fakes import FakeActions, FakePapers, install_collections
+
+PAPER, OTHER_PAPER, GONE_PAPER = ObjectId(), ObjectId(), ObjectId()
+ALICE, BOB = ObjectId(), ObjectId()
+
+
+def _group_contributors(actions):
+    """The rebuild pipeline's $group: the distinct users per paper"""
+    groups = {}
+    for a in actions:
+        groups.setdefault(a["paperId"], set()).add(a["userId"])
+    return [{"_id": pid, "userIds": list(uids)} for pid, uids in groups.items()]
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    papers = FakePapers([
+        {"_id": PAPER, "contributorIds": [ALICE, BOB]},
+        {"_id": OTHER_PAPER},
+        {"_id": GONE_PAPER, "contributorIds": [BOB]},
+    ])
+    actions = FakeActions([
+        {"userId": ALICE, "paperId": PAPER},
+        # Older actions stored the paper id as a string
+        {"userId": BOB, "paperId": str(OTHER_PAPER)},
+        {"userId": ALICE, "paperId": OTHER_PAPER},
+    ], _group_contributors)
+    install_collections(monkeypatch, paper_contributions, papers, actions)
+    return papers, actions
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_a_contributor_until_their_last_action_is_gone(collections):
+    papers, actions = collections
+
+    await paper_contributions.sync_contributor(PAPER, ALICE)
+    assert papers.papers[PAPER]["contributorIds"] == [ALICE, BOB]
+
+    actions.actions = [a for a in actions.actions if a["paperId"] != PAPER]
+    await paper_contributions.sync_contributor(PAPER, ALICE)
+    assert papers.papers[PAPER]["contributorIds"] == [BOB]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_recomputes_sets_from_user_actions(collections):
+    papers, _ = collections
+
+    summary = await paper_contributions.rebuild_contributor_ids()
+
+    assert summary["papers_with_contributors"] == 2
+    assert summary["cleared"] == 1
+    assert papers.papers[PAPER]["contributorIds"] == [ALICE]
+    assert set(papers.papers[OTHER_PAPER]["contributorIds"]) == {ALICE, BOB}
+    assert "contributorIds" not in papers.papers[GONE_PAPER]
@@ -0,0 +1,84 @@
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import bson
+import pytest
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.utils import transform_papers_batch
+from papers2code_app2.utils.paper_json import encode_paper_page
+from papers2code_app2.utils.serialization import PAPER_PAGE_ADAPTER, construct_paper_page
+
+PAGE_FIELDS = {
+    "total_count": 3, "count_capped": False, "page": 1, "page_size": 20,
+    "has_more": False, "next_cursor": "abc", "facets": {"status": {"Completed": 1}},
+}
+
+
+def _papers():
+    return [
+        {
+            "_id": ObjectId(),
+            "title": "Attention Is All You Need",
+            "abstract": "Transformers, naïvely explained.",
+            "authors": ["Ashish Vaswani", "Noam Shazeer"],
+            "publicationDate": datetime(2017, 6, 12),
+            "upvoteCount": 42,
+            "status": "Completed",
+            "urlGithub": "https://github.com",
+            "urlAbs": "https://arxiv.org/abs/1706.03762",
+            "urlPdf": "  ",
+            "hasCode": True,
+            "venue": "NeurIPS",
+            "tasks": ["Machine Translation"],
+            "implementabilityStatus": "voting",
+            "isImplementableVotes": 3,
+            "nonImplementableVotes": 1,
+            "pwcUrl": "https://paperswithcode.com/paper/attention",
+            "arxivId": "1706.03762",
+        },
+        {
+            "_id": ObjectId(),
+            "title": "Aware dates and author objects",
+            "authors": [{"name": "Kaiming He"}, {"affiliation": "no name"}],
+            "publicationDate": datetime(2016, 1, 1, 12, 30, 0, 500000, tzinfo=timezone.utc),
+            "status": "Not Implementable",
+            "implementabilityStatus": "Admin Not Implementable",
+        },
+        {"_id": ObjectId()},
+    ]
+
+
+async def _regular_page(papers):
+    """The body the list endpoint sends without the fast path"""
+    transformed = await transform_papers_batch(papers, None, detail_level="full")
+    return PAPER_PAGE_ADAPTER.dump_json(construct_paper_page(transformed, **PAGE_FIELDS), by_alias=True, warnings=False)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_the_regular_response():
+    papers = _papers()
+    assert encode_paper_page(papers, PAGE_FIELDS) == await _regular_page(papers)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_reads_raw_bson_documents():
+    papers = _papers()
+    raw_options = CodecOptions(document_class=RawBSONDocument)
+    raw_papers = [bson.decode(bson.encode(paper), codec_options=raw_options) for paper in papers]
+    # Naive datetimes, as PyMongo returns them by default
+    papers[1]["publicationDate"] = papers[1]["publicationDate"].replace(tzinfo=None, microsecond=500000)
+
+    assert encode_paper_page(raw_papers, PAGE_FIELDS) == await _regular_page(papers)
+
+
+def test_urls_are_sent_as_stored():
+    body = json.loads(encode_paper_page([{"_id": ObjectId(), "urlGithub": "https://github.com", "urlPdf": " "}], PAGE_FIELDS))
+    assert (body["papers"][0]["urlGithub"], body["papers"][0]["urlPdf"]) == ("https://github.com", None)
@@ -0,0 +1,531 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.cache import InMemoryCache, PaperSearchCache
+from papers2code_app2.cache.single_flight import SingleFlight
+
+
+def _page(*paper_ids, status="Not Started"):
+    return {
+        "papers": [{"_id": pid, "title": f"Paper {pid}", "status": status} for pid in paper_ids],
+        "total_count": len(paper_ids),
+    }
+
+
+@pytest.fixture
+def cache():
+    cache = PaperSearchCache()
+    # Force the in-process backend regardless of the local REDIS_URL
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_cache_round_trip(cache):
+    await cache.cache_result(_page("a", "b"), sort_by="newest", skip=0, limit=20)
+
+    cached = await cache.get_cached_result(sort_by="newest", skip=0, limit=20)
+    assert cached == _page("a", "b")
+    assert await cache.get_cached_result(sort_by="newest", skip=20, limit=20) is None
+
+
+@pytest.mark.asyncio
+async def test_global_invalidation_rolls_every_page(cache):
+    await cache.cache_result(_page("a", "b"), sort_by="newest", skip=0, limit=20)
+    await cache.cache_result(_page("b", "c"), sort_by="upvotes", skip=0, limit=20)
+
+    old_key = await cache.get_search_key(sort_by="newest", skip=0, limit=20)
+
+    await cache.invalidate_search_results()
+
+    assert await cache.get_cached_result(sort_by="newest", skip=0, limit=20) is None
+    assert await cache.get_cached_result(sort_by="upvotes", skip=0, limit=20) is None
+    # Nothing is rewritten: superseded pages are left to expire on their TTL
+    assert await cache.backend.get(old_key) is not None
+
+
+@pytest.mark.asyncio
+async def test_dimension_invalidation_only_affects_dependent_pages(cache):
+    await cache.cache_result(_page("a"), sort_by="newest", main_status="Not Started")
+    await cache.cache_result(_page("b"), sort_by="newest")
+
+    await cache.invalidate_search_results("status")
+
+    assert await cache.get_cached_result(sort_by="newest", main_status="Not Started") is None
+    assert await cache.get_cached_result(sort_by="newest") == _page("b")
+
+    with pytest.raises(ValueError):
+        await cache.invalidate_search_results("nonexistent")
+
+
+@pytest.mark.asyncio
+async def test_page_computed_before_invalidation_is_never_served(cache):
+    key = await cache.get_search_key(sort_by="newest")
+    await cache.invalidate_search_results()
+    # A slow query finishes after the bump and writes under the key it resolved earlier
+    await cache.cache_page(key, _page("stale"))
+
+    assert await cache.get_cached_result(sort_by="newest") is None
+
+
+@pytest.mark.asyncio
+async def test_patch_touches_only_pages_holding_the_paper(cache):
+    await cache.cache_result(_page("a", "b"), sort_by="newest", skip=0, limit=20)
+    await cache.cache_result(_page("c"), sort_by="title", skip=0, limit=20)
+
+    patched = await cache.patch_paper_in_cache("b", {"isImplementableVotes": 3})
+
+    newest = await cache.get_cached_result(sort_by="newest", skip=0, limit=20)
+    assert patched == 1
+    assert newest["papers"][1]["isImplementableVotes"] == 3
+    assert "isImplementableVotes" not in newest["papers"][0]
+    assert await cache.get_cached_result(sort_by="title", skip=0, limit=20) == _page("c")
+
+
+@pytest.mark.asyncio
+async def test_patch_invalidates_pages_filtered_by_the_field(cache):
+    await cache.cache_result(_page("a", "b"), sort_by="newest")
+    await cache.cache_result(_page("b", "a"), sort_by="upvotes")
+    await cache.cache_result(_page("b"), sort_by="newest", main_status="Not Started")
+
+    await cache.patch_paper_in_cache("b", {"upvoteCount": 7})
+
+    newest = await cache.get_cached_result(sort_by="newest")
+    assert newest["papers"][1]["upvoteCount"] == 7
+    # Votes patch upvote-sorted pages in place rather than rolling them
+    assert (await cache.get_cached_result(sort_by="upvotes"))["papers"][0]["upvoteCount"] == 7
+    assert await cache.get_cached_result(sort_by="newest", main_status="Not Started") is not None
+
+    await cache.update_paper_in_cache("b", "Started")
+
+    assert (await cache.get_cached_result(sort_by="newest"))["papers"][1]["status"] == "Started"
+    assert await cache.get_cached_result(sort_by="newest", main_status="Not Started") is None
+
+
+class _YieldingCache(InMemoryCache):
+    """Lets other tasks run between a patch's read and its write"""
+
+    async def mget(self, keys):
+        values = await super().mget(keys)
+        await asyncio.sleep(0)
+        return values
+
+
+@pytest.mark.asyncio
+async def test_concurrent_patches_of_one_page_both_apply(cache):
+    cache.backend = _YieldingCache()
+    await cache.cache_result(_page("a", "b"), sort_by="newest")
+
+    await asyncio.gather(
+        cache.patch_paper_in_cache("a", {"isImplementableVotes": 5}),
+        cache.patch_paper_in_cache("b", {"isImplementableVotes": 7}),
+    )
+
+    papers = (await cache.get_cached_result(sort_by="newest"))["papers"]
+    assert [paper["isImplementableVotes"] for paper in papers] == [5, 7]
+
+
+@pytest.mark.asyncio
+async def test_patch_prunes_expired_pages_from_reverse_index(cache):
+    await cache.cache_result(_page("a"), sort_by="newest")
+    page_key = await cache.get_search_key(sort_by="newest")
+    await cache.backend.delete(page_key)
+
+    assert await cache.patch_paper_in_cache("a", {"nonImplementableVotes": 1}) == 0
+    assert await cache.backend.smembers(cache._paper_index_key("a")) == []
+
+
+def test_changed_fields_only_reports_patchable_differences():
+    before = {"_id": "a", "status": "Not Started", "upvoteCount": 1, "title": "Old"}
+    after = {"_id": "a", "status": "Not Started", "upvoteCount": 2, "title": "New"}
+
+    assert PaperSearchCache.changed_fields(before, after) == {"upvoteCount": 2}
+    assert PaperSearchCache.changed_fields(None, after) == {}
+
+
+@pytest.mark.asyncio
+async def test_generations_survive_lru_eviction():
+    backend = InMemoryCache(max_entries=1)
+    await backend.incr("gen")
+    await backend.setex("a", 60, "1")
+    await backend.setex("b", 60, "2")
+
+    assert await backend.get_counters(["gen", "missing"]) == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_counters_with_ttl_expire_and_guard_writes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("papers2code_app2.cache.backends.time.monotonic", lambda: clock[0])
+    backend = InMemoryCache()
+    assert await backend.incr("ver", ttl=5) == 1
+
+    assert not await backend.setex_if_counter("k", 60, "stale", "ver", 0)
+    assert await backend.setex_if_counter("k", 60, "fresh", "ver", 1)
+    assert await backend.get("k") == "fresh"
+
+    clock[0] += 10
+    await backend.setex("other", 60, "x")  # writes reclaim expired wheel slots
+    assert "ver" not in backend._counters
+    assert await backend.get_counters(["ver"]) == [0]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_metadata_cache(cache):
+    await cache.set_cached_metadata("tags", ["nlp", "vision"])
+    await cache.set_cached_metadata("venue_options", ["CVPR"])
+
+    await cache.invalidate_metadata_cache("tags")
+    assert await cache.get_cached_metadata("tags") is None
+    assert await cache.get_cached_metadata("venue_options") == ["CVPR"]
+
+    await cache.invalidate_metadata_cache()
+    assert await cache.get_cached_metadata("venue_options") is None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_memory(monkeypatch):
+    cache = PaperSearchCache()
+
+    class _DeadRedis:
+        async def ping(self):
+            raise ConnectionError("connection refused")
+
+        async def close(self):
+            return None
+
+    cache._redis_backend = _DeadRedis()
+    cache._backend_ready = False
+
+    await cache.cache_result(_page("a"), sort_by="newest")
+    assert isinstance(cache.backend, InMemoryCache)
+    assert await cache.get_cached_result(sort_by="newest") == _page("a")
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    backend = InMemoryCache(max_entries=2)
+    await backend.setex("a", 60, "1")
+    await backend.setex("b", 60, "2")
+    await backend.get("a")  # "b" is now the least recently used entry
+    await backend.setex("c", 60, "3")
+
+    assert await backend.mget(["a", "b", "c"]) == ["1", None, "3"]
+    assert backend.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_respects_byte_cap():
+    backend = InMemoryCache(max_entries=100, max_bytes=600)
+    await backend.setex("big", 60, "x" * 1000)  # larger than the whole cache: skipped
+    for i in range(10):
+        await backend.setex(f"k{i}", 60, "y" * 100)
+
+    stats = backend.stats()
+    assert await backend.get("big") is None
+    assert stats["current_bytes"] <= 600
+    assert stats["evictions"] > 0
+    assert await backend.get("k9") is not None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_byte_cap_counts_set_members():
+    backend = InMemoryCache(max_entries=1000, max_bytes=200_000)
+    page_keys = [f"papers2code:papers_search:g1.0:{i:064d}" for i in range(100)]
+    for paper in range(20):
+        await backend.sadd_many({f"papers2code:papers_search_idx:{paper}": page_keys}, 60)
+
+    stats = backend.stats()
+    # Each set is ~8KB on its own but holds ~14KB of member strings, so the cap keeps fewer than 10
+    assert stats["current_bytes"] <= 200_000
+    assert stats["evictions"] > 0
+    assert len(await backend.smembers("papers2code:papers_search_idx:19")) == 100
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_expiry_uses_monotonic_clock(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("papers2code_app2.cache.backends.time.monotonic", lambda: clock[0])
+    backend = InMemoryCache()
+    await backend.setex("short", 5, "1")
+    await backend.setex("long", 60, "2")
+
+    clock[0] += 10
+    await backend.setex("other", 60, "3")  # writes reclaim expired wheel slots
+
+    stats = backend.stats()
+    assert stats["entries"] == 2
+    assert stats["expirations"] == 1
+    assert await backend.get("short") is None
+    assert await backend.get("long") == "2"
+    assert 0 < backend.stats()["hit_ratio"] < 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_the_loader_once(cache):
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _page("a")
+
+    key = await cache.get_search_key(sort_by="newest")
+    results = await asyncio.gather(*[cache.fill_page(key, load) for _ in range(10)])
+
+    assert calls == 1
+    assert all(result == _page("a") for result in results)
+    assert await cache.get_cached_page(key) == _page("a")
+    stats = cache.coalescing_stats()
+    assert stats["executions"] == 1
+    assert stats["collapsed"] == 9
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_leader_cancellation():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return 42
+
+    leader = asyncio.create_task(flight.do("k", load))
+    follower = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == 42
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_every_caller():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.do("k", load), flight.do("k", load), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # A failed call is not remembered
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_distributed_lock_waits_for_other_worker(cache, monkeypatch):
+    monkeypatch.setattr("papers2code_app2.cache.paper_search_cache.config_settings.CACHE_DISTRIBUTED_LOCK", True)
+    monkeypatch.setattr(PaperSearchCache, "LOCK_POLL_INTERVAL", 0.001)
+    key = await cache.get_search_key(sort_by="newest")
+    # Another worker holds the fill lock for this key
+    token = await cache.backend.acquire_lock(f"{key}:lock", 5)
+    assert token is not None
+
+    async def other_worker_fills():
+        await asyncio.sleep(0.01)
+        await cache.cache_page(key, _page("remote"))
+
+    async def load():
+        raise AssertionError("should reuse the other worker's result")
+
+    _, result = await asyncio.gather(other_worker_fills(), cache.fill_page(key, load))
+
+    assert result == _page("remote")
+    assert cache.coalescing_stats()["lock_wait_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_page_is_served_while_refreshing(cache, monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr("papers2code_app2.cache.paper_search_cache.time.time", lambda: clock[0])
+    monkeypatch.setattr("papers2code_app2.cache.paper_search_cache.config_settings.CACHE_TTL", 60)
+    monkeypatch.setattr("papers2code_app2.cache.paper_search_cache.config_settings.CACHE_STALE_TTL", 600)
+    key = await cache.get_search_key(sort_by="newest")
+    loads = []
+
+    async def load():
+        loads.append(clock[0])
+        return _page(f"v{len(loads)}")
+
+    assert await cache.get_page(key, load) == (_page("v1"), "miss")
+    assert await cache.get_page(key, load) == (_page("v1"), "hit")
+
+    clock[0] += 120  # past the soft TTL, within the hard TTL
+    assert await cache.get_page(key, load) == (_page("v1"), "stale")
+    assert await cache.get_page(key, load) == (_page("v1"), "stale")
+    await asyncio.gather(*cache._refresh_tasks.values())
+
+    assert len(loads) == 2  # one background refresh for both stale reads
+    assert await cache.get_page(key, load) == (_page("v2"), "hit")
+    assert cache.stale_served == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_stale_page(cache, monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr("papers2code_app2.cache.paper_search_cache.time.time", lambda: clock[0])
+    key = await cache.get_search_key(sort_by="newest")
+    await cache.cache_page(key, _page("a"))
+    clock[0] += cache._hard_ttl() - 1
+
+    async def failing_load():
+        raise RuntimeError("mongo down")
+
+    assert await cache.get_page(key, failing_load) == (_page("a"), "stale")
+    await asyncio.gather(*cache._refresh_tasks.values())
+    assert await cache.get_page(key, failing_load) == (_page("a"), "stale")
+
+
+async def _worker(shared_backend):
+    """A PaperSearchCache as one uvicorn worker would see it, sharing the L2 with its peers"""
+    worker = PaperSearchCache()
+    worker.backend = shared_backend
+    worker._backend_ready = True
+    await worker.start()
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_decoded_pages_without_touching_l2(cache):
+    key = await cache.get_search_key(sort_by="newest")
+    await cache.cache_page(key, _page("a"))
+
+    first = await cache.get_cached_page(key)
+    l2_hits = cache.backend.stats()["hits"]
+    second = await cache.get_cached_page(key)
+
+    assert second is first  # the same decoded object, straight from L1
+    assert cache.backend.stats()["hits"] == l2_hits
+
+
+@pytest.mark.asyncio
+async def test_invalidations_drop_l1_entries_on_every_worker():
+    shared_l2 = InMemoryCache()
+    worker_a, worker_b = await _worker(shared_l2), await _worker(shared_l2)
+    try:
+        await worker_a.set_cached_metadata("tags", ["nlp"])
+        await worker_a.cache_result(_page("p1"), sort_by="newest")
+        assert await worker_b.get_cached_metadata("tags") == ["nlp"]
+        assert await worker_b.get_cached_result(sort_by="newest") == _page("p1")
+
+        await worker_a.invalidate_metadata_cache("tags")
+        await worker_a.update_paper_in_cache("p1", "Started")
+        await asyncio.sleep(0.01)  # let worker B's listener drain the channel
+
+        assert await worker_b.get_cached_metadata("tags") is None
+        page = await worker_b.get_cached_result(sort_by="newest")
+        assert page["papers"][0]["status"] == "Started"
+
+        await worker_a.invalidate_search_results()
+        await asyncio.sleep(0.01)
+        assert await worker_b.get_cached_result(sort_by="newest") is None
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_metadata_listeners_hear_invalidations_from_every_worker():
+    shared_l2 = InMemoryCache()
+    worker_a, worker_b = await _worker(shared_l2), await _worker(shared_l2)
+    heard_a, heard_b = [], []
+    worker_a.add_metadata_listener(heard_a.append)
+    worker_b.add_metadata_listener(heard_b.append)
+    try:
+        await worker_a.invalidate_metadata_cache("authors")
+        await asyncio.sleep(0.01)  # let worker B's listener drain the channel
+        assert heard_a[0] == "authors"
+        assert heard_b == ["authors"]
+    finally:
+        await worker_a.close()
+        await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_stats_are_tracked_per_namespace(cache):
+    key = await cache.get_search_key(sort_by="newest")
+    assert await cache.get_cached_page(key) is None
+    await cache.cache_page(key, _page("a"))
+    await cache.get_cached_page(key)
+    await cache.get_cached_page(key)
+    await cache.get_cached_metadata("tags")
+
+    snapshot = cache.metrics_snapshot()["namespaces"]
+    search = snapshot["papers_search"]
+    assert (search["hits"], search["misses"], search["l1_hits"]) == (2, 1, 1)
+    assert search["payload_bytes"]["count"] == 1
+    assert snapshot["metadata:tags"]["misses"] == 1
+
+    text = cache.render_prometheus()
+    assert 'papers2code_cache_requests_total{namespace="papers_search",result="hit"} 2' in text
+    assert 'papers2code_cache_operation_seconds_count{namespace="papers_search",operation="get"} 3' in text
+    assert '# TYPE papers2code_cache_coalesced_calls_total counter' in text
+
+
+@pytest.mark.asyncio
+async def test_counts_are_shared_across_pages_and_rolled_with_their_filters(cache):
+    loads = []
+
+    async def count():
+        loads.append(1)
+        return 42
+
+    key = await cache.get_count_key(main_status="Completed", tags=None)
+    assert key == await cache.get_count_key(tags=None, main_status="Completed")
+    assert await cache.get_count(key, count) == 42
+    assert await cache.get_count(key, count) == 42
+    assert len(loads) == 1
+
+    await cache.invalidate_search_results("upvotes")
+    assert await cache.get_count_key(main_status="Completed", tags=None) == key
+
+    await cache.invalidate_search_results("status")
+    rolled = await cache.get_count_key(main_status="Completed", tags=None)
+    assert rolled != key
+    assert await cache.get_count(rolled, count) == 42
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_status_facets_roll_with_status_changes(cache):
+    plain = await cache.get_facets_key(facets=["tags", "venue"], venue=None)
+    with_status = await cache.get_facets_key(facets=["status", "tags"], venue=None)
+    await cache.cache_facets(with_status, {"status": {"Completed": 1}, "tags": {}})
+    assert await cache.get_cached_facets(with_status) == {"status": {"Completed": 1}, "tags": {}}
+
+    await cache.invalidate_search_results("status")
+
+    assert await cache.get_facets_key(facets=["tags", "venue"], venue=None) == plain
+    assert await cache.get_facets_key(facets=["status", "tags"], venue=None) != with_status
+
+
+@pytest.mark.asyncio
+async def test_detail_read_before_a_concurrent_write_is_not_cached(cache):
+    paper = {"upvoteCount": 1}
+
+    async def load_while_a_vote_lands():
+        detail = dict(paper)
+        # The vote is written and invalidated after the loader has read the paper
+        paper["upvoteCount"] = 2
+        await cache.invalidate_paper_detail("a")
+        return detail
+
+    async def load():
+        return dict(paper)
+
+    assert (await cache.get_paper_detail("a", load_while_a_vote_lands))["upvoteCount"] == 1
+    assert (await cache.get_paper_detail("a", load))["upvoteCount"] == 2
+    paper["upvoteCount"] = 3  # without an invalidation the cached detail is served
+    assert (await cache.get_paper_detail("a", load))["upvoteCount"] == 2
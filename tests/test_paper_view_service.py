@@ -0,0 +1,333 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.cache import InMemoryCache, PaperSearchCache
+from papers2code_app2.search import SearchHit
+from papers2code_app2.services import paper_view_service as paper_view_service_module
+from papers2code_app2.services.paper_view_service import PaperViewService
+from papers2code_app2.utils.authors import author_key, author_keys, count_authors
+from papers2code_app2.utils.venues import venue_display_name, venue_key
+from tests.fakes import FakePapers
+
+FILTER_COUNTS = {
+    "status": {"Not Started": 120, "Completed": 7},
+    "tasks": {"Image Classification": 30, "Machine Translation": 12000},
+    "venueKey": {"cvpr": 90, "neurips": 60},
+}
+
+NO_FILTERS = {
+    "search_query": None, "author": None, "start_date": None, "end_date": None, "main_status": None,
+    "impl_status": None, "tags": None, "has_official_impl": None, "has_code": None,
+    "contributor_id": None, "venue": None, "author_key": None,
+}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    async def fake_filter_counts(self):
+        return FILTER_COUNTS
+
+    monkeypatch.setattr(PaperViewService, "get_filter_counts", fake_filter_counts)
+    return PaperViewService()
+
+
+@pytest.mark.asyncio
+async def test_approximate_counts_for_single_filters(service):
+    assert await service._get_approximate_count({**NO_FILTERS, "main_status": "Completed"}) == 7
+    assert await service._get_approximate_count({**NO_FILTERS, "tags": ["Image Classification"]}) == 30
+    # Venue matches like the filter does: on the normalized key of the name or proceeding
+    assert await service._get_approximate_count({**NO_FILTERS, "venue": "CVPR"}) == 90
+    assert await service._get_approximate_count({**NO_FILTERS, "venue": "NeurIPS 2023 12"}) == 60
+    assert await service._get_approximate_count({**NO_FILTERS, "tags": ["Machine Translation"]}) == PaperViewService.MAX_COUNT
+
+
+@pytest.mark.asyncio
+async def test_other_filter_combinations_are_counted_exactly(service):
+    assert await service._get_approximate_count(NO_FILTERS) is None
+    assert await service._get_approximate_count({**NO_FILTERS, "tags": ["a", "b"]}) is None
+    assert await service._get_approximate_count({**NO_FILTERS, "main_status": "Completed", "venue": "CVPR"}) is None
+    assert await service._get_approximate_count({**NO_FILTERS, "has_code": True}) is None
+
+
+class _FakeAggregation:
+    def __init__(self, result):
+        self.result = result
+
+    async def to_list(self, length=None):
+        return self.result
+
+
+class _FakeCollection:
+    def __init__(self, result):
+        self.result = result
+        self.pipelines = []
+
+    async def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        return _FakeAggregation(self.result)
+
+
+@pytest.mark.asyncio
+async def test_page_total_and_facets_come_from_one_aggregation():
+    collection = _FakeCollection([{
+        "page": [{"_id": 1, "title": "A"}],
+        "total": [{"total": 37}],
+        "status": [{"_id": "Completed", "count": 30}, {"_id": None, "count": 7}],
+        "tags": [{"_id": "Image Classification", "count": 12}],
+    }])
+
+    papers, total, facet_counts = await PaperViewService()._get_page_with_facets(
+        collection, {"hasCode": True}, None, [("publicationDate", -1), ("_id", -1)], 20, 10,
+        {"_id": 1, "title": 1}, ["status", "tags"],
+    )
+
+    assert papers == [{"_id": 1, "title": "A"}]
+    assert total == 37
+    assert facet_counts == {"status": {"Completed": 30}, "tags": {"Image Classification": 12}}
+    (pipeline,) = collection.pipelines
+    assert pipeline[0] == {"$match": {"hasCode": True}}
+    stages = pipeline[1]["$facet"]
+    assert stages["page"][1:3] == [{"$skip": 20}, {"$limit": 10}]
+    assert stages["tags"][0] == {"$unwind": "$tasks"}
+    assert set(stages) == {"page", "total", "status", "tags"}
+
+
+@pytest.mark.asyncio
+async def test_unknown_facets_are_rejected():
+    from papers2code_app2.services.exceptions import InvalidRequestException
+
+    with pytest.raises(InvalidRequestException):
+        await PaperViewService().get_papers_list(facets=["status", "authors"], record_usage=False)
+
+
+@pytest.mark.parametrize("proceeding,name,key", [
+    ("NeurIPS 2020 12", "NeurIPS", "neurips"),
+    ("EMNLP (Findings) 2021 11", "EMNLP (Findings)", "emnlp-findings"),
+    ("ICLR", "ICLR", "iclr"),
+    ("2020", None, None),
+])
+def test_venue_key_strips_the_edition_and_is_idempotent(proceeding, name, key):
+    assert venue_display_name(proceeding) == name
+    assert venue_key(proceeding) == key
+    assert venue_key(key) == key
+
+
+class _FakeCursor:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def hint(self, index_name):
+        self.collection.hints.append(index_name)
+        return self
+
+    def sort(self, criteria):
+        return self
+
+    def skip(self, n):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        return []
+
+
+class _FakeFindCollection(_FakeCollection):
+    def __init__(self):
+        super().__init__([{"total": 0}])
+        self.queries = []
+        self.hints = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return _FakeCursor(self)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("has_official_impl,has_code", [(True, None), (False, False)])
+async def test_code_filters_are_indexed_equalities_on_the_precomputed_flags(monkeypatch, has_official_impl, has_code):
+    collection = _FakeFindCollection()
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+
+    async def get_papers_collection():
+        return collection
+
+    monkeypatch.setattr(paper_view_service_module, "get_papers_collection_async", get_papers_collection)
+    monkeypatch.setattr(paper_view_service_module, "paper_cache", cache)
+
+    await PaperViewService()._get_papers_list_standard(
+        0, 20, "newest", "desc", None,
+        **{**NO_FILTERS, "has_official_impl": has_official_impl, "has_code": has_code},
+    )
+
+    (query,) = collection.queries
+    expected = [{"hasOfficialImpl": has_official_impl}]
+    if has_code is not None:
+        expected.append({"hasCode": has_code})
+    assert query == {"$and": expected}
+    assert collection.hints == ["hasOfficialImpl_1_publicationDate_-1__id_-1_papers_async"]
+
+
+def test_author_keys_fold_case_accents_and_punctuation():
+    assert author_key("Sara  Sánchez") == author_key("sara sanchez") == "sara sanchez"
+    assert author_key("J.-P. Serre") == "j p serre"
+    assert author_key(author_key("Kaiming He")) == "kaiming he"
+    assert author_key("  ") is None
+    assert author_keys(["Kaiming He", "kaiming he", "Ross Girshick", None]) == ["kaiming he", "ross girshick"]
+    # A paper counts once per author, however often the name is repeated
+    assert count_authors([["Kaiming He", "KAIMING HE"], ["Kaiming He"]]) == {"kaiming he": ("Kaiming He", 2)}
+
+
+@pytest.mark.asyncio
+async def test_author_filter_is_an_indexed_equality_on_author_keys(monkeypatch):
+    collection = _FakeFindCollection()
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+
+    async def get_papers_collection():
+        return collection
+
+    monkeypatch.setattr(paper_view_service_module, "get_papers_collection_async", get_papers_collection)
+    monkeypatch.setattr(paper_view_service_module, "paper_cache", cache)
+
+    await PaperViewService()._get_papers_list_standard(
+        0, 20, "newest", "desc", None, **{**NO_FILTERS, "author_key": "sara sanchez"},
+    )
+
+    assert collection.queries == [{"$and": [{"authorKeys": "sara sanchez"}]}]
+    assert collection.hints == ["authorKeys_1_publicationDate_-1__id_-1_papers_async"]
+
+
+class _FakeProgressCollection:
+    name = "implementation_progress"
+
+
+@pytest.mark.asyncio
+async def test_paper_and_progress_are_read_in_one_aggregation(monkeypatch):
+    from bson import ObjectId
+
+    paper_id = ObjectId()
+    collection = _FakeCollection([{"_id": paper_id, "title": "A", "_progress": []}])
+
+    async def get_papers_collection():
+        return collection
+
+    async def get_progress_collection():
+        return _FakeProgressCollection()
+
+    monkeypatch.setattr(paper_view_service_module, "get_papers_collection_async", get_papers_collection)
+    monkeypatch.setattr(paper_view_service_module, "get_implementation_progress_collection_async", get_progress_collection)
+
+    paper = await PaperViewService()._load_paper_by_id(str(paper_id))
+
+    assert paper == {"_id": paper_id, "title": "A", "implementationProgress": None}
+    (pipeline,) = collection.pipelines
+    assert pipeline[0] == {"$match": {"_id": paper_id}}
+    assert pipeline[2]["$lookup"]["from"] == "implementation_progress"
+
+
+@pytest.mark.asyncio
+async def test_paper_detail_is_cached_until_invalidated_and_user_votes_stay_live(monkeypatch):
+    from bson import ObjectId
+
+    paper_id = str(ObjectId())
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+    monkeypatch.setattr(paper_view_service_module, "paper_cache", cache)
+    loads = []
+    user_votes = {}
+
+    async def load_paper(self, requested_id):
+        loads.append(requested_id)
+        return {"_id": ObjectId(requested_id), "upvoteCount": len(loads)}
+
+    async def transform(papers, user_id, detail_level):
+        return [{"id": str(p["_id"]), "upvote_count": p["upvoteCount"], "current_user_vote": None} for p in papers]
+
+    async def fetch_flags(paper_obj_ids, user_id):
+        return {str(paper_obj_ids[0]): user_votes} if user_votes else {}
+
+    monkeypatch.setattr(PaperViewService, "_load_paper_by_id", load_paper)
+    monkeypatch.setattr(paper_view_service_module, "transform_papers_batch", transform)
+    monkeypatch.setattr(paper_view_service_module, "fetch_user_vote_flags", fetch_flags)
+    service = PaperViewService()
+
+    assert (await service.get_paper_detail(paper_id))["upvote_count"] == 1
+    user_votes.update({"current_user_vote": "up", "current_user_implementability_vote": None})
+    detail = await service.get_paper_detail(paper_id, user_id=str(ObjectId()))
+    assert (detail["upvote_count"], detail["current_user_vote"]) == (1, "up")
+    assert loads == [paper_id]
+    # Another viewer does not see the first viewer's vote
+    assert (await service.get_paper_detail(paper_id))["current_user_vote"] is None
+
+    await cache.invalidate_paper_detail(paper_id)
+    assert (await service.get_paper_detail(paper_id))["upvote_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_user_paper_states_are_one_query_in_request_order(monkeypatch):
+    from bson import ObjectId
+    from papers2code_app2.services.exceptions import InvalidRequestException
+
+    first, second = ObjectId(), ObjectId()
+    queries = []
+
+    async def fetch_flags(paper_obj_ids, user_id):
+        queries.append(paper_obj_ids)
+        return {str(second): {"current_user_vote": "up", "current_user_implementability_vote": "down"}}
+
+    monkeypatch.setattr(paper_view_service_module, "fetch_user_vote_flags", fetch_flags)
+    states = await PaperViewService().get_user_paper_states(
+        str(ObjectId()), [str(second), str(first).upper(), str(second)]
+    )
+
+    assert queries == [[second, first]]
+    assert states == [
+        {"paper_id": str(second), "current_user_vote": "up", "current_user_implementability_vote": "down"},
+        {"paper_id": str(first), "current_user_vote": None, "current_user_implementability_vote": None},
+    ]
+    with pytest.raises(InvalidRequestException):
+        await PaperViewService().get_user_paper_states(str(ObjectId()), ["not-an-id"])
+
+
+@pytest.mark.asyncio
+async def test_local_search_filters_and_sorts_every_match_before_capping(monkeypatch):
+    from bson import ObjectId
+
+    ids = sorted(ObjectId() for _ in range(12))
+    # Best score first; only the two weakest matches are at the venue
+    papers = FakePapers([
+        {"_id": pid, "upvoteCount": i, "venueKey": "cvpr" if i >= 10 else "iclr"} for i, pid in enumerate(ids)
+    ])
+
+    class _FakeIndex:
+        def search(self, query, author, status, tags, start_date, end_date, limit=None):
+            return [SearchHit(pid, 100.0 - i, 0) for i, pid in enumerate(ids)][:limit]
+
+    async def get_papers_collection():
+        return papers
+
+    monkeypatch.setattr(paper_view_service_module, "get_papers_collection_async", get_papers_collection)
+    monkeypatch.setattr(paper_view_service_module, "local_search_index", _FakeIndex())
+    monkeypatch.setattr(PaperViewService, "MAX_COUNT", 3)
+    monkeypatch.setattr(PaperViewService, "LOCAL_SEARCH_BATCH", 4)
+    filters = {k: v for k, v in NO_FILTERS.items() if k != "search_query"}
+    service = PaperViewService()
+
+    found, total, _ = await service._get_papers_list_local(
+        0, 20, "relevance", "desc", "gan", **{**filters, "venue": "CVPR"}
+    )
+    assert ([p["_id"] for p in found], total) == (ids[10:], 2)
+
+    found, total, _ = await service._get_papers_list_local(0, 2, "upvotes", "desc", "gan", **filters)
+    assert ([p["_id"] for p in found], total) == ([ids[11], ids[10]], 3)
@@ -0,0 +1,87 @@
+import json
+import sys
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.schemas.papers import PaginatedPaperResponse
+from papers2code_app2.utils import transform_papers_batch
+from papers2code_app2.utils.serialization import (
+    PAPER_ADAPTER,
+    PAPER_PAGE_ADAPTER,
+    construct_paper,
+    construct_paper_page,
+    trusted_json_response,
+)
+
+PAGE_FIELDS = {
+    "total_count": 2, "count_capped": False, "page": 1, "page_size": 20,
+    "has_more": False, "next_cursor": None, "facets": None,
+}
+
+
+def _stored_papers():
+    """Documents in the shape the ingestion scripts and services write them"""
+    return [
+        {
+            "_id": ObjectId(),
+            "title": "Deep Residual Learning",
+            "abstract": "Résumé of residual networks.",
+            "authors": ["Kaiming He", "Jian Sun"],
+            "publicationDate": datetime(2015, 12, 10),
+            "upvoteCount": 7,
+            "status": "Completed",
+            "urlGithub": "https://github.com/KaimingHe/deep-residual-networks",
+            "urlAbs": "https://arxiv.org/abs/1512.03385",
+            "urlPdf": "https://arxiv.org/pdf/1512.03385",
+            "hasCode": True,
+            "venue": "CVPR",
+            "tasks": ["Image Classification"],
+            "implementabilityStatus": "Community Implementable",
+            "isImplementableVotes": 4,
+            "nonImplementableVotes": 0,
+            "arxivId": "1512.03385",
+        },
+        {"_id": ObjectId(), "title": "Sparse paper"},
+    ]
+
+
+def _validated_json(model_type, content) -> bytes:
+    """What FastAPI sends for ``content`` through response-model validation and AliasJSONResponse"""
+    validated = TypeAdapter(model_type).validate_python(content)
+    return json.dumps(
+        jsonable_encoder(validated, by_alias=True), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_trusted_page_matches_the_validated_page():
+    transformed = await transform_papers_batch(_stored_papers(), None, detail_level="full")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response = trusted_json_response(PAPER_PAGE_ADAPTER, construct_paper_page(transformed, **PAGE_FIELDS))
+
+    assert response.media_type == "application/json"
+    assert response.body == _validated_json(PaginatedPaperResponse, {"papers": transformed, **PAGE_FIELDS})
+
+
+@pytest.mark.asyncio
+async def test_trusted_paper_keeps_implementation_progress_and_defaults():
+    transformed = (await transform_papers_batch(_stored_papers()[1:], None, detail_level="summary"))[0]
+    progress = {"id": transformed["id"], "status": "Started", "contributors": []}
+    paper = construct_paper({**transformed, "implementationProgress": progress})
+
+    body = json.loads(trusted_json_response(PAPER_ADAPTER, paper).body)
+
+    assert body["implementationProgress"] == progress
+    assert (body["urlAbs"], body["tasks"], body["isImplementable"]) == (None, [], True)
+    assert body["title"] == "Sparse paper"
@@ -0,0 +1,73 @@
+"""
+Tests for the title/author typeahead index: normalization, popularity ranking, and the
+precomputed tables of large prefixes agreeing with the range scan used for the others.
+"""
+from bson import ObjectId
+
+from papers2code_app2.search import SuggestIndex, normalize_prefix
+
+
+def _paper(title, authors, upvotes=0):
+    return {"_id": ObjectId(), "title": title, "authors": authors, "upvoteCount": upvotes}
+
+
+def _index(papers, scan_limit=SuggestIndex.SCAN_LIMIT):
+    index = SuggestIndex()
+    index.SCAN_LIMIT = scan_limit
+    index.load_papers(papers)
+    return index
+
+
+def test_normalize_prefix_folds_case_accents_and_punctuation():
+    assert normalize_prefix("  Émile   Zoλa-Brown! ") == "emile zoλa brown"
+    assert normalize_prefix("BERT: Pre-training") == "bert pre training"
+    assert normalize_prefix(None) == ""
+
+
+def test_titles_rank_by_upvotes():
+    papers = [
+        _paper("Attention Is All You Need", ["Ashish Vaswani"], upvotes=50),
+        _paper("Attention U-Net", ["Ozan Oktay"], upvotes=5),
+        _paper("Attentive Neural Processes", ["Hyunjik Kim"], upvotes=20),
+        _paper("Deep Residual Learning", ["Kaiming He"], upvotes=100),
+    ]
+    index = _index(papers)
+    precomputed = _index(papers, scan_limit=1)  # Every prefix matching 2+ titles is precomputed
+    assert "att" in precomputed._titles.top and "att" not in index._titles.top
+
+    for table in (index, precomputed):
+        titles = table.suggest("att", limit=10)["titles"]
+        assert [t["title"] for t in titles] == ["Attention Is All You Need", "Attentive Neural Processes", "Attention U-Net"]
+    long = index.suggest("attention", limit=10)["titles"]
+    assert [t["title"] for t in long] == ["Attention Is All You Need", "Attention U-Net"]
+    assert long[0] == {"id": str(papers[0]["_id"]), "title": "Attention Is All You Need", "upvote_count": 50}
+    assert [t["title"] for t in index.suggest("ATTENTION-is", limit=1)["titles"]] == ["Attention Is All You Need"]
+
+
+def test_authors_match_full_name_and_surname_once():
+    papers = [
+        _paper("Paper A", ["Sam Smith", "Jane Doe"], upvotes=3),
+        _paper("Paper B", ["Sam Smith"], upvotes=1),
+        _paper("Paper C", ["Sara Sánchez"], upvotes=10),
+    ]
+    index = _index(papers)
+
+    for table in (index, _index(papers, scan_limit=1)):
+        assert table.suggest("s", limit=10)["authors"] == [
+            {"name": "Sara Sánchez", "key": "sara sanchez", "paper_count": 1},
+            {"name": "Sam Smith", "key": "sam smith", "paper_count": 2},
+        ]
+    assert [a["name"] for a in index.suggest("smit")["authors"]] == ["Sam Smith"]
+    assert [a["name"] for a in index.suggest("sanchez")["authors"]] == ["Sara Sánchez"]
+    assert [a["name"] for a in index.suggest("doe")["authors"]] == ["Jane Doe"]
+
+
+def test_no_suggestions_before_the_first_build_or_for_blank_input():
+    assert SuggestIndex().suggest("attention") == {"titles": [], "authors": []}
+    assert _index([_paper("Attention", ["A B"])]).suggest("  ::  ") == {"titles": [], "authors": []}
+
+
+def test_metadata_invalidation_requests_a_rebuild():
+    index = SuggestIndex()
+    index._on_metadata_invalidated("authors")
+    assert index._refresh.is_set()
@@ -0,0 +1,53 @@
+"""
+Tests for tag substring search: case-insensitive matches ranked by paper count, the result
+cap, and the service dropping its index when the tags metadata is invalidated.
+"""
+import pytest
+
+from papers2code_app2.cache import InMemoryCache, PaperSearchCache
+from papers2code_app2.search import TagIndex
+from papers2code_app2.services import paper_view_service as paper_view_service_module
+from papers2code_app2.services.paper_view_service import PaperViewService
+
+TAGS = ["Image Classification", "Image Segmentation", "Semantic Segmentation", "Machine Translation", "3D Object Detection"]
+COUNTS = {"Image Classification": 300, "Semantic Segmentation": 120, "Image Segmentation": 80, "Machine Translation": 200}
+
+
+def _linear_search(tags, query):
+    return [tag for tag in tags if query.strip().casefold() in tag.casefold()]
+
+
+@pytest.mark.parametrize("query", ["a", "Se", "seg", "SEGMENTATION", "ation", "image seg", "3d ", "xyz", "tion z"])
+def test_search_matches_a_linear_scan_ranked_by_paper_count(query):
+    index = TagIndex(TAGS, COUNTS)
+    expected = sorted(_linear_search(TAGS, query), key=lambda tag: (-COUNTS.get(tag, 0), tag))
+    assert index.search(query, limit=10) == expected
+
+
+def test_search_is_capped_and_keeps_the_best_matches():
+    index = TagIndex(TAGS, COUNTS)
+    assert index.search("segmentation", limit=1) == ["Semantic Segmentation"]
+    assert index.search("", limit=2) == ["Image Classification", "Machine Translation"]
+    assert len(index) == len(TAGS)
+
+
+@pytest.mark.asyncio
+async def test_service_rebuilds_the_index_after_tags_are_invalidated(monkeypatch):
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+    cache.add_metadata_listener(paper_view_service_module._invalidate_tag_index)
+    await cache.set_cached_metadata("tags", TAGS)
+    await cache.set_cached_metadata("filter_counts", {"status": {}, "tasks": COUNTS, "venueKey": {}})
+    monkeypatch.setattr(paper_view_service_module, "paper_cache", cache)
+    monkeypatch.setattr(paper_view_service_module, "_tag_index", None)
+
+    service = PaperViewService()
+    assert await service.get_distinct_tags("segment") == ["Semantic Segmentation", "Image Segmentation"]
+    assert await service.get_distinct_tags() == TAGS  # The full list is unchanged
+
+    await cache.set_cached_metadata("tags", [*TAGS, "Video Segmentation"])
+    assert "Video Segmentation" not in await service.get_distinct_tags("segment")
+    await cache.invalidate_metadata_cache("tags")
+    await cache.set_cached_metadata("tags", [*TAGS, "Video Segmentation"])
+    assert "Video Segmentation" in await service.get_distinct_tags("segment")
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import pytest
+from bson import ObjectId
+
+# Guarantee the repository root is importable when tests run in isolation
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from papers2code_app2.cache import InMemoryCache, PaperSearchCache
+from papers2code_app2.services import paper_moderation_service
+from papers2code_app2.services.paper_moderation_service import PaperModerationService
+from papers2code_app2.shared import (
+    IMPL_STATUS_ADMIN_NOT_IMPLEMENTABLE,
+    IMPL_STATUS_COMMUNITY_IMPLEMENTABLE,
+    IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE,
+    IMPL_STATUS_VOTING,
+)
+from papers2code_app2.utils import transform_papers_batch
+from tests.fakes import FakeActions, FakePapers, install_collections
+
+IN_SYNC, DRIFTED, NO_VOTES, LOCKED = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+
+
+def _count_votes(actions):
+    """The reconciliation pipeline's $group: community votes of each kind per paper"""
+    groups = {}
+    for a in actions:
+        counts = groups.setdefault(a["paperId"], {"_id": a["paperId"], "isImplementableVotes": 0, "nonImplementableVotes": 0})
+        if a["actionType"] == IMPL_STATUS_COMMUNITY_IMPLEMENTABLE:
+            counts["isImplementableVotes"] += 1
+        elif a["actionType"] == IMPL_STATUS_COMMUNITY_NOT_IMPLEMENTABLE:
+            counts["nonImplementableVotes"] += 1
+    return list(groups.values())
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    papers = FakePapers([
+        {"_id": IN_SYNC, "isImplementableVotes": 1, "nonImplementableVotes": 0, "implementabilityStatus": IMPL_STATUS_VOTING, "status": "Not Started"},
+        # Lost two decrements: the community actually confirmed it
+        {"_id": DRIFTED, "isImplementableVotes": 2, "nonImplementableVotes": 2, "implementabilityStatus": IMPL_STATUS_VOTING, "status": "Not Started"},
+        {"_id": NO_VOTES, "implementabilityStatus": IMPL_STATUS_VOTING, "status": "Not Started"},
+        # Locking zeroes the counters while the community votes stay in user_actions
+        {"_id": LOCKED, "isImplementableVotes": 0, "nonImplementableVotes": 0, "implementabilityStatus": IMPL_STATUS_ADMIN_NOT_IMPLEMENTABLE, "status": "Not Implementable"},
+    ])
+    actions = FakeActions([
+        {"paperId": IN_SYNC, "actionType": IMPL_STATUS_COMMUNITY_IMPLEMENTABLE},
+        {"paperId": DRIFTED, "actionType": IMPL_STATUS_COMMUNITY_IMPLEMENTABLE},
+        {"paperId": DRIFTED, "actionType": IMPL_STATUS_COMMUNITY_IMPLEMENTABLE},
+        {"paperId": LOCKED, "actionType": IMPL_STATUS_COMMUNITY_IMPLEMENTABLE},
+    ], _count_votes)
+    cache = PaperSearchCache()
+    cache.backend = InMemoryCache()
+    cache._backend_ready = True
+
+    install_collections(monkeypatch, paper_moderation_service, papers, actions)
+    monkeypatch.setattr(paper_moderation_service, "paper_cache", cache)
+    return papers
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_reports_drift_without_repairing(collections):
+    result = await PaperModerationService().reconcile_vote_counters(repair=False)
+
+    assert result == {"papers_checked": 4, "papers_drifted": 1, "papers_repaired": 0, "statuses_changed": 0}
+    assert collections.papers[DRIFTED]["nonImplementableVotes"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_repairs_counters_and_recalculates_status(collections):
+    result = await PaperModerationService().reconcile_vote_counters()
+
+    assert result == {"papers_checked": 4, "papers_drifted": 1, "papers_repaired": 1, "statuses_changed": 1}
+    drifted = collections.papers[DRIFTED]
+    assert (drifted["isImplementableVotes"], drifted["nonImplementableVotes"]) == (2, 0)
+    assert drifted["implementabilityStatus"] == IMPL_STATUS_COMMUNITY_IMPLEMENTABLE
+    assert collections.papers[LOCKED]["isImplementableVotes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transform_reads_the_denormalized_counters():
+    paper = {"_id": ObjectId(), "title": "A", "isImplementableVotes": 4, "nonImplementableVotes": 1}
+
+    (full,) = await transform_papers_batch([paper], None, detail_level="full")
+    (bare,) = await transform_papers_batch([{"_id": ObjectId(), "title": "B"}], None, detail_level="full")
+
+    assert (full["implementable_votes"], full["not_implementable_votes"]) == (4, 1)
+    assert (bare["implementable_votes"], bare["not_implementable_votes"]) == (0, 0)